@@ -1,29 +1,71 @@
-from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
-from config import Config
-
-# Initialize extensions
-db = SQLAlchemy()
-migrate = Migrate()
-jwt = JWTManager()
-
-
-def create_app():
-    """Create and configure the Flask app."""
-    app = Flask(__name__)
-    app.config.from_object(Config)
-
-    # Initialize extensions with the app
-    db.init_app(app)
-    migrate.init_app(app, db)
-    jwt.init_app(app)
-
-    # Register Blueprints for modular app structure
-    from .routes import main, auth_bp, event_bp
-    app.register_blueprint(main)
-    app.register_blueprint(auth_bp, url_prefix='/auth')
-    app.register_blueprint(event_bp)
-
-    return app
\ No newline at end of file
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
+import os
+from config import config_by_name
+from .admission import RegistrationAdmission
+from .cache import ResponseCache
+from .database import configure_engines
+from .jobs import JobRunner
+from .metrics import Instrumentation
+from .pubsub import PubSub
+from .replicas import ReplicaRouter, RoutingSession
+from .serialization import create_json_provider
+from .security import Authenticator
+
+# Initialize extensions
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+migrate = Migrate()
+jwt = JWTManager()
+cache = ResponseCache()
+jobs = JobRunner()
+instrumentation = Instrumentation()
+authenticator = Authenticator()
+pubsub = PubSub()
+replicas = ReplicaRouter()
+admission = RegistrationAdmission()
+
+
+def create_app(config_name=None):
+    """Create and configure the Flask app for the given (or APP_CONFIG) profile."""
+    app = Flask(__name__)
+    app.config.from_object(config_by_name[config_name or os.environ.get('APP_CONFIG', 'development')])
+    app.json = create_json_provider(app)
+    # Take request.remote_addr from X-Forwarded-For set by the trusted proxies in front of the app
+    if app.config.get('PROXY_FIX_X_FOR'):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
+    # Initialize extensions with the app
+    db.init_app(app)
+    replicas.init_app(app)
+    configure_engines(app, db)
+    # Batch mode lets migrations alter constraints on SQLite, which has limited ALTER TABLE;
+    # the full-text search tables are created by DDL hooks, so autogenerate ignores them
+    from .search import include_object
+    migrate.init_app(app, db, render_as_batch=True, include_object=include_object)
+    jwt.init_app(app)
+    cache.init_app(app)
+    jobs.init_app(app)
+    instrumentation.init_app(app, db)
+    authenticator.init_app(app)
+    admission.init_app(app)
+
+    # Register Blueprints for modular app structure
+    from .routes import main, auth_bp, event_bp
+    app.register_blueprint(main)
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(event_bp)
+
+    # Register maintenance CLI commands
+    from .commands import (reconcile_counters_command, sweep_statuses_command, purge_idempotency_keys_command,
+                           archive_events_command, promote_waitlists_command, fail_interrupted_jobs_command)
+    app.cli.add_command(reconcile_counters_command)
+    app.cli.add_command(sweep_statuses_command)
+    app.cli.add_command(purge_idempotency_keys_command)
+    app.cli.add_command(archive_events_command)
+    app.cli.add_command(promote_waitlists_command)
+    app.cli.add_command(fail_interrupted_jobs_command)
+
+    return app
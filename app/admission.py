@@ -0,0 +1,21 @@
+from flask import current_app
+from .ratelimit import TokenBucketLimiter
+
+
+class RegistrationAdmission:
+    """
+        Per-event admission control for single registrations. Each event gets a token bucket
+        of REGISTRATION_BURST requests refilled at REGISTRATION_RATE_PER_SECOND, so a surge on
+        one event is shed with fast 429s before it reaches the database while other events are
+        unaffected. Buckets are kept per worker process; a rate of 0 disables the limit.
+    """
+
+    def init_app(self, app):
+        rate = app.config.get('REGISTRATION_RATE_PER_SECOND', 0)
+        burst = app.config.get('REGISTRATION_BURST') or rate
+        app.extensions['registration_admission'] = TokenBucketLimiter(rate, max(burst, 1)) if rate else None
+
+    def retry_after(self, event_id):
+        """Take a registration slot for the event; returns 0 if admitted, else seconds to wait."""
+        limiter = current_app.extensions['registration_admission']
+        return limiter.acquire(event_id) if limiter else 0
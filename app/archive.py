@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, literal, select, update
+from . import cache
+from .models import (ArchivedAttendee, ArchivedEvent, Attendee, CheckinLog, Event, EventCheckinMinute, EventStatus,
+                     Job, WaitlistEntry, db)
+
+# Columns copied unchanged from the live tables into the archive tables
+EVENT_COLUMNS = [column.key for column in ArchivedEvent.__table__.columns if column.key != 'archived_at']
+ATTENDEE_COLUMNS = [column.key for column in ArchivedAttendee.__table__.columns]
+
+
+def archivable_events_query(cutoff, batch_size):
+    """
+        Ids of the next `batch_size` events that ended before `cutoff`, oldest first.
+        The newest event and the event holding the newest attendee are left in place: SQLite
+        hands out max(id) + 1 for new rows, so moving them would let new rows reuse archived ids.
+    """
+    newest_event = select(func.max(Event.id)).scalar_subquery()
+    newest_attendee_event = (
+        select(Attendee.event_id)
+        .where(Attendee.id == select(func.max(Attendee.id)).scalar_subquery())
+        .scalar_subquery()
+    )
+    return (
+        select(Event.id)
+        # Every status is listed so the lookup can range-scan ix_event_status_end_time
+        .where(
+            Event.status.in_(list(EventStatus)),
+            Event.end_time < cutoff,
+            Event.id != newest_event,
+            Event.id != func.coalesce(newest_attendee_event, 0)
+        )
+        .order_by(Event.end_time)
+        .limit(batch_size)
+    )
+
+
+def archive_batch(event_ids, now):
+    """Copy the events and their attendees into the archive tables, then delete the live rows."""
+    db.session.execute(insert(ArchivedEvent).from_select(
+        EVENT_COLUMNS + ['archived_at'],
+        select(*(getattr(Event, column) for column in EVENT_COLUMNS), literal(now, db.DateTime))
+        .where(Event.id.in_(event_ids))
+    ))
+    attendees = db.session.execute(insert(ArchivedAttendee).from_select(
+        ATTENDEE_COLUMNS,
+        select(*(getattr(Attendee, column) for column in ATTENDEE_COLUMNS)).where(Attendee.event_id.in_(event_ids))
+    )).rowcount
+
+    # Check-in history and waitlists only matter for live events; jobs outlive the event they ran against
+    db.session.execute(delete(CheckinLog).where(CheckinLog.event_id.in_(event_ids)))
+    db.session.execute(delete(WaitlistEntry).where(WaitlistEntry.event_id.in_(event_ids)))
+    db.session.execute(delete(EventCheckinMinute).where(EventCheckinMinute.event_id.in_(event_ids)))
+    db.session.execute(
+        update(Job).where(Job.event_id.in_(event_ids)).values(event_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    # Bulk deletes skip the attendee counter listeners, which would only update rows being deleted
+    db.session.execute(
+        delete(Attendee).where(Attendee.event_id.in_(event_ids)).execution_options(synchronize_session=False)
+    )
+    db.session.execute(delete(Event).where(Event.id.in_(event_ids)).execution_options(synchronize_session=False))
+    return attendees
+
+
+def archive_events(retention_days, batch_size=500, now=None):
+    """
+        Move events that ended more than `retention_days` ago, with their attendees, into the
+        archive tables. Each batch is copied and deleted in its own transaction, so a large
+        backlog never holds long locks and an interrupted run can simply be started again.
+        Returns (events, attendees) moved.
+    """
+    now = now or datetime.utcnow().replace(microsecond=0)
+    cutoff = now - timedelta(days=retention_days)
+    events = attendees = 0
+    while True:
+        event_ids = db.session.scalars(archivable_events_query(cutoff, batch_size)).all()
+        if not event_ids:
+            return events, attendees
+        attendees += archive_batch(event_ids, now)
+        db.session.commit()
+        events += len(event_ids)
+        cache.invalidate('events', *(f'event:{event_id}' for event_id in event_ids))
@@ -0,0 +1,288 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qsl
+from asgiref.sync import SyncToAsync
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_cookie
+from . import create_app, jobs, pubsub
+from .database import _apply_sqlite_pragmas
+from .models import CheckinLog, Event
+from .pagination import next_page_headers
+from .queries import (InvalidQuery, attendee_items, attendees_page, attendees_query, checkin_log_query,
+                      checkin_message, event_items, events_page, include_archived, paginate, stats_page)
+from .replicas import choose_replica, mark_replica_down
+from .stats import STATS_COLUMNS, checkin_rates_query, event_stats, rates_per_minute
+from .sweeper import start_status_sweeper
+
+# Async driver used in place of each sync backend
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(url):
+    """Map a sync SQLAlchemy URL to the same database on its async driver."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    if backend == 'sqlite' and url.database in (None, '', ':memory:'):
+        raise ValueError("The async handlers need a file or server database, not in-memory SQLite")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def base_url(scope):
+    """The request URL without its query string, as Flask's request.base_url gives it."""
+    headers = dict(scope['headers'])
+    host = headers.get(b'host', b'').decode('latin-1')
+    if not host and scope.get('server'):
+        host = '%s:%s' % tuple(scope['server'])
+    return f"{scope.get('scheme', 'http')}://{host}{scope.get('root_path', '')}{scope['path']}"
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """
+        WsgiToAsgi that runs each request on a thread pool. asgiref's adapter runs every
+        request on one shared thread per process, so slow Flask requests would queue behind
+        each other.
+    """
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        await PooledWsgiToAsgiInstance(self.wsgi_application, self.duplicate_header_limit, self.executor)(
+            scope, receive, send
+        )
+
+
+class PooledWsgiToAsgiInstance(WsgiToAsgiInstance):
+    def __init__(self, wsgi_application, duplicate_header_limit, executor):
+        super().__init__(wsgi_application, duplicate_header_limit)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        # The base class wraps its sync body in a thread-sensitive SyncToAsync; run that body on the pool
+        run = WsgiToAsgiInstance.__dict__['run_wsgi_app'].func
+        await SyncToAsync(run, thread_sensitive=False, executor=self.executor)(self, body)
+
+
+class AsyncEventApp:
+    """
+        ASGI application that serves the read-heavy GET routes (event and attendee lists,
+        stats and the check-in stream) natively on an async engine, and hands every other
+        request to the Flask app on a pool of ASGI_WSGI_THREADS threads. Idle and slow connections
+        then wait on the event loop instead of holding a worker thread each.
+        Responses match the Flask routes, except that these reads bypass the response cache.
+        The list and stats reads go to the SQLALCHEMY_REPLICA_URIS replicas like their Flask
+        routes, sharing the sticky cookie and the replicas marked down with them.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.config = flask_app.config
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.get('ASGI_WSGI_THREADS', 8), thread_name_prefix='wsgi'
+        )
+        self.wsgi = PooledWsgiToAsgi(flask_app, self.executor)
+        self.sweeper = None
+
+        url = self.config.get('ASYNC_DATABASE_URI') or async_database_url(self.config['SQLALCHEMY_DATABASE_URI'])
+        self.engine = self.create_engine(url)
+        # Same names as the sync replica engines, so a replica marked down is skipped by both
+        replicas = flask_app.extensions['replicas']
+        self.replicas = {
+            "engines": {
+                f'replica_{index}': self.create_engine(async_database_url(uri))
+                for index, uri in enumerate(self.config.get('SQLALCHEMY_REPLICA_URIS') or [])
+            },
+            "down_until": replicas["down_until"],
+            "turn": replicas["turn"],
+        }
+
+        self.routes = [
+            (re.compile(r'/events'), self.list_events),
+            (re.compile(r'/events/stats'), self.list_event_stats),
+            (re.compile(r'/events/(\d+)/stats'), self.get_event_stats),
+            (re.compile(r'/events/(\d+)/attendees'), self.list_attendees),
+        ]
+        self.streams = [(re.compile(r'/events/(\d+)/checkins/stream'), self.stream_checkins)]
+
+    def create_engine(self, url):
+        engine = create_async_engine(url, **self.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        pragmas = self.config.get('SQLITE_PRAGMAS')
+        if engine.dialect.name == 'sqlite' and pragmas:
+            event.listen(engine.sync_engine, 'connect', _apply_sqlite_pragmas(pragmas))
+        return engine
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+            for pattern, handler in self.streams:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    return await handler(scope, receive, send, args, *map(int, match.groups()))
+            for pattern, handler in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    try:
+                        status, body, headers = await self.read(
+                            scope, handler, args, base_url(scope), *map(int, match.groups())
+                        )
+                    except InvalidQuery as exc:
+                        status, body, headers = 400, {"error": str(exc)}, {}
+                    if status is not None:
+                        return await self.respond(send, status, body, headers)
+        await self.wsgi(scope, receive, send)
+
+    async def read(self, scope, handler, *args):
+        """Run a read handler on a replica, if one is picked for the client, falling back to the primary if it fails."""
+        cookies = parse_cookie(dict(scope['headers']).get(b'cookie', b'').decode('latin-1'))
+        replica = choose_replica(self.replicas, self.config, cookies)
+        if replica is not None:
+            engine = self.replicas["engines"][replica]
+            try:
+                return await handler(engine, *args)
+            except (OperationalError, InterfaceError):
+                self.flask_app.logger.warning("Replica %s failed; reading from the primary", replica, exc_info=True)
+                # Drop its pooled connections so the retry after REPLICA_RETRY_INTERVAL reconnects
+                await engine.dispose()
+                mark_replica_down(self.replicas, self.config, replica)
+        return await handler(self.engine, *args)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                with self.flask_app.app_context():
+                    # Sibling workers may already be running jobs, so only fail those whose heartbeat stopped
+                    jobs.fail_interrupted(stale_only=True)
+                    jobs.resume_queued()
+                # The sweeper also fails jobs interrupted too recently to look stale yet
+                self.sweeper = start_status_sweeper(self.flask_app)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                for engine in self.replicas["engines"].values():
+                    await engine.dispose()
+                self.executor.shutdown(wait=False)
+                if self.sweeper:
+                    self.sweeper.stop()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def respond(self, send, status, body, headers):
+        payload = self.flask_app.json.dumps(body).encode('utf-8') + b'\n'
+        raw_headers = [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())]
+        raw_headers += [(key.lower().encode('latin-1'), value.encode('latin-1')) for key, value in headers.items()]
+        await send({'type': 'http.response.start', 'status': status, 'headers': raw_headers})
+        await send({'type': 'http.response.body', 'body': payload})
+
+    async def list_events(self, engine, args, url):
+        # Reads that include the archive stay on the sync route
+        if include_archived(args):
+            return None, None, None
+        now = datetime.utcnow().replace(microsecond=0)
+        query, fields, limit = events_page(args, self.config, now)
+        async with engine.connect() as connection:
+            rows = (await connection.execute(query)).all()
+        rows, next_cursor = paginate(rows, limit, lambda row: (row.start_time, row.id))
+        return 200, event_items(rows, fields, now), next_page_headers(next_cursor, url, args)
+
+    async def event_stats(self, connection, rows):
+        window = self.config['STATS_RATE_WINDOW_MINUTES']
+        rates = {}
+        if rows:
+            rates = rates_per_minute(await connection.execute(checkin_rates_query([row.id for row in rows], window)), window)
+        return event_stats(rows, window, rates=rates)
+
+    async def list_event_stats(self, engine, args, url):
+        query, limit = stats_page(args, self.config)
+        async with engine.connect() as connection:
+            rows = (await connection.execute(query)).all()
+            rows, next_cursor = paginate(rows, limit, lambda row: (row.id,))
+            stats = await self.event_stats(connection, rows)
+        return 200, stats, next_page_headers(next_cursor, url, args)
+
+    async def get_event_stats(self, engine, args, url, event_id):
+        async with engine.connect() as connection:
+            row = (await connection.execute(select(*STATS_COLUMNS).where(Event.id == event_id))).first()
+            if row is None:
+                return 404, {"error": "Event not found"}, {}
+            stats = await self.event_stats(connection, [row])
+        return 200, stats[0], {}
+
+    async def list_attendees(self, engine, args, url, event_id):
+        # Streamed exports and reads that include the archive stay on the sync route
+        if args.get('format', 'json') != 'json' or include_archived(args):
+            return None, None, None
+        query, limit = attendees_page(attendees_query(event_id, args), args, self.config)
+        async with engine.connect() as connection:
+            if (await connection.scalar(select(Event.id).where(Event.id == event_id))) is None:
+                return 404, {"error": "Event not found"}, {}
+            rows = (await connection.execute(query)).all()
+        rows, next_cursor = paginate(rows, limit, lambda row: (row.id,))
+        return 200, attendee_items(rows), next_page_headers(next_cursor, url, args)
+
+    async def stream_checkins(self, scope, receive, send, args, event_id):
+        headers = dict(scope['headers'])
+        last_event_id = headers.get(b'last-event-id', args.get('last_event_id', '').encode()).decode() or None
+        if last_event_id is not None and not last_event_id.isdigit():
+            return await self.respond(send, 400, {"error": "Last-Event-ID must be an integer."}, {})
+
+        async with self.engine.connect() as connection:
+            if (await connection.scalar(select(Event.id).where(Event.id == event_id))) is None:
+                return await self.respond(send, 404, {"error": "Event not found"}, {})
+            if last_event_id is None:
+                # A new display starts from the latest check-in instead of replaying the whole log
+                last_event_id = await connection.scalar(
+                    select(func.max(CheckinLog.id)).where(CheckinLog.event_id == event_id)
+                ) or 0
+
+        poll_interval = self.config['CHECKIN_STREAM_POLL_INTERVAL']
+        batch_size = self.config['CHECKIN_STREAM_BATCH_SIZE']
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+
+        async def chunk(text):
+            await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
+
+        async def watch_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        disconnected = asyncio.ensure_future(watch_disconnect())
+        cursor = int(last_event_id)
+        try:
+            with pubsub.subscribe(f'checkins:{event_id}', asyncio.get_running_loop()) as subscription:
+                await chunk(f"retry: {int(poll_interval * 1000)}\n\n")
+                while not disconnected.done():
+                    async with self.engine.connect() as connection:
+                        rows = (await connection.execute(checkin_log_query(event_id, cursor, batch_size))).all()
+                    for row in rows:
+                        await chunk(checkin_message(row))
+                        cursor = row.id
+                    if len(rows) == batch_size:
+                        continue
+                    # Woken by a publish in this process; otherwise poll so other workers' check-ins still arrive
+                    if not await subscription.wait_async(poll_interval):
+                        await chunk(": keep-alive\n\n")
+        finally:
+            disconnected.cancel()
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+def create_asgi_app(config_name=None):
+    """Build the Flask app for the given profile and wrap it with the async read handlers."""
+    return AsyncEventApp(create_app(config_name))
@@ -0,0 +1,375 @@
+import csv
+import io
+import os
+from datetime import datetime
+from sqlalchemy import select, union_all, update
+from . import cache, pubsub
+from .dialects import bulk_insert_skipping_conflicts
+from .jobs import job_handler
+from .models import Attendee, Event, db, adjust_event_counters, log_checkins, normalize_email
+from .registration import CapacityChanged, _normalize
+
+# Number of CSV rows resolved against the database per batched lookup
+DEFAULT_CHUNK_SIZE = 1000
+
+# Per-item outcomes reported by batch_checkin
+BATCH_STATUSES = ("checked_in", "already_checked_in", "not_found", "invalid")
+# Largest id a 64-bit INTEGER column can hold; larger values would overflow the driver
+MAX_ATTENDEE_ID = 2 ** 63 - 1
+
+
+def iter_csv_chunks(stream, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+    """Yield lists of normalized CSV rows read incrementally from a binary stream."""
+
+    text = io.TextIOWrapper(stream, encoding=encoding, newline='')
+    reader = csv.DictReader(text)
+    chunk = []
+    for row in reader:
+        chunk.append({
+            "first_name": (row.get('first_name') or '').strip(),
+            "last_name": (row.get('last_name') or '').strip(),
+            "email": normalize_email(row.get('email') or ''),
+            "phone_number": (row.get('phone_number') or '').strip(),
+        })
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BulkCheckinResult:
+    """Running summary of a bulk check-in, with an optional window of per-row detail."""
+
+    def __init__(self, detail_offset=0, detail_limit=0):
+        self.rows = 0
+        self.checked_in = 0
+        self.already_checked_in = 0
+        self.added = 0
+        self.skipped = 0
+        self.detail_offset = detail_offset
+        self.detail_limit = detail_limit
+        self.detail = []
+
+    def record(self, row_number, row, status):
+        """Keep a row's outcome only if it falls inside the requested detail page."""
+        if self.detail_offset <= row_number < self.detail_offset + self.detail_limit:
+            self.detail.append({
+                "row": row_number + 1,
+                "first_name": row["first_name"],
+                "last_name": row["last_name"],
+                "email": row["email"],
+                "phone_number": row["phone_number"],
+                "status": status
+            })
+
+    def to_dict(self):
+        summary = {
+            "rows": self.rows,
+            "checked_in": self.checked_in,
+            "already_checked_in": self.already_checked_in,
+            "added": self.added,
+            "skipped": self.skipped
+        }
+        result = {"summary": summary}
+        if self.detail_limit:
+            result["attendees"] = self.detail
+            result["detail_offset"] = self.detail_offset
+            result["detail_limit"] = self.detail_limit
+        return result
+
+
+def _apply_checkins(attendee_ids, now):
+    """
+        Check in the given attendees with one UPDATE that skips anyone already checked in,
+        and return the ids that were actually updated.
+    """
+    if not attendee_ids:
+        return set()
+    statement = (
+        update(Attendee)
+        .where(Attendee.id.in_(attendee_ids), Attendee.check_in_status.is_not(True))
+        .values(check_in_status=True, checked_in_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.get_bind().dialect.update_returning:
+        return set(db.session.scalars(statement.returning(Attendee.id)))
+
+    # Without RETURNING, identify the updated rows by the timestamp this call wrote
+    if db.session.execute(statement).rowcount == len(attendee_ids):
+        return set(attendee_ids)
+    return set(db.session.scalars(
+        select(Attendee.id).where(Attendee.id.in_(attendee_ids), Attendee.checked_in_at == now)
+    ))
+
+
+def _match_attendees(event_id, columns, criteria):
+    """
+        Find an event's attendees matching any of `criteria` in one round trip.
+        Each criterion runs as its own branch of a UNION ALL so every branch can use its
+        (event_id, column) index; a row matching several criteria is returned more than once.
+    """
+    queries = [select(*columns).where(Attendee.event_id == event_id, criterion) for criterion in criteria]
+    return db.session.execute(queries[0] if len(queries) == 1 else union_all(*queries))
+
+
+def _walk_in_skip_reason(row, seat_free, waitlisted):
+    """Why an unmatched row cannot be added as a walk-in, or None; walk-ins are validated like registrations."""
+    if not row["email"]:
+        return "email is required for new attendees"
+    reason = _normalize(row)[1]
+    if reason:
+        return reason
+    if not seat_free:
+        return "event has a waitlist" if waitlisted else "event is full"
+    return None
+
+
+def _process_chunk(event_id, chunk, result):
+    """Resolve one chunk with a single lookup, then apply set-based UPDATE/INSERT."""
+
+    emails = {row["email"] for row in chunk if row["email"]}
+    phones = {row["phone_number"] for row in chunk if row["phone_number"]}
+
+    criteria = []
+    if emails:
+        criteria.append(Attendee.email_normalized.in_(emails))
+    if phones:
+        criteria.append(Attendee.phone_number.in_(phones))
+
+    by_email, by_phone = {}, {}
+    if criteria:
+        matches = _match_attendees(
+            event_id,
+            (Attendee.id, Attendee.email_normalized, Attendee.phone_number, Attendee.check_in_status),
+            criteria
+        )
+        for attendee_id, email, phone_number, checked_in in matches:
+            match = [attendee_id, bool(checked_in)]
+            by_email.setdefault(email, match)
+            if phone_number:
+                by_phone.setdefault(phone_number, match)
+
+    # Walk-ins take free seats like registrations, and none while anyone is waitlisted
+    capacity = db.session.execute(
+        select(Event.max_attendees, Event.registered_count, Event.waitlisted_count)
+        .where(Event.id == event_id).with_for_update()
+    ).one()
+    waitlisted = capacity.waitlisted_count > 0
+    seats = 0 if waitlisted else max(capacity.max_attendees - capacity.registered_count, 0)
+
+    now = datetime.utcnow()
+    to_check_in = set()
+    new_rows = []
+    for row in chunk:
+        row_number = result.rows
+        result.rows += 1
+
+        match = by_email.get(row["email"]) if row["email"] else None
+        if match is None and row["phone_number"]:
+            match = by_phone.get(row["phone_number"])
+
+        if match is not None:
+            if match[1]:
+                result.already_checked_in += 1
+                result.record(row_number, row, "Already Checked In")
+            else:
+                # Mark the match so repeated rows in the same upload count once
+                match[1] = True
+                to_check_in.add(match[0])
+                result.checked_in += 1
+                result.record(row_number, row, "Checked In")
+        else:
+            reason = _walk_in_skip_reason(row, len(new_rows) < seats, waitlisted)
+            if reason:
+                result.skipped += 1
+                result.record(row_number, row, f"Skipped: {reason}")
+                continue
+            new_rows.append({
+                "first_name": row["first_name"],
+                "last_name": row["last_name"],
+                "email": row["email"],
+                "email_normalized": row["email"],
+                "phone_number": row["phone_number"] or None,
+                "event_id": event_id,
+                "check_in_status": True,
+                "checked_in_at": now
+            })
+            # Later rows for the same person resolve to this pending insert
+            pending = [None, True]
+            by_email[row["email"]] = pending
+            if row["phone_number"]:
+                by_phone.setdefault(row["phone_number"], pending)
+            result.added += 1
+            result.record(row_number, row, "Added and Checked In")
+
+    if new_rows:
+        # Reserve the walk-ins' seats; the guard fails if registrations raced past the check above
+        reserved = db.session.execute(
+            update(Event)
+            .where(
+                Event.id == event_id,
+                Event.registered_count + len(new_rows) <= Event.max_attendees,
+                Event.waitlisted_count == 0
+            )
+            .values(registered_count=Event.registered_count + len(new_rows))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not reserved:
+            db.session.rollback()
+            raise CapacityChanged()
+
+    checked_in = _apply_checkins(to_check_in, now)
+    connection = db.session.connection()
+    added = bulk_insert_skipping_conflicts(
+        connection,
+        Attendee.__table__,
+        new_rows,
+        index_elements=['event_id', 'email_normalized'],
+        returning='id'
+    )
+    if len(added) < len(new_rows):
+        # Registered concurrently after the lookup, so this upload neither added nor checked them in
+        result.added -= len(new_rows) - len(added)
+        result.skipped += len(new_rows) - len(added)
+
+    # Core statements bypass the ORM counter hooks, so adjust the event totals and check-in log here;
+    # seats reserved for walk-ins that turned out to be registered already are given back
+    adjust_event_counters(
+        connection,
+        event_id,
+        registered=len(added) - len(new_rows),
+        checked_in=len(checked_in) + len(added)
+    )
+    if checked_in or added:
+        log_checkins(connection, Attendee.id.in_(checked_in | added))
+
+
+def stream_checkin(event_id, stream, chunk_size=DEFAULT_CHUNK_SIZE, detail_offset=0, detail_limit=0, on_chunk=None):
+    """
+        Check in attendees from a CSV stream without buffering the whole file.
+        Rows are matched on lowercased email or phone number; unmatched rows are
+        added as new, checked-in attendees. Returns a BulkCheckinResult.
+        If given, `on_chunk(result)` runs after each chunk, e.g. to commit and report progress.
+    """
+    result = BulkCheckinResult(detail_offset=detail_offset, detail_limit=detail_limit)
+    for chunk in iter_csv_chunks(stream, chunk_size):
+        _process_chunk(event_id, chunk, result)
+        if on_chunk:
+            on_chunk(result)
+    db.session.commit()
+    return result
+
+
+@job_handler('bulk_checkin')
+def bulk_checkin_job(job, path, chunk_size=DEFAULT_CHUNK_SIZE, detail_offset=0, detail_limit=0):
+    """
+        Background bulk check-in from a spooled upload. Each chunk is committed together
+        with the job's progress, so the write lock is only held briefly and pollers see
+        rows processed so far.
+    """
+
+    def commit_progress(result):
+        job.progress = result.rows
+        db.session.commit()
+        cache.invalidate(f'event:{job.event_id}')
+        pubsub.publish(f'checkins:{job.event_id}')
+
+    try:
+        with open(path, 'rb') as f:
+            result = stream_checkin(
+                job.event_id,
+                f,
+                chunk_size=chunk_size,
+                detail_offset=detail_offset,
+                detail_limit=detail_limit,
+                on_chunk=commit_progress
+            )
+    finally:
+        os.remove(path)
+    return {"message": "Bulk check-in completed", **result.to_dict()}
+
+
+def _parse_batch_item(item):
+    """Return ('id', int) or ('email', normalized str) for a batch item, or None if invalid."""
+    if isinstance(item, dict):
+        item = item.get('id', item.get('email'))
+    if isinstance(item, bool):
+        return None
+    if isinstance(item, str) and item.strip():
+        value = item.strip()
+        # isdigit() also accepts characters such as '²' that int() rejects
+        if not value.isdecimal():
+            return 'email', normalize_email(value)
+        item = int(value)
+    if isinstance(item, int):
+        return ('id', item) if 0 < item <= MAX_ATTENDEE_ID else None
+    return None
+
+
+def batch_checkin(event_id, items, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+        Check in a batch of attendees identified by id or email in one transaction.
+        Each chunk is resolved with one lookup and applied with one UPDATE.
+        Returns (summary, results) where results holds one entry per input item.
+    """
+    now = datetime.utcnow()
+    results = []
+    total_checked_in = 0
+    seen = set()
+
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        parsed = [_parse_batch_item(item) for item in chunk]
+        ids = {value for kind, value in filter(None, parsed) if kind == 'id'}
+        emails = {value for kind, value in filter(None, parsed) if kind == 'email'}
+
+        criteria = []
+        if ids:
+            criteria.append(Attendee.id.in_(ids))
+        if emails:
+            criteria.append(Attendee.email_normalized.in_(emails))
+
+        by_id, by_email = {}, {}
+        if criteria:
+            matches = _match_attendees(
+                event_id,
+                (Attendee.id, Attendee.email_normalized, Attendee.check_in_status),
+                criteria
+            )
+            for attendee_id, email, checked_in in matches:
+                by_id[attendee_id] = (attendee_id, bool(checked_in))
+                by_email.setdefault(email, (attendee_id, bool(checked_in)))
+
+        pending = []
+        for item, key in zip(chunk, parsed):
+            if key is None:
+                results.append({"item": item, "status": "invalid"})
+                continue
+            match = (by_id if key[0] == 'id' else by_email).get(key[1])
+            if match is None:
+                results.append({"item": item, "status": "not_found"})
+            elif match[1] or match[0] in seen:
+                results.append({"item": item, "attendee_id": match[0], "status": "already_checked_in"})
+            else:
+                seen.add(match[0])
+                entry = {"item": item, "attendee_id": match[0], "status": "checked_in"}
+                results.append(entry)
+                pending.append(entry)
+
+        updated = _apply_checkins({entry["attendee_id"] for entry in pending}, now)
+        for entry in pending:
+            if entry["attendee_id"] not in updated:
+                # Checked in concurrently between the lookup and the UPDATE
+                entry["status"] = "already_checked_in"
+        total_checked_in += len(updated)
+        if updated:
+            log_checkins(db.session.connection(), Attendee.id.in_(updated))
+
+    adjust_event_counters(db.session.connection(), event_id, checked_in=total_checked_in)
+    db.session.commit()
+
+    summary = {status: 0 for status in BATCH_STATUSES}
+    for entry in results:
+        summary[entry["status"]] += 1
+    return summary, results
@@ -0,0 +1,177 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, current_app, g, request
+from .replicas import reads_own_writes
+
+
+class CacheBackend:
+    """
+        Minimal key/value interface used by the response cache.
+        Implementations must be safe to share between request threads.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def incr(self, key):
+        """Atomically increment an integer key that never expires, returning the new value."""
+        raise NotImplementedError
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend that stores nothing, which disables response caching."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def incr(self, key):
+        return 0
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+        In-process LRU cache with a per-entry TTL. Invalidations only reach the process that
+        made them, so it is only correct when a single worker process serves the app.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Counters are kept apart from entries so eviction never resets a scope version
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend for any client exposing Redis' get/set(ex=)/incr commands."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        value = self.client.get(key)
+        if value is None:
+            return None
+        if key.startswith(ResponseCache.VERSION_PREFIX):
+            return int(value)
+        return pickle.loads(value)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, pickle.dumps(value), ex=max(int(ttl), 1))
+
+    def incr(self, key):
+        return self.client.incr(key)
+
+
+def make_backend(config):
+    """Build the cache backend selected by CACHE_BACKEND ('lru', 'redis' or 'null')."""
+    name = config.get('CACHE_BACKEND', 'lru')
+    if name == 'lru':
+        return LRUCacheBackend(config.get('CACHE_MAX_ENTRIES', 1024))
+    if name == 'redis':
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND='redis' requires the 'redis' package.") from exc
+        return RedisCacheBackend(redis.Redis.from_url(config['CACHE_REDIS_URL']))
+    if name == 'null':
+        return NullCacheBackend()
+    raise ValueError(f"Unknown CACHE_BACKEND: {name}")
+
+
+class ResponseCache:
+    """
+        Read-through cache for GET responses with ETag support.
+        Each cached view declares the scopes it depends on (e.g. 'events' or 'event:<id>').
+        Cache keys embed the current version of every scope, so invalidating a scope is a
+        single counter increment and only that scope's responses stop being served.
+        Responses read from a replica are not stored, since a lagging replica could put a
+        pre-write page under the post-write version, and clients that have just written
+        bypass the cache so they read their own writes from the primary.
+    """
+
+    VERSION_PREFIX = 'cache:version:'
+
+    def init_app(self, app):
+        app.extensions['response_cache'] = make_backend(app.config)
+
+    @property
+    def backend(self):
+        return current_app.extensions['response_cache']
+
+    def _key(self, scopes):
+        versions = ','.join(f"{scope}={self.backend.get(self.VERSION_PREFIX + scope) or 0}" for scope in scopes)
+        return f"cache:response:{versions}:{request.full_path}"
+
+    def cached(self, scopes):
+        """Cache a view's 200 responses; `scopes` maps the view kwargs to a list of scope names."""
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(**kwargs):
+                if request.method != 'GET' or isinstance(self.backend, NullCacheBackend):
+                    return view(**kwargs)
+                if reads_own_writes(current_app.config, request.cookies):
+                    return view(**kwargs)
+
+                key = self._key(scopes(**kwargs))
+                entry = self.backend.get(key)
+                if entry is None:
+                    response = current_app.make_response(view(**kwargs))
+                    if response.status_code != 200 or response.is_streamed or g.get('_db_replica') is not None:
+                        return response
+                    body = response.get_data()
+                    etag = hashlib.sha1(body).hexdigest()
+                    headers = [(k, v) for k, v in response.headers if k.lower() != 'content-length']
+                    entry = (body, headers, etag)
+                    self.backend.set(key, entry, current_app.config.get('CACHE_DEFAULT_TTL', 30))
+
+                body, headers, etag = entry
+                response = Response(body, 200, headers)
+                response.set_etag(etag)
+                return response.make_conditional(request)
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *scopes):
+        """Drop every cached response that depends on any of the given scopes."""
+        for scope in scopes:
+            self.backend.incr(self.VERSION_PREFIX + scope)
@@ -0,0 +1,99 @@
+import click
+from datetime import datetime, timedelta
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, select, update
+from . import jobs
+from .archive import archive_events
+from .models import Attendee, Event, IdempotencyKey, WaitlistEntry, db
+from .registration import promote_waitlists
+from .sweeper import sweep_event_statuses
+
+
+def reconcile_event_counters():
+    """Rebuild every event's registered/checked-in/waitlisted counters from the attendee and waitlist tables."""
+
+    registered = (
+        select(func.count(Attendee.id))
+        .where(Attendee.event_id == Event.id)
+        .scalar_subquery()
+    )
+    checked_in = (
+        select(func.count(Attendee.id))
+        .where(Attendee.event_id == Event.id, Attendee.check_in_status.is_(True))
+        .scalar_subquery()
+    )
+    waitlisted = (
+        select(func.count(WaitlistEntry.id))
+        .where(WaitlistEntry.event_id == Event.id)
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(Event)
+        .values(registered_count=registered, checked_in_count=checked_in, waitlisted_count=waitlisted)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+@click.command('reconcile-counters')
+@with_appcontext
+def reconcile_counters_command():
+    """Recompute denormalized attendee counters for all events."""
+    count = reconcile_event_counters()
+    click.echo(f"Reconciled counters for {count} event(s).")
+
+
+@click.command('sweep-statuses')
+@with_appcontext
+def sweep_statuses_command():
+    """Advance the status of all events that have started or ended."""
+    count = sweep_event_statuses()
+    click.echo(f"Updated status of {count} event(s).")
+
+
+def purge_idempotency_keys(max_age_seconds):
+    """Delete stored idempotent responses older than `max_age_seconds`."""
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    result = db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff))
+    db.session.commit()
+    return result.rowcount
+
+
+@click.command('purge-idempotency-keys')
+@with_appcontext
+def purge_idempotency_keys_command():
+    """Remove idempotency keys past IDEMPOTENCY_KEY_TTL."""
+    count = purge_idempotency_keys(current_app.config['IDEMPOTENCY_KEY_TTL'])
+    click.echo(f"Purged {count} idempotency key(s).")
+
+
+@click.command('archive-events')
+@click.option('--retention-days', type=int, default=None, help='Defaults to ARCHIVE_RETENTION_DAYS.')
+@click.option('--batch-size', type=int, default=None, help='Defaults to ARCHIVE_BATCH_SIZE.')
+@with_appcontext
+def archive_events_command(retention_days, batch_size):
+    """Move events that ended past the retention window, and their attendees, to the archive tables."""
+    config = current_app.config
+    events, attendees = archive_events(
+        config['ARCHIVE_RETENTION_DAYS'] if retention_days is None else retention_days,
+        batch_size or config['ARCHIVE_BATCH_SIZE']
+    )
+    click.echo(f"Archived {events} event(s) and {attendees} attendee(s).")
+
+
+@click.command('promote-waitlists')
+@with_appcontext
+def promote_waitlists_command():
+    """Register waitlisted attendees into every event with free seats, oldest first."""
+    count = promote_waitlists(current_app.config['WAITLIST_PROMOTION_BATCH_SIZE'])
+    click.echo(f"Promoted {count} waitlisted attendee(s).")
+
+
+@click.command('fail-interrupted-jobs')
+@with_appcontext
+def fail_interrupted_jobs_command():
+    """Mark jobs left running by a stopped server as failed and remove their spooled uploads."""
+    count = jobs.fail_interrupted()
+    click.echo(f"Marked {count} interrupted job(s) as failed.")
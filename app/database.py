@@ -0,0 +1,25 @@
+from sqlalchemy import event
+
+
+def _apply_sqlite_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return on_connect
+
+
+def app_engines(app, db):
+    """Every engine of the app: the Flask-SQLAlchemy engines plus any read replicas."""
+    with app.app_context():
+        engines = list(db.engines.values())
+    return engines + list(app.extensions.get('replicas', {}).get('engines', {}).values())
+
+
+def configure_engines(app, db):
+    """Attach per-connection setup, such as SQLite pragmas, to every engine of the app."""
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    for engine in app_engines(app, db):
+        if engine.dialect.name == 'sqlite' and pragmas:
+            event.listen(engine, 'connect', _apply_sqlite_pragmas(pragmas))
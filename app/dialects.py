@@ -0,0 +1,114 @@
+import csv
+import io
+from uuid import uuid4
+from sqlalchemy import func, insert, select, table as table_clause, column
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Dialects whose insert() supports ON CONFLICT clauses
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_insert(dialect_name, table):
+    """Return an INSERT supporting on_conflict_do_update/do_nothing for the dialect, or None."""
+    factory = _UPSERT_INSERTS.get(dialect_name)
+    return factory(table) if factory else None
+
+
+def insert_skipping_conflicts(dialect_name, table, index_elements):
+    """
+        INSERT that silently skips rows violating the unique index on `index_elements`
+        (ON CONFLICT DO NOTHING). Dialects without it get a plain INSERT, so conflicts
+        raise IntegrityError there instead.
+    """
+    statement = upsert_insert(dialect_name, table)
+    if statement is None:
+        return insert(table)
+    return statement.on_conflict_do_nothing(index_elements=index_elements)
+
+
+def lock_key(connection, key):
+    """
+        Serialize transactions that lock the same `key` until they end. PostgreSQL takes a
+        transaction-scoped advisory lock; SQLite admits one writer at a time, so a transaction
+        that has already written holds the lock without one.
+    """
+    if connection.dialect.name == 'postgresql':
+        connection.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return value
+
+
+def _copy_rows(connection, table, columns, rows):
+    """Stream rows into a PostgreSQL table with COPY ... FROM STDIN inside the connection's transaction."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in columns])
+    buffer.seek(0)
+
+    preparer = connection.dialect.identifier_preparer
+    statement = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')".format(
+        preparer.format_table(table),
+        ', '.join(preparer.quote(column) for column in columns)
+    )
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    except connection.dialect.dbapi.IntegrityError as exc:
+        # Surface constraint violations the same way as statements run through SQLAlchemy
+        raise IntegrityError(statement, None, exc) from exc
+    finally:
+        cursor.close()
+
+
+def bulk_insert_skipping_conflicts(connection, table, rows, index_elements, returning):
+    """
+        Insert many rows, skipping those that violate the unique index on `index_elements`,
+        and return the set of `returning` column values of the rows actually inserted;
+        `returning` is a column of `rows` or the table's generated primary key.
+        PostgreSQL/psycopg2 COPYs into a temporary table and inserts from it in one statement;
+        other dialects batch the rows into multi-row INSERT ... ON CONFLICT DO NOTHING statements.
+    """
+    if not rows:
+        return set()
+    columns = list(rows[0])
+    dialect = connection.dialect
+    if dialect.name == 'postgresql' and dialect.driver == 'psycopg2':
+        staging = table_clause(f"bulk_{table.name}_{uuid4().hex[:12]}", *(column(name) for name in columns))
+        preparer = dialect.identifier_preparer
+        connection.exec_driver_sql(
+            f"CREATE TEMPORARY TABLE {preparer.format_table(staging)} "
+            f"(LIKE {preparer.format_table(table)} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        _copy_rows(connection, staging, columns, rows)
+        statement = (
+            insert_skipping_conflicts(dialect.name, table, index_elements)
+            .from_select(columns, select(*staging.c))
+            .returning(table.c[returning])
+        )
+        return set(connection.execute(statement).scalars())
+
+    statement = insert_skipping_conflicts(dialect.name, table, index_elements)
+    if dialect.insert_executemany_returning:
+        # SQLAlchemy packs executemany-with-RETURNING into multi-row VALUES batches
+        return set(connection.execute(statement.returning(table.c[returning]), rows).scalars())
+    if returning in columns:
+        connection.execute(statement, rows)
+        return {row[returning] for row in rows}
+    # A generated primary key can only be read back one row at a time without RETURNING
+    inserted = set()
+    for row in rows:
+        result = connection.execute(statement, row)
+        if result.rowcount:
+            inserted.add(result.inserted_primary_key[0])
+    return inserted
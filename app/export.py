@@ -0,0 +1,23 @@
+import csv
+import io
+import json
+
+
+def iter_ndjson(rows, fields, dumps=json.dumps):
+    """Yield one JSON document per row, newline-delimited, encoded with `dumps`."""
+    for row in rows:
+        yield dumps({field: getattr(row, field) for field in fields}) + '\n'
+
+
+def iter_csv(rows, fields, batch_size=500):
+    """Yield CSV text a batch of rows at a time, starting with a header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([getattr(row, field) for field in fields])
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+
+# Registered job functions, keyed by Job.kind
+_handlers = {}
+
+
+def job_handler(kind):
+    """Register a function as the handler for jobs of `kind`; it receives (job, **payload)."""
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+class JobRunner:
+    """
+        Runs long imports in a bounded thread pool, tracking each run in the job table.
+        No external broker is needed: the table holds status, payload, progress and results,
+        and JOB_MAX_CONCURRENCY caps how many jobs run at once per process. A payload `path`
+        names an upload spooled in JOB_UPLOAD_DIR that belongs to the job. Running jobs
+        refresh heartbeat_at every JOB_HEARTBEAT_INTERVAL seconds while their process lives.
+    """
+
+    def init_app(self, app):
+        app.extensions['job_executor'] = ThreadPoolExecutor(
+            max_workers=app.config.get('JOB_MAX_CONCURRENCY', 2),
+            thread_name_prefix='job'
+        )
+
+    def submit(self, kind, event_id=None, **payload):
+        """Record a queued job and schedule it; returns the job id."""
+        from .models import Job, db
+
+        if kind not in _handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        job = Job(kind=kind, event_id=event_id, payload=json.dumps(payload))
+        db.session.add(job)
+        db.session.commit()
+        self._schedule(current_app._get_current_object(), job.id, payload)
+        return job.id
+
+    def _schedule(self, app, job_id, payload):
+        if app.config.get('JOBS_EAGER'):
+            # Run inline, e.g. under tests where the in-memory database is single-connection
+            self._run(app, job_id, payload)
+        else:
+            app.extensions['job_executor'].submit(self._run, app, job_id, payload)
+
+    def fail_interrupted(self, stale_only=False):
+        """
+            Fail the jobs still marked running and remove their spooled uploads; returns how many.
+            By default every running job is failed, which is only safe before any process runs
+            jobs (e.g. gunicorn's master at startup). With `stale_only`, only jobs whose heartbeat
+            stopped three JOB_HEARTBEAT_INTERVALs ago are failed, so jobs other live processes are
+            running are left alone.
+        """
+        from .models import Job, JobStatus, db
+
+        query = db.select(Job).where(Job.status == JobStatus.running)
+        if stale_only:
+            interval = current_app.config['JOB_HEARTBEAT_INTERVAL']
+            cutoff = datetime.utcnow() - timedelta(seconds=3 * interval)
+            query = query.where(db.func.coalesce(Job.heartbeat_at, Job.started_at) < cutoff)
+        jobs = db.session.scalars(query).all()
+        for job in jobs:
+            job.status = JobStatus.failed
+            job.error = "Interrupted by a server restart"
+            job.finished_at = datetime.utcnow()
+            self._remove_upload(job)
+        db.session.commit()
+        return len(jobs)
+
+    def resume_queued(self):
+        """Schedule the jobs still queued, e.g. ones accepted just before a restart; returns how many."""
+        from .models import Job, JobStatus, db
+
+        app = current_app._get_current_object()
+        jobs = db.session.execute(
+            db.select(Job.id, Job.payload).where(Job.status == JobStatus.queued).order_by(Job.created_at)
+        ).all()
+        for job_id, payload in jobs:
+            self._schedule(app, job_id, json.loads(payload or '{}'))
+        return len(jobs)
+
+    @staticmethod
+    def _remove_upload(job):
+        path = json.loads(job.payload or '{}').get('path')
+        upload_dir = os.path.realpath(current_app.config['JOB_UPLOAD_DIR'])
+        if path and os.path.dirname(os.path.realpath(path)) == upload_dir:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _heartbeat(app, job_id, stopped):
+        from .models import Job, JobStatus, db
+
+        while not stopped.wait(app.config['JOB_HEARTBEAT_INTERVAL']):
+            with app.app_context():
+                try:
+                    db.session.execute(
+                        db.update(Job)
+                        .where(Job.id == job_id, Job.status == JobStatus.running)
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception("Heartbeat for job %s failed", job_id)
+
+    @classmethod
+    def _run(cls, app, job_id, payload):
+        from .models import Job, JobStatus, db
+
+        with app.app_context():
+            # Claim the job, so one resumed by several processes after a restart runs once
+            now = datetime.utcnow()
+            claimed = db.session.execute(
+                db.update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.queued)
+                .values(status=JobStatus.running, started_at=now, heartbeat_at=now)
+            ).rowcount
+            db.session.commit()
+            if not claimed:
+                return
+            stopped = threading.Event()
+            if not app.config.get('JOBS_EAGER'):
+                threading.Thread(target=cls._heartbeat, args=(app, job_id, stopped),
+                                 name=f'job-heartbeat-{job_id}', daemon=True).start()
+            job = db.session.get(Job, job_id)
+            try:
+                result = _handlers[job.kind](job, **payload)
+                job.result = json.dumps(result)
+                job.status = JobStatus.succeeded
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Job %s failed", job_id)
+                job = db.session.get(Job, job_id)
+                job.error = traceback.format_exc(limit=5)
+                job.status = JobStatus.failed
+            finally:
+                stopped.set()
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
@@ -0,0 +1,166 @@
+import hmac
+import threading
+import time
+from collections import Counter, defaultdict
+from flask import Response, g, has_app_context, jsonify, request
+from sqlalchemy import event
+from .database import app_engines
+
+# Latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Clients allowed to scrape /metrics when no METRICS_TOKEN is configured
+LOOPBACK_ADDRESSES = {'127.0.0.1', '::1'}
+
+
+class Histogram:
+    """Prometheus-style histogram; each bucket counts observations at or below its bound."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels.items())
+
+
+class MetricsRegistry:
+    """Per-process request and SQL metrics, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.latency = defaultdict(lambda: Histogram(self.buckets))
+        self.requests = Counter()
+        self.queries = Counter()
+        self.query_seconds = Counter()
+        self.n_plus_one = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, route, method, status, seconds, queries, query_seconds, n_plus_one):
+        with self._lock:
+            self.latency[(route, method)].observe(seconds)
+            self.requests[(route, method, status)] += 1
+            self.queries[(route, method)] += queries
+            self.query_seconds[(route, method)] += query_seconds
+            if n_plus_one:
+                self.n_plus_one[(route, method)] += 1
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines.append('# HELP http_request_duration_seconds Request latency by route.')
+            lines.append('# TYPE http_request_duration_seconds histogram')
+            for (route, method), histogram in sorted(self.latency.items()):
+                labels = _labels(route=route, method=method)
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {histogram.count}')
+
+            lines.append('# HELP http_requests_total Requests by route and status code.')
+            lines.append('# TYPE http_requests_total counter')
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{{_labels(route=route, method=method, status=status)}}} {count}')
+
+            lines.append('# HELP db_queries_total SQL statements executed while serving each route.')
+            lines.append('# TYPE db_queries_total counter')
+            for (route, method), count in sorted(self.queries.items()):
+                lines.append(f'db_queries_total{{{_labels(route=route, method=method)}}} {count}')
+
+            lines.append('# HELP db_query_duration_seconds_total Time spent executing SQL for each route.')
+            lines.append('# TYPE db_query_duration_seconds_total counter')
+            for (route, method), seconds in sorted(self.query_seconds.items()):
+                lines.append(f'db_query_duration_seconds_total{{{_labels(route=route, method=method)}}} {seconds:.6f}')
+
+            lines.append('# HELP db_n_plus_one_requests_total Requests that repeated one SQL statement past the N+1 threshold.')
+            lines.append('# TYPE db_n_plus_one_requests_total counter')
+            for (route, method), count in sorted(self.n_plus_one.items()):
+                lines.append(f'db_n_plus_one_requests_total{{{_labels(route=route, method=method)}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+class Instrumentation:
+    """
+        Records per-route latency, SQL query counts and query time, and flags likely N+1
+        patterns. When METRICS_ENABLED is off nothing is registered, so there is no overhead.
+        The registry lives in each process: under several workers a scrape of /metrics only
+        reports the worker that answered it.
+    """
+
+    def init_app(self, app, db):
+        if not app.config.get('METRICS_ENABLED'):
+            return
+        registry = MetricsRegistry()
+        app.extensions['metrics'] = registry
+        threshold = app.config.get('METRICS_N_PLUS_ONE_THRESHOLD', 10)
+        server_timing = app.config.get('METRICS_SERVER_TIMING', False)
+
+        @app.before_request
+        def start_timer():
+            g._metrics = {"start": time.perf_counter(), "queries": 0, "query_seconds": 0.0, "statements": Counter()}
+
+        @app.after_request
+        def record_request(response):
+            stats = g.pop('_metrics', None)
+            if stats is None:
+                return response
+            elapsed = time.perf_counter() - stats["start"]
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+
+            repeated = stats["statements"].most_common(1)
+            n_plus_one = bool(repeated) and repeated[0][1] >= threshold
+            if n_plus_one:
+                app.logger.warning("Possible N+1 on %s %s: statement ran %d times: %s",
+                                   request.method, route, repeated[0][1], repeated[0][0][:200])
+
+            registry.record(route, request.method, response.status_code, elapsed,
+                            stats["queries"], stats["query_seconds"], n_plus_one)
+            if server_timing:
+                response.headers['Server-Timing'] = (
+                    f'db;dur={stats["query_seconds"] * 1000:.2f};desc="{stats["queries"]} queries", '
+                    f'app;dur={elapsed * 1000:.2f}'
+                )
+            return response
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info['query_start'].pop()
+            stats = g.get('_metrics') if has_app_context() else None
+            if stats is not None:
+                stats["queries"] += 1
+                stats["query_seconds"] += time.perf_counter() - started
+                stats["statements"][statement] += 1
+
+        def handle_error(exception_context):
+            starts = exception_context.connection.info.get('query_start') if exception_context.connection else None
+            if starts:
+                starts.pop()
+
+        for engine in app_engines(app, db):
+            event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+            event.listen(engine, 'handle_error', handle_error)
+
+        def metrics():
+            token = app.config.get('METRICS_TOKEN')
+            if token:
+                if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+                    return jsonify({"error": "A valid metrics token is required."}), 401
+            elif request.remote_addr not in LOOPBACK_ADDRESSES:
+                return jsonify({"error": "Metrics are only served to local clients."}), 403
+            return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+        app.add_url_rule('/metrics', 'metrics', metrics)
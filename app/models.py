@@ -1,48 +1,335 @@
-from . import db
-from sqlalchemy import Enum
-import enum
-from werkzeug.security import generate_password_hash, check_password_hash
-
-# Enum for representing the status of an event
-class EventStatus(enum.Enum):
-    scheduled = "scheduled"
-    ongoing = "ongoing"
-    completed = "completed"
-    canceled = "canceled"
-
-# Model for events
-class Event(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    description = db.Column(db.String(255), nullable=True)
-    start_time = db.Column(db.DateTime, nullable=False)
-    end_time = db.Column(db.DateTime, nullable=False)
-    location = db.Column(db.String(100), nullable=False)
-    max_attendees = db.Column(db.Integer, nullable=False)
-    status = db.Column(db.Enum(EventStatus), default=EventStatus.scheduled)
-
-    def can_add_attendee(self):
-        """Check if the event can accept more attendees."""
-        return Attendee.query.filter_by(event_id=self.id).count() < self.max_attendees
-
-# Model for attendees of events
-class Attendee(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    first_name = db.Column(db.String(50), nullable=False)
-    last_name = db.Column(db.String(50), nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    phone_number = db.Column(db.String(15), nullable=True)
-    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
-    check_in_status = db.Column(db.Boolean, default=False)
-
-# Model for users (authentication)
-class User(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False)
-    password = db.Column(db.String(120), nullable=False)
-
-    def set_password(self, password):
-        self.password = generate_password_hash(password)
-
-    def check_password(self, password):
+from . import db
+from .dialects import upsert_insert
+from sqlalchemy import Enum, and_, event, exists, insert, inspect, or_, select, update
+import json
+from datetime import datetime
+from uuid import uuid4
+import enum
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Enum for representing the status of an event
+class EventStatus(enum.Enum):
+    scheduled = "scheduled"
+    ongoing = "ongoing"
+    completed = "completed"
+    canceled = "canceled"
+
+def effective_status(status, start_time, end_time, now=None):
+    """Derive an event's current status from its stored status and time window."""
+    now = now or datetime.utcnow()
+    status = status if isinstance(status, EventStatus) else EventStatus[status]
+    if status not in (EventStatus.scheduled, EventStatus.ongoing):
+        return status
+    if end_time <= now:
+        return EventStatus.completed
+    if start_time <= now:
+        return EventStatus.ongoing
+    return status
+
+class EventStatusMixin:
+    """Effective-status helpers shared by live and archived events."""
+
+    def effective_status(self, now=None):
+        """Return the status the event has at `now`, even if the sweeper has not run yet."""
+        return effective_status(self.status, self.start_time, self.end_time, now)
+
+    @classmethod
+    def effective_status_is(cls, status, now=None):
+        """SQL criterion matching events whose effective status at `now` is `status`."""
+        now = now or datetime.utcnow()
+        if status == EventStatus.completed:
+            return or_(
+                cls.status == EventStatus.completed,
+                and_(cls.status.in_([EventStatus.scheduled, EventStatus.ongoing]), cls.end_time <= now)
+            )
+        if status == EventStatus.ongoing:
+            return or_(
+                and_(cls.status == EventStatus.ongoing, cls.end_time > now),
+                and_(cls.status == EventStatus.scheduled, cls.start_time <= now, cls.end_time > now)
+            )
+        if status == EventStatus.scheduled:
+            return and_(cls.status == EventStatus.scheduled, cls.start_time > now)
+        return cls.status == status
+
+# Model for events
+class Event(EventStatusMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.String(255), nullable=True)
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    location = db.Column(db.String(100), nullable=False)
+    max_attendees = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.Enum(EventStatus), default=EventStatus.scheduled)
+    # Denormalized counters, kept in step with the attendee table on every write
+    registered_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    checked_in_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Registrations waiting for a seat; while non-zero, new registrations join the waitlist
+    waitlisted_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        # Keyset pagination on (start_time, id), optionally narrowed by status or location
+        db.Index('ix_event_start_time_id', 'start_time', 'id'),
+        db.Index('ix_event_status_start_time', 'status', 'start_time', 'id'),
+        db.Index('ix_event_location_start_time', 'location', 'start_time', 'id'),
+        # Interval-overlap lookups for a venue's bookings
+        db.Index('ix_event_location_schedule', 'location', 'start_time', 'end_time'),
+        # Serve the status sweeper's due-event lookups
+        db.Index('ix_event_status_end_time', 'status', 'end_time'),
+    )
+
+    def can_add_attendee(self):
+        """Check if the event can accept more attendees."""
+        return db.session.scalar(
+            select(Event.registered_count < Event.max_attendees).where(Event.id == self.id)
+        )
+
+def normalize_email(email):
+    """Canonical form of an email address used for matching attendees."""
+    return email.strip().lower()
+
+def _email_normalized_default(context):
+    return normalize_email(context.get_current_parameters()['email'])
+
+# Model for attendees of events
+class Attendee(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    first_name = db.Column(db.String(50), nullable=False)
+    last_name = db.Column(db.String(50), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    # Lowercased email, filled in from `email` on insert; unique per event, so the same
+    # person can attend many events but register for each one only once
+    email_normalized = db.Column(db.String(120), nullable=False, default=_email_normalized_default)
+    phone_number = db.Column(db.String(15), nullable=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    check_in_status = db.Column(db.Boolean, default=False)
+    checked_in_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Keyset pagination per event, with or without the check-in filter
+        db.Index('ix_attendee_event_id', 'event_id', 'id'),
+        db.Index('ix_attendee_event_checkin_id', 'event_id', 'check_in_status', 'id'),
+        # Registration upserts conflict on this key; check-ins match rows by email or phone within an event
+        db.Index('ix_attendee_event_email_normalized', 'event_id', 'email_normalized', unique=True),
+        db.Index('ix_attendee_event_phone_number', 'event_id', 'phone_number'),
+    )
+
+
+# Registrations that arrived while an event was full, promoted to attendees in id (arrival) order
+class WaitlistEntry(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    first_name = db.Column(db.String(50), nullable=False)
+    last_name = db.Column(db.String(50), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    email_normalized = db.Column(db.String(120), nullable=False, default=_email_normalized_default)
+    phone_number = db.Column(db.String(15), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # FIFO promotion per event; each email waits at most once per event
+        db.Index('ix_waitlist_entry_event_id', 'event_id', 'id'),
+        db.Index('ix_waitlist_entry_event_email_normalized', 'event_id', 'email_normalized', unique=True),
+    )
+
+
+# Cold storage for events past ARCHIVE_RETENTION_DAYS, moved here by `flask archive-events`.
+# Rows keep their ids, so links and cursors stay valid once an event is archived.
+class ArchivedEvent(EventStatusMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.String(255), nullable=True)
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    location = db.Column(db.String(100), nullable=False)
+    max_attendees = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.Enum(EventStatus))
+    registered_count = db.Column(db.Integer, nullable=False, default=0)
+    checked_in_count = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Keyset pagination for GET /events?include_archived=true, optionally by location
+        db.Index('ix_archived_event_start_time_id', 'start_time', 'id'),
+        db.Index('ix_archived_event_location_start_time', 'location', 'start_time', 'id'),
+    )
+
+
+class ArchivedAttendee(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    first_name = db.Column(db.String(50), nullable=False)
+    last_name = db.Column(db.String(50), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    email_normalized = db.Column(db.String(120), nullable=False)
+    phone_number = db.Column(db.String(15), nullable=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('archived_event.id'), nullable=False)
+    check_in_status = db.Column(db.Boolean, default=False)
+    checked_in_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Keyset pagination per archived event, with or without the check-in filter
+        db.Index('ix_archived_attendee_event_id', 'event_id', 'id'),
+        db.Index('ix_archived_attendee_event_checkin_id', 'event_id', 'check_in_status', 'id'),
+    )
+
+
+# Check-ins per event per minute, kept incrementally to serve check-in rates
+class EventCheckinMinute(db.Model):
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), primary_key=True)
+    minute = db.Column(db.DateTime, primary_key=True, index=True)
+    checkins = db.Column(db.Integer, nullable=False, default=0)
+
+
+def record_checkins(connection, event_id, count, at=None):
+    """Add `count` check-ins to the event's bucket for the current minute."""
+    table = EventCheckinMinute.__table__
+    minute = (at or datetime.utcnow()).replace(second=0, microsecond=0)
+    statement = upsert_insert(connection.dialect.name, table)
+    if statement is not None:
+        connection.execute(
+            statement.values(event_id=event_id, minute=minute, checkins=count)
+            .on_conflict_do_update(
+                index_elements=[table.c.event_id, table.c.minute],
+                set_={"checkins": table.c.checkins + count}
+            )
+        )
+        return
+    updated = connection.execute(
+        update(table)
+        .where(table.c.event_id == event_id, table.c.minute == minute)
+        .values(checkins=table.c.checkins + count)
+    ).rowcount
+    if not updated:
+        connection.execute(insert(table).values(event_id=event_id, minute=minute, checkins=count))
+
+
+# Append-only log of check-ins; its id is the SSE event id that live displays resume from
+class CheckinLog(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    attendee_id = db.Column(db.Integer, nullable=False, unique=True)
+    checked_in_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Resume a stream from the last id a display has seen
+        db.Index('ix_checkin_log_event_id', 'event_id', 'id'),
+    )
+
+
+def log_checkins(connection, *criteria):
+    """Append log entries for checked-in attendees matching `criteria` that are not logged yet."""
+    return connection.execute(
+        insert(CheckinLog.__table__).from_select(
+            ['event_id', 'attendee_id', 'checked_in_at'],
+            select(Attendee.event_id, Attendee.id, Attendee.checked_in_at)
+            .where(
+                Attendee.check_in_status.is_(True),
+                ~exists().where(CheckinLog.attendee_id == Attendee.id),
+                *criteria
+            )
+            .order_by(Attendee.id)
+        )
+    ).rowcount
+
+
+def adjust_event_counters(connection, event_id, registered=0, checked_in=0, waitlisted=0):
+    """Apply a relative change to an event's denormalized attendee and waitlist counters."""
+    if not registered and not checked_in and not waitlisted:
+        return
+    connection.execute(
+        update(Event.__table__)
+        .where(Event.__table__.c.id == event_id)
+        .values(
+            registered_count=Event.__table__.c.registered_count + registered,
+            checked_in_count=Event.__table__.c.checked_in_count + checked_in,
+            waitlisted_count=Event.__table__.c.waitlisted_count + waitlisted
+        )
+    )
+    if checked_in > 0:
+        record_checkins(connection, event_id, checked_in)
+
+
+# Keep counters correct for attendees written through the ORM unit of work.
+# Routes that write with bulk/core statements adjust the counters themselves.
+@event.listens_for(Attendee, 'after_insert')
+def _count_inserted_attendee(mapper, connection, target):
+    adjust_event_counters(connection, target.event_id, registered=1, checked_in=1 if target.check_in_status else 0)
+    if target.check_in_status:
+        log_checkins(connection, Attendee.id == target.id)
+
+
+@event.listens_for(Attendee, 'after_delete')
+def _count_deleted_attendee(mapper, connection, target):
+    adjust_event_counters(connection, target.event_id, registered=-1, checked_in=-1 if target.check_in_status else 0)
+
+
+@event.listens_for(Attendee, 'after_update')
+def _count_checkin_change(mapper, connection, target):
+    history = inspect(target).attrs.check_in_status.history
+    if not history.has_changes():
+        return
+    was_checked_in = bool(history.deleted and history.deleted[0])
+    if bool(target.check_in_status) != was_checked_in:
+        adjust_event_counters(connection, target.event_id, checked_in=1 if target.check_in_status else -1)
+        if target.check_in_status:
+            log_checkins(connection, Attendee.id == target.id)
+
+
+# Stored outcome of a request sent with an Idempotency-Key header, replayed on retries
+class IdempotencyKey(db.Model):
+    key = db.Column(db.String(255), primary_key=True)
+    request_path = db.Column(db.String(255), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    response_body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+# Enum for the lifecycle of a background job
+class JobStatus(enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+# Model for background jobs such as asynchronous bulk check-ins
+class Job(db.Model):
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid4().hex)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.queued, index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=True)
+    # JSON keyword arguments for the handler, kept so queued jobs survive a restart
+    payload = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    # Refreshed while a process runs the job, so one whose process died can be told apart
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status.name,
+            "event_id": self.event_id,
+            "progress": self.progress,
+            "result": json.loads(self.result) if self.result else None,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+# Model for users (authentication)
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    # Long enough for scrypt hashes, which exceed 120 characters
+    password = db.Column(db.String(255), nullable=False)
+
+    def set_password(self, password, method='scrypt'):
+        self.password = generate_password_hash(password, method)
+
+    def check_password(self, password):
         return check_password_hash(self.password, password)
\ No newline at end of file
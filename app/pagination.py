@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import request
+
+
+def encode_cursor(*values):
+    """Encode the sort key of the last row on a page as an opaque URL-safe cursor."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, *types):
+    """Decode a cursor produced by encode_cursor, converting each value to the given type."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Malformed cursor")
+        return [datetime.fromisoformat(v) if t is datetime else t(v) for t, v in zip(types, values)]
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def parse_limit(default, maximum, args=None):
+    """Read the `limit` query parameter (from `args`, else the current request), clamped to 1..maximum."""
+    value = (request.args if args is None else args).get('limit')
+    if value is None:
+        return default
+    return min(max(int(value), 1), maximum)
+
+
+def next_page_headers(next_cursor, base_url=None, args=None):
+    """
+        Headers that advertise the next page; the body stays a plain JSON array.
+        `base_url` and `args` default to those of the current request.
+    """
+    if next_cursor is None:
+        return {}
+    args = (request.args if args is None else args).to_dict()
+    args['cursor'] = next_cursor
+    return {
+        "X-Next-Cursor": next_cursor,
+        "Link": f'<{base_url or request.base_url}?{urlencode(args)}>; rel="next"'
+    }
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    """
+        A subscriber's wake-up flag; several publishes before the next wait coalesce into one.
+        Subscriptions made with an event loop are awaited with wait_async() instead of wait().
+    """
+
+    def __init__(self, bus, topic, loop=None):
+        self.bus = bus
+        self.topic = topic
+        self._loop = loop
+        self._pending = asyncio.Event() if loop else threading.Event()
+
+    def notify(self):
+        # Publishers run in worker threads, so wake an asyncio subscriber through its loop
+        if self._loop:
+            try:
+                self._loop.call_soon_threadsafe(self._pending.set)
+            except RuntimeError:
+                # The subscriber's loop has shut down; it will never wait again
+                pass
+        else:
+            self._pending.set()
+
+    def wait(self, timeout):
+        """Block until something was published or `timeout` seconds pass; returns True if woken."""
+        woken = self._pending.wait(timeout)
+        self._pending.clear()
+        return woken
+
+    async def wait_async(self, timeout):
+        """Like wait(), without blocking the event loop."""
+        try:
+            await asyncio.wait_for(self._pending.wait(), timeout)
+            woken = True
+        except asyncio.TimeoutError:
+            woken = False
+        self._pending.clear()
+        return woken
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PubSub:
+    """
+        In-process publish/subscribe bus keyed by topic (e.g. 'checkins:<event_id>').
+        Messages carry no payload: subscribers re-read what they missed from the
+        database, so a burst of publishes costs each subscriber a single catch-up read.
+        Subscribers in other worker processes are not woken and rely on their poll interval.
+    """
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, loop=None):
+        subscription = Subscription(self, topic, loop)
+        with self._lock:
+            self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.topic]
+
+    def publish(self, topic):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(topic, ()))
+        for subscription in subscribers:
+            subscription.notify()
+        return len(subscribers)
+
+    def subscriber_count(self, topic):
+        with self._lock:
+            return len(self._subscriptions.get(topic, ()))
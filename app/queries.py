@@ -0,0 +1,199 @@
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import select, tuple_
+from .models import Attendee, CheckinLog, Event, EventStatus, effective_status
+from .pagination import decode_cursor, encode_cursor, parse_limit
+from .schedule import bookings_query, max_event_duration
+from .search import search_terms
+from .stats import STATS_COLUMNS
+
+# Statements and rendering for the read-heavy routes, independent of Flask's request objects
+# so the sync routes and the async ASGI handlers serve identical responses.
+
+# Event columns that can be requested with ?fields= on GET /events
+EVENT_FIELDS = {
+    "id": Event.id,
+    "name": Event.name,
+    "description": Event.description,
+    "start_time": Event.start_time,
+    "end_time": Event.end_time,
+    "location": Event.location,
+    "max_attendees": Event.max_attendees,
+    "status": Event.status,
+}
+DEFAULT_EVENT_FIELDS = ["id", "name", "location", "status"]
+# Event fields returned by GET /events/search
+SEARCH_EVENT_FIELDS = ["id", "name", "location", "start_time", "end_time", "status"]
+
+# Attendee columns returned by GET /events/<id>/attendees
+ATTENDEE_COLUMNS = [Attendee.id, Attendee.first_name, Attendee.last_name, Attendee.email, Attendee.check_in_status]
+ATTENDEE_FIELDS = [column.key for column in ATTENDEE_COLUMNS]
+
+
+class InvalidQuery(ValueError):
+    """A query parameter is invalid; the message is returned to the client with a 400."""
+
+
+def _limit(args, default, maximum):
+    try:
+        return parse_limit(default, maximum, args)
+    except ValueError:
+        raise InvalidQuery("limit must be an integer.")
+
+
+def _cursor(args, *types):
+    try:
+        return decode_cursor(args['cursor'], *types)
+    except ValueError:
+        raise InvalidQuery("Invalid cursor.")
+
+
+def paginate(rows, limit, key):
+    """Drop the look-ahead row fetched past `limit`; returns (rows, next_cursor)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+def include_archived(args):
+    """Whether ?include_archived=true asks for archived events too."""
+    return args.get('include_archived', 'false').lower() == 'true'
+
+
+def merge_pages(pages, limit, key):
+    """Merge keyset pages (each up to limit + 1 rows) into one page in `key` order."""
+    return sorted((row for rows in pages for row in rows), key=key)[:limit + 1]
+
+
+def events_page(args, config, now, model=Event):
+    """Build the GET /events statement against `model`; returns (statement, fields, limit)."""
+    fields = args.get('fields')
+    fields = fields.split(',') if fields else DEFAULT_EVENT_FIELDS
+    unknown = [field for field in fields if field not in EVENT_FIELDS]
+    if unknown:
+        raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+    limit = _limit(args, config['EVENTS_PAGE_SIZE'], config['MAX_PAGE_SIZE'])
+
+    # Only select the requested columns, plus the keyset and status inputs
+    columns = {"id", "start_time"} | set(fields)
+    if 'status' in fields:
+        columns |= {"status", "end_time"}
+    query = select(*(getattr(model, name) for name in sorted(columns)))
+
+    if 'status' in args:
+        if args['status'] not in EventStatus.__members__:
+            raise InvalidQuery("Invalid status. Allowed values are: scheduled, ongoing, completed, canceled.")
+        query = query.where(model.effective_status_is(EventStatus[args['status']], now))
+    if 'location' in args:
+        query = query.where(model.location == args['location'])
+    try:
+        if 'from' in args:
+            query = query.where(model.start_time >= datetime.fromisoformat(args['from']))
+        if 'to' in args:
+            query = query.where(model.start_time < datetime.fromisoformat(args['to']))
+    except ValueError:
+        raise InvalidQuery("from and to must be ISO datetimes.")
+
+    if 'cursor' in args:
+        start_time, event_id = _cursor(args, datetime, int)
+        query = query.where(tuple_(model.start_time, model.id) > tuple_(start_time, event_id))
+    return query.order_by(model.start_time, model.id).limit(limit + 1), fields, limit
+
+
+def event_items(rows, fields, now):
+    """Render GET /events rows, deriving each event's status at `now`."""
+    result = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            if field == 'status':
+                item[field] = effective_status(row.status, row.start_time, row.end_time, now).name
+            elif field in ('start_time', 'end_time'):
+                item[field] = getattr(row, field).isoformat()
+            else:
+                item[field] = getattr(row, field)
+        result.append(item)
+    return result
+
+
+def attendees_query(event_id, args, model=Attendee):
+    """An event's attendees in id order, optionally filtered by ?check_in_status=."""
+    query = select(*(getattr(model, field) for field in ATTENDEE_FIELDS)).where(model.event_id == event_id)
+    check_in_status = args.get('check_in_status')
+    if check_in_status is not None:
+        query = query.where(model.check_in_status == (check_in_status.lower() == 'true'))
+    return query.order_by(model.id)
+
+
+def attendees_page(query, args, config):
+    """Narrow an attendees_query to one keyset page; returns (statement, limit)."""
+    limit = _limit(args, config['ATTENDEES_PAGE_SIZE'], config['MAX_PAGE_SIZE'])
+    if 'cursor' in args:
+        (last_id,) = _cursor(args, int)
+        query = query.where(query.selected_columns.id > last_id)
+    return query.limit(limit + 1), limit
+
+
+def attendee_items(rows):
+    return [{field: getattr(row, field) for field in ATTENDEE_FIELDS} for row in rows]
+
+
+def stats_page(args, config):
+    """Build the GET /events/stats statement; returns (statement, limit)."""
+    limit = _limit(args, config['EVENTS_PAGE_SIZE'], config['MAX_PAGE_SIZE'])
+    query = select(*STATS_COLUMNS)
+    if 'cursor' in args:
+        (last_id,) = _cursor(args, int)
+        query = query.where(Event.id > last_id)
+    return query.order_by(Event.id).limit(limit + 1), limit
+
+
+def schedule_page(location, args, config, now):
+    """Build the GET /locations/<name>/schedule statement; returns (statement, limit)."""
+    try:
+        start = datetime.fromisoformat(args['from']) if 'from' in args else now
+        end = datetime.fromisoformat(args['to']) if 'to' in args else start + timedelta(days=7)
+    except ValueError:
+        raise InvalidQuery("from and to must be ISO datetimes.")
+    if end <= start:
+        raise InvalidQuery("to must be after from.")
+    limit = _limit(args, config['EVENTS_PAGE_SIZE'], config['MAX_PAGE_SIZE'])
+
+    query = bookings_query(location, start, end, max_event_duration(config))
+    if 'cursor' in args:
+        start_time, end_time, event_id = _cursor(args, datetime, datetime, int)
+        query = query.where(
+            tuple_(Event.start_time, Event.end_time, Event.id) > tuple_(start_time, end_time, event_id)
+        )
+    return query.limit(limit + 1), limit
+
+
+def search_params(args, config):
+    """Read ?q= and ?limit= for the search routes; returns (terms, limit)."""
+    if not args.get('q', '').strip():
+        raise InvalidQuery("q is required.")
+    return search_terms(args['q']), _limit(args, config['SEARCH_PAGE_SIZE'], config['MAX_PAGE_SIZE'])
+
+
+def checkin_log_query(event_id, after_id, batch_size):
+    """The next check-in log entries for an event, with the attendee's name."""
+    return (
+        select(CheckinLog.id, CheckinLog.attendee_id, CheckinLog.checked_in_at,
+               Attendee.first_name, Attendee.last_name)
+        .outerjoin(Attendee, Attendee.id == CheckinLog.attendee_id)
+        .where(CheckinLog.event_id == event_id, CheckinLog.id > after_id)
+        .order_by(CheckinLog.id)
+        .limit(batch_size)
+    )
+
+
+def checkin_message(row):
+    """Format a checkin_log_query row as a server-sent event."""
+    data = json.dumps({
+        "attendee_id": row.attendee_id,
+        "first_name": row.first_name,
+        "last_name": row.last_name,
+        "checked_in_at": row.checked_in_at.isoformat() if row.checked_in_at else None
+    })
+    return f"id: {row.id}\nevent: checkin\ndata: {data}\n\n"
@@ -0,0 +1,77 @@
+import math
+import threading
+import time
+from collections import deque
+
+
+class FailureLimiter:
+    """
+        Counts failures per key over a sliding window and blocks a key once it reaches
+        `max_failures`, until its oldest failure ages out of the window.
+    """
+
+    def __init__(self, max_failures, window):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, key, now):
+        failures = self._failures.get(key)
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if failures is not None and not failures:
+            del self._failures[key]
+        return self._failures.get(key)
+
+    def retry_after(self, key):
+        """Seconds until `key` may try again, or 0 if it is not blocked."""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._prune(key, now)
+            if not failures or len(failures) < self.max_failures:
+                return 0
+            return max(int(failures[0] + self.window - now) + 1, 1)
+
+    def fail(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._prune(key, now)
+            self._failures.setdefault(key, deque()).append(now)
+
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class TokenBucketLimiter:
+    """
+        A token bucket per key: each key holds up to `burst` tokens, refilled at `rate` tokens
+        per second, and every admitted call takes one. Keys with full buckets are forgotten
+        once more than `max_keys` are tracked.
+    """
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _tokens(self, key, now):
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def acquire(self, key):
+        """Take a token for `key`; returns 0 if admitted, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return max(math.ceil((1 - tokens) / self.rate), 1)
+            if key not in self._buckets and len(self._buckets) >= self.max_keys:
+                for idle in [other for other in self._buckets if self._tokens(other, now) >= self.burst]:
+                    del self._buckets[idle]
+            self._buckets[key] = (tokens - 1, now)
+            return 0
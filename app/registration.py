@@ -0,0 +1,246 @@
+import csv
+import io
+import json
+from datetime import datetime
+from sqlalchemy import delete, select, update
+from . import cache
+from .dialects import bulk_insert_skipping_conflicts, insert_skipping_conflicts
+from .jobs import job_handler
+from .models import Attendee, Event, WaitlistEntry, db, adjust_event_counters, normalize_email
+
+# Maximum lengths of the attendee columns, checked before inserting
+FIELD_LIMITS = {"first_name": 50, "last_name": 50, "email": 120, "phone_number": 15}
+# Waitlist columns copied onto the attendee row when an entry is promoted
+WAITLIST_FIELDS = ["first_name", "last_name", "email", "email_normalized", "phone_number"]
+
+
+class TooManyRows(Exception):
+    """The upload holds more rows than BULK_REGISTRATION_MAX_ROWS."""
+
+
+class CapacityChanged(Exception):
+    """Concurrent registrations took seats between the capacity check and the insert."""
+
+
+def iter_ndjson_rows(stream):
+    """Yield one parsed document per non-blank line of a binary NDJSON stream (None if invalid)."""
+    for line in io.TextIOWrapper(stream, encoding='utf-8'):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def iter_csv_rows(stream):
+    """Yield each row of a binary CSV stream as a dict keyed by the header line."""
+    yield from csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+
+
+def _normalize(item):
+    """Return (row, None) for a valid registration, or (None, reason) to reject it."""
+    if not isinstance(item, dict):
+        return None, "Expected an object with first_name, last_name and email"
+    row = {field: str(item.get(field) or '').strip() for field in FIELD_LIMITS}
+    row["email"] = normalize_email(row["email"])
+    if not (row["first_name"] and row["last_name"] and row["email"]):
+        return None, "first_name, last_name and email are required"
+    if '@' not in row["email"]:
+        return None, "Invalid email"
+    for field, limit in FIELD_LIMITS.items():
+        if len(row[field]) > limit:
+            return None, f"{field} is longer than {limit} characters"
+    row["phone_number"] = row["phone_number"] or None
+    return row, None
+
+
+class BulkRegistrationResult:
+    """Summary of a bulk registration, with per-row rejections up to a cap."""
+
+    def __init__(self, max_rejections=1000):
+        self.rows = 0
+        self.registered = 0
+        self.rejected = 0
+        self.max_rejections = max_rejections
+        self.rejections = []
+
+    def reject(self, row_number, item, reason):
+        self.rejected += 1
+        if len(self.rejections) < self.max_rejections:
+            email = item.get('email') if isinstance(item, dict) else None
+            self.rejections.append({"row": row_number, "email": email, "reason": reason})
+
+    def to_dict(self):
+        return {
+            "summary": {"rows": self.rows, "registered": self.registered, "rejected": self.rejected},
+            "rejections": self.rejections,
+            "rejections_truncated": self.rejected > len(self.rejections)
+        }
+
+
+def bulk_register(event_id, items, chunk_size=1000, max_rows=None, max_rejections=1000):
+    """
+        Register attendees from an iterable of dicts in one transaction.
+        Rows are validated and de-duplicated in memory, capacity is checked once, and the
+        accepted rows are written with the dialect's bulk insert path, which skips attendees
+        already registered for the event. Invalid rows are rejected individually.
+        Raises TooManyRows, or CapacityChanged if seats were taken concurrently.
+    """
+    result = BulkRegistrationResult(max_rejections)
+    candidates = []
+    seen = set()
+    for row_number, item in enumerate(items, start=1):
+        result.rows += 1
+        if max_rows is not None and result.rows > max_rows:
+            raise TooManyRows()
+        row, reason = _normalize(item)
+        if reason:
+            result.reject(row_number, item, reason)
+        elif row["email"] in seen:
+            result.reject(row_number, row, "Duplicate email in upload")
+        else:
+            seen.add(row["email"])
+            candidates.append((row_number, row))
+
+    capacity = db.session.execute(
+        select(Event.max_attendees, Event.registered_count, Event.waitlisted_count)
+        .where(Event.id == event_id).with_for_update()
+    ).one()
+    # Free seats belong to the waitlist first, so uploads only take seats nobody is queued for
+    waitlisted = capacity.waitlisted_count > 0
+    remaining = 0 if waitlisted else max(capacity.max_attendees - capacity.registered_count, 0)
+
+    # When every candidate fits, duplicates are left to the insert's ON CONFLICT; otherwise
+    # existing registrations are looked up first so they don't take seats from new attendees
+    registered = set()
+    if len(candidates) > remaining:
+        emails = [row["email"] for _, row in candidates]
+        for start in range(0, len(emails), chunk_size):
+            registered.update(db.session.scalars(
+                select(Attendee.email_normalized)
+                .where(Attendee.event_id == event_id, Attendee.email_normalized.in_(emails[start:start + chunk_size]))
+            ))
+
+    accepted = []
+    accepted_rows = []
+    for row_number, row in candidates:
+        if row["email"] in registered:
+            result.reject(row_number, row, "Attendee already registered")
+        elif len(accepted) >= remaining:
+            result.reject(row_number, row, "Event has a waitlist" if waitlisted else "Max attendees reached")
+        else:
+            accepted.append({**row, "email_normalized": row["email"], "event_id": event_id, "check_in_status": False})
+            accepted_rows.append((row_number, row))
+
+    if accepted:
+        # Reserve every seat at once; the guard fails if registrations or waitlist entries raced past the check above
+        reserved = db.session.execute(
+            update(Event)
+            .where(
+                Event.id == event_id,
+                Event.registered_count + len(accepted) <= Event.max_attendees,
+                Event.waitlisted_count == 0
+            )
+            .values(registered_count=Event.registered_count + len(accepted))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not reserved:
+            db.session.rollback()
+            raise CapacityChanged()
+
+        connection = db.session.connection()
+        inserted = bulk_insert_skipping_conflicts(
+            connection,
+            Attendee.__table__,
+            accepted,
+            index_elements=['event_id', 'email_normalized'],
+            returning='email_normalized'
+        )
+        for row_number, row in accepted_rows:
+            if row["email"] not in inserted:
+                result.reject(row_number, row, "Attendee already registered")
+        # Give back the seats reserved for rows that turned out to be registered already
+        adjust_event_counters(connection, event_id, registered=len(inserted) - len(accepted))
+        result.registered = len(inserted)
+    result.rejections.sort(key=lambda rejection: rejection["row"])
+    db.session.commit()
+    return result
+
+
+def join_waitlist(event_id, data):
+    """Append a registration to the end of the event's waitlist; returns False if the email is already waiting."""
+    connection = db.session.connection()
+    inserted = connection.execute(
+        insert_skipping_conflicts(connection.dialect.name, WaitlistEntry.__table__, ['event_id', 'email_normalized'])
+        .values(
+            event_id=event_id,
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            email=data['email'],
+            email_normalized=normalize_email(data['email']),
+            phone_number=data.get('phone_number'),
+            created_at=datetime.utcnow()
+        )
+    ).rowcount
+    adjust_event_counters(connection, event_id, waitlisted=inserted)
+    return bool(inserted)
+
+
+def promote_waitlist(event_id, batch_size=500):
+    """
+        Register waitlisted people into an event's free seats in arrival order, at most
+        `batch_size` per transaction, so a large waitlist never holds the event row for long.
+        Entries whose email registered meanwhile are dropped. Returns the number promoted.
+    """
+    promoted = 0
+    while True:
+        capacity = db.session.execute(
+            select(Event.max_attendees, Event.registered_count).where(Event.id == event_id).with_for_update()
+        ).first()
+        free = capacity.max_attendees - capacity.registered_count if capacity else 0
+        entries = db.session.execute(
+            select(WaitlistEntry.id, *(getattr(WaitlistEntry, field) for field in WAITLIST_FIELDS))
+            .where(WaitlistEntry.event_id == event_id)
+            .order_by(WaitlistEntry.id)
+            .limit(min(free, batch_size))
+        ).all() if free > 0 else []
+        if not entries:
+            db.session.commit()
+            return promoted
+
+        connection = db.session.connection()
+        inserted = bulk_insert_skipping_conflicts(
+            connection,
+            Attendee.__table__,
+            [
+                {field: getattr(entry, field) for field in WAITLIST_FIELDS}
+                | {"event_id": event_id, "check_in_status": False}
+                for entry in entries
+            ],
+            index_elements=['event_id', 'email_normalized'],
+            returning='email_normalized'
+        )
+        connection.execute(delete(WaitlistEntry.__table__).where(WaitlistEntry.id.in_([entry.id for entry in entries])))
+        adjust_event_counters(connection, event_id, registered=len(inserted), waitlisted=-len(entries))
+        db.session.commit()
+        cache.invalidate(f'event:{event_id}')
+        promoted += len(inserted)
+
+
+def promote_waitlists(batch_size=500):
+    """Promote waitlisted registrations for every event with free seats; returns the number promoted."""
+    # Start from the (usually small) waitlist table rather than scanning every event
+    event_ids = db.session.scalars(
+        select(Event.id).where(
+            Event.id.in_(select(WaitlistEntry.event_id).distinct()),
+            Event.registered_count < Event.max_attendees
+        )
+    ).all()
+    return sum(promote_waitlist(event_id, batch_size) for event_id in event_ids)
+
+
+@job_handler('promote_waitlist')
+def promote_waitlist_job(job, batch_size=500):
+    """Background promotion after an event's capacity is raised."""
+    return {"promoted": promote_waitlist(job.event_id, batch_size)}
@@ -0,0 +1,113 @@
+import itertools
+import time
+from functools import wraps
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+# Methods that never trigger read-your-writes stickiness
+READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class RoutingSession(Session):
+    """Session that runs reads on the replica picked for the current request, if any; flushes stay on the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            replica = g.get('_db_replica')
+            if replica is not None:
+                return current_app.extensions['replicas']["engines"][replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def reads_own_writes(config, cookies):
+    """True while the client's sticky cookie in `cookies` says it has just written and must read the primary."""
+    try:
+        sticky_until = float(cookies.get(config.get('REPLICA_STICKY_COOKIE', 'read_primary_until'), 0))
+    except ValueError:
+        sticky_until = 0
+    return sticky_until > time.time()
+
+
+def choose_replica(state, config, cookies):
+    """
+        The name of the next healthy replica in `state` to read from, or None for the primary,
+        e.g. while the client's sticky cookie in `cookies` says it has just written.
+    """
+    if reads_own_writes(config, cookies):
+        return None
+    now = time.monotonic()
+    healthy = [name for name in state["engines"] if state["down_until"].get(name, 0) <= now]
+    if not healthy:
+        return None
+    return healthy[next(state["turn"]) % len(healthy)]
+
+
+def mark_replica_down(state, config, name):
+    """Skip the replica `name` for REPLICA_RETRY_INTERVAL seconds."""
+    state["down_until"][name] = time.monotonic() + config.get('REPLICA_RETRY_INTERVAL', 30)
+
+
+class ReplicaRouter:
+    """
+        Routes read-only views to read replicas listed in SQLALCHEMY_REPLICA_URIS.
+        Replica engines use the primary's SQLALCHEMY_ENGINE_OPTIONS and are not Flask-SQLAlchemy
+        binds, so create_all and migrations never touch them. Views opt in with @replicas.reads;
+        everything else, including CLI commands and jobs, stays on the primary. A client that
+        has just written reads from the primary for REPLICA_STICKY_SECONDS, and a replica that
+        fails is skipped for REPLICA_RETRY_INTERVAL seconds while its reads are retried on the
+        primary.
+    """
+
+    def init_app(self, app):
+        options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+        engines = {
+            f'replica_{index}': create_engine(uri, **options)
+            for index, uri in enumerate(app.config.get('SQLALCHEMY_REPLICA_URIS') or [])
+        }
+        app.extensions['replicas'] = {"engines": engines, "down_until": {}, "turn": itertools.count()}
+        if engines:
+            app.after_request(self._stick_after_write)
+
+    @property
+    def _state(self):
+        return current_app.extensions['replicas']
+
+    def choose(self):
+        """The name of the replica to read from for this request, or None for the primary."""
+        return choose_replica(self._state, current_app.config, request.cookies)
+
+    def _stick_after_write(self, response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            config = current_app.config
+            window = config.get('REPLICA_STICKY_SECONDS', 5)
+            response.set_cookie(
+                config.get('REPLICA_STICKY_COOKIE', 'read_primary_until'), str(time.time() + window),
+                max_age=window, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def reads(self, view):
+        """Run a read-only view against a replica, falling back to the primary if the replica fails."""
+
+        @wraps(view)
+        def wrapper(**kwargs):
+            replica = self.choose()
+            if replica is None:
+                return view(**kwargs)
+            g._db_replica = replica
+            try:
+                return view(**kwargs)
+            except (OperationalError, InterfaceError):
+                from .models import db
+
+                current_app.logger.warning("Replica %s failed; reading from the primary", replica, exc_info=True)
+                db.session.rollback()
+                # Drop its pooled connections so the retry after REPLICA_RETRY_INTERVAL reconnects
+                self._state["engines"][replica].dispose()
+                mark_replica_down(self._state, current_app.config, replica)
+                g._db_replica = None
+                return view(**kwargs)
+
+        return wrapper
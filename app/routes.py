@@ -1,288 +1,672 @@
-from flask import Blueprint, request, jsonify
-from .models import Event, Attendee, db, EventStatus, User
-from datetime import datetime
-from werkzeug.utils import secure_filename
-import csv
-import os
-from sqlalchemy import func, or_
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-
-# Define blueprints for authentication, events, and main application routes
-auth_bp = Blueprint('auth', __name__)
-event_bp = Blueprint('events', __name__)
-main = Blueprint('main', __name__)
-
-# Allowed file extensions for CSV
-ALLOWED_EXTENSIONS = {'csv'}
-
-
-@event_bp.route('/events', methods=['POST'])
-@jwt_required()
-def create_event():
-    """Create a new event."""
-
-    current_user_id = get_jwt_identity()
-    data = request.json
-    event = Event(
-        name=data['name'],
-        description=data.get('description'),
-        start_time=datetime.fromisoformat(data['start_time']),
-        end_time=datetime.fromisoformat(data['end_time']),
-        location=data['location'],
-        max_attendees=data['max_attendees']
-    )
-    db.session.add(event)
-    db.session.commit()
-    return jsonify({"message": "Event created successfully"}), 201
-
-
-@event_bp.route('/events/<int:event_id>', methods=['PUT'])
-@jwt_required()
-def update_event(event_id):
-    """Update an existing event."""
-
-    current_user_id = get_jwt_identity()
-    data = request.json
-    event = Event.query.get(event_id)
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-
-    # Check and update each field only if it is provided
-    if 'name' in data:
-        event.name = data['name']
-    if 'description' in data:
-        event.description = data['description']
-    if 'start_time' in data:
-        try:
-            event.start_time = datetime.fromisoformat(data['start_time'])
-        except ValueError:
-            return jsonify({"error": "Invalid start_time format."}), 400
-    if 'end_time' in data:
-        try:
-            event.end_time = datetime.fromisoformat(data['end_time'])
-        except ValueError:
-            return jsonify({"error": "Invalid end_time format."}), 400
-    if 'location' in data:
-        event.location = data['location']
-    if 'max_attendees' in data:
-        try:
-            event.max_attendees = int(data['max_attendees'])
-        except ValueError:
-            return jsonify({"error": "max_attendees must be an integer."}), 400
-    if 'status' in data:
-        if data['status'] in [status.name for status in EventStatus]:
-            event.status = data['status']
-        else:
-            return jsonify({"error": "Invalid status. Allowed values are: scheduled, ongoing, completed, canceled."}), 400
-
-    db.session.commit()
-    return jsonify({"message": "Event updated successfully"}), 200
-
-
-@main.route('/events', methods=['GET'])
-def list_events():
-    """List all events and update statuses of past events."""
-
-    now = datetime.utcnow().replace(microsecond=0)
-    events = Event.query.all()
-
-    for event in events:
-        # Automatically update event status to 'completed' if it has ended
-        if event.end_time < now and event.status.name == "ongoing":
-            event.status = "completed"
-            db.session.commit()
-
-    result = [{"id": e.id, "name": e.name, "location": e.location, "status": e.status.name} for e in events]
-    return jsonify(result), 200
-
-
-@main.route('/events/<int:event_id>/attendees', methods=['POST'])
-def register_attendee(event_id):
-    """Register an attendee for a specific event."""
-
-    data = request.json
-    event = Event.query.get(event_id)
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-
-    # Check if the attendee is already registered or the event is full
-    if Attendee.query.filter_by(email=data['email'], event_id=event_id).first():
-        return jsonify({"error": "Attendee already registered"}), 400
-    if Attendee.query.filter_by(event_id=event_id).count() >= event.max_attendees:
-        return jsonify({"error": "Max attendees reached"}), 400
-
-    # Register a new attendee
-    attendee = Attendee(
-        first_name=data['first_name'],
-        last_name=data['last_name'],
-        email=data['email'],
-        phone_number=data.get('phone_number'),
-        event_id=event_id
-    )
-    db.session.add(attendee)
-    db.session.commit()
-    return jsonify({"message": "Attendee registered successfully"}), 201
-
-
-@main.route('/events/<int:event_id>/attendees', methods=['GET'])
-def list_attendees(event_id):
-    """List all attendees for a specific event."""
-
-    event = Event.query.get(event_id)
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-
-    # Optionally filter by check-in status
-    check_in_status = request.args.get('check_in_status')
-    attendees_query = Attendee.query.filter_by(event_id=event_id)
-    if check_in_status is not None:
-        check_in_status = check_in_status.lower() == 'true'
-        attendees_query = attendees_query.filter_by(check_in_status=check_in_status)
-
-    # Return attendee details
-    attendees = attendees_query.all()
-    result = [
-        {
-            "id": attendee.id,
-            "first_name": attendee.first_name,
-            "last_name": attendee.last_name,
-            "email": attendee.email,
-            "check_in_status": attendee.check_in_status,
-        }
-        for attendee in attendees
-    ]
-
-    return jsonify(result), 200
-
-
-@main.route('/events/<int:event_id>/attendees/<int:attendee_id>/checkin', methods=['PATCH'])
-def check_in_attendee(event_id, attendee_id):
-    """Mark an attendee as checked in."""
-
-    event = Event.query.get(event_id)
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-
-    attendee = Attendee.query.filter_by(id=attendee_id, event_id=event_id).first()
-    if not attendee:
-        return jsonify({"error": "Attendee not found"}), 404
-
-    if attendee.check_in_status:
-        return jsonify({"message": "Attendee is already checked in"}), 400
-
-    # Mark the attendee as checked in
-    attendee.check_in_status = True
-    db.session.commit()
-
-    return jsonify({"message": "Attendee checked in successfully"}), 200
-
-
-@main.route('/events/<int:event_id>/attendees/bulk_checkin', methods=['POST'])
-def bulk_checkin(event_id):
-    """Bulk check-in attendees by uploading a CSV file."""
-
-    event = Event.query.get(event_id)
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-
-    file = request.files.get('file')
-    if not file or file.filename == '':
-        return jsonify({"error": "No file uploaded or file is empty."}), 400
-
-    filename = secure_filename(file.filename)
-
-    # Verify the file extension is .csv
-    if not filename.lower().endswith('.csv'):
-        return jsonify({"error": "Invalid file type. Please upload a CSV file."}), 400
-
-    # Save the file
-    upload_dir = os.path.join(os.getcwd(), 'uploads')
-    os.makedirs(upload_dir, exist_ok=True)
-    filepath = os.path.join(upload_dir, filename)
-    file.save(filepath)
-
-    # Process the CSV file
-    updated_attendees = []
-    with open(filepath, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            first_name = row.get('first_name', '').strip()
-            last_name = row.get('last_name', '').strip()
-            email = row.get('email', '').strip().lower()
-            phone_number = row.get('phone_number', '').strip()
-
-            print(f"Processing: {first_name} {last_name}, Email: {email}, Phone: {phone_number}")
-
-            # Query for existing attendee
-            attendee = Attendee.query.filter(
-                Attendee.event_id == event_id,
-                or_(
-                    func.lower(Attendee.email) == email,
-                    Attendee.phone_number == phone_number
-                )
-            ).first()
-
-            if attendee:
-                # Update check-in status for existing attendee
-                attendee.check_in_status = True
-                updated_attendees.append({
-                    "first_name": attendee.first_name,
-                    "last_name": attendee.last_name,
-                    "email": attendee.email,
-                    "phone_number": attendee.phone_number,
-                    "status": "Checked In"
-                })
-            else:
-                # Add new attendee if not found
-                new_attendee = Attendee(
-                    first_name=first_name,
-                    last_name=last_name,
-                    email=email,
-                    phone_number=phone_number,
-                    event_id=event_id,
-                    check_in_status=True
-                )
-                db.session.add(new_attendee)
-                updated_attendees.append({
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "email": email,
-                    "phone_number": phone_number,
-                    "status": "Added and Checked In"
-                })
-
-    db.session.commit()
-
-    return jsonify({
-        "message": "Bulk check-in completed",
-        "attendees": updated_attendees
-    }), 200
-
-
-@auth_bp.route('/register', methods=['POST'])
-def register():
-    """Register a new user."""
-
-    data = request.get_json()
-    if not data.get('username') or not data.get('password'):
-        return jsonify({"error": "Username and password required"}), 400
-
-    user = User(username=data['username'], password=data['password'])
-    user.set_password(data['password'])
-    db.session.add(user)
-    db.session.commit()
-
-    return jsonify({"message": "User registered successfully!"}), 201
-
-
-@auth_bp.route('/login', methods=['POST'])
-def login():
-    """Authenticate a user and provide a JWT token."""
-
-    data = request.get_json()
-    user = User.query.filter_by(username=data['username']).first()
-    if user and user.check_password(data['password']):
-        access_token = create_access_token(identity=str(user.id))
-        return jsonify(access_token=access_token)
-
-    return jsonify({"error": "Invalid credentials"}), 401
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context, url_for
+from . import admission, authenticator, cache, jobs, pubsub, replicas
+from .models import ArchivedAttendee, ArchivedEvent, Event, Attendee, CheckinLog, IdempotencyKey, Job, db, EventStatus, User, adjust_event_counters, log_checkins, normalize_email
+from .bulk import batch_checkin, stream_checkin, DEFAULT_CHUNK_SIZE
+from .registration import (CapacityChanged, TooManyRows, bulk_register, iter_csv_rows, iter_ndjson_rows,
+                           join_waitlist)
+from .pagination import next_page_headers
+from .queries import (ATTENDEE_COLUMNS, ATTENDEE_FIELDS, EVENT_FIELDS, SEARCH_EVENT_FIELDS, InvalidQuery,
+                      attendee_items, attendees_page, attendees_query, checkin_log_query, checkin_message,
+                      event_items, events_page, include_archived, merge_pages, paginate, schedule_page,
+                      search_params, stats_page)
+from .schedule import SCHEDULE_FIELDS, find_conflicts, invalid_schedule, is_canceled, max_event_duration
+from .search import search_attendees_query, search_events_query
+from .export import iter_csv, iter_ndjson
+from .dialects import insert_skipping_conflicts
+from .security import HasherBusy, LoginThrottled
+from .stats import STATS_COLUMNS, event_stats
+from datetime import datetime
+from werkzeug.utils import secure_filename
+import csv
+import json
+import os
+import shutil
+import tempfile
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+
+# Define blueprints for authentication, events, and main application routes
+auth_bp = Blueprint('auth', __name__)
+event_bp = Blueprint('events', __name__)
+main = Blueprint('main', __name__)
+
+# Allowed file extensions for CSV
+ALLOWED_EXTENSIONS = {'csv'}
+
+# Upper bound on per-row detail returned by bulk check-in
+MAX_DETAIL_LIMIT = 1000
+
+# Streaming export formats for attendee listings and their mimetypes
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _check_schedule(event):
+    """
+        Apply SCHEDULE_CONFLICT_POLICY to an added or changed event. Returns (error response,
+        conflicts): the response is set when the change must be rolled back, and conflicts
+        lists the overlapping bookings of the event's location.
+    """
+    policy = current_app.config['SCHEDULE_CONFLICT_POLICY']
+    if policy == 'off' or is_canceled(event.status):
+        return None, []
+    max_duration = max_event_duration(current_app.config)
+    error = invalid_schedule(event, max_duration)
+    if error:
+        return (jsonify({"error": error}), 400), []
+    conflicts = event_items(find_conflicts(event, max_duration), SCHEDULE_FIELDS, datetime.utcnow())
+    if conflicts and policy == 'reject':
+        return (jsonify({"error": "Location is already booked at that time", "conflicts": conflicts}), 409), conflicts
+    return None, conflicts
+
+
+@event_bp.route('/events', methods=['POST'])
+@jwt_required()
+def create_event():
+    """Create a new event."""
+
+    current_user_id = get_jwt_identity()
+    data = request.json
+    event = Event(
+        name=data['name'],
+        description=data.get('description'),
+        start_time=datetime.fromisoformat(data['start_time']),
+        end_time=datetime.fromisoformat(data['end_time']),
+        location=data['location'],
+        max_attendees=data['max_attendees']
+    )
+    db.session.add(event)
+    error, conflicts = _check_schedule(event)
+    if error:
+        db.session.rollback()
+        return error
+    db.session.commit()
+    cache.invalidate('events')
+    body = {"message": "Event created successfully"}
+    if conflicts:
+        body["conflicts"] = conflicts
+    return jsonify(body), 201
+
+
+@event_bp.route('/events/<int:event_id>', methods=['PUT'])
+@jwt_required()
+def update_event(event_id):
+    """Update an existing event."""
+
+    current_user_id = get_jwt_identity()
+    data = request.json
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({"error": "Event not found"}), 404
+
+    # Check and update each field only if it is provided
+    if 'name' in data:
+        event.name = data['name']
+    if 'description' in data:
+        event.description = data['description']
+    if 'start_time' in data:
+        try:
+            event.start_time = datetime.fromisoformat(data['start_time'])
+        except ValueError:
+            return jsonify({"error": "Invalid start_time format."}), 400
+    if 'end_time' in data:
+        try:
+            event.end_time = datetime.fromisoformat(data['end_time'])
+        except ValueError:
+            return jsonify({"error": "Invalid end_time format."}), 400
+    if 'location' in data:
+        event.location = data['location']
+    if 'max_attendees' in data:
+        try:
+            event.max_attendees = int(data['max_attendees'])
+        except ValueError:
+            return jsonify({"error": "max_attendees must be an integer."}), 400
+    if 'status' in data:
+        if data['status'] in [status.name for status in EventStatus]:
+            event.status = data['status']
+        else:
+            return jsonify({"error": "Invalid status. Allowed values are: scheduled, ongoing, completed, canceled."}), 400
+
+    conflicts = []
+    if data.keys() & {'start_time', 'end_time', 'location', 'status'}:
+        error, conflicts = _check_schedule(event)
+        if error:
+            db.session.rollback()
+            return error
+    db.session.commit()
+    cache.invalidate('events', f'event:{event_id}')
+    body = {"message": "Event updated successfully"}
+    if conflicts:
+        body["conflicts"] = conflicts
+    # Raised capacity goes to the waitlist first, promoted in batches by a background job
+    if 'max_attendees' in data and event.waitlisted_count and event.registered_count < event.max_attendees:
+        body["waitlist_job_id"] = jobs.submit(
+            'promote_waitlist',
+            event_id=event_id,
+            batch_size=current_app.config['WAITLIST_PROMOTION_BATCH_SIZE']
+        )
+    return jsonify(body), 200
+
+
+@main.route('/events', methods=['GET'])
+@cache.cached(lambda: ['events'])
+@replicas.reads
+def list_events():
+    """List events one page at a time, with optional filters and field projection."""
+
+    # Statuses are advanced by the background sweeper; this route never writes
+    now = datetime.utcnow().replace(microsecond=0)
+    try:
+        query, fields, limit = events_page(request.args, current_app.config, now)
+    except InvalidQuery as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    rows = db.session.execute(query).all()
+    key = lambda row: (row.start_time, row.id)
+    if include_archived(request.args):
+        # Ids are never reused, so the archive shares the keyset and one cursor pages through both
+        archived_query, _, _ = events_page(request.args, current_app.config, now, ArchivedEvent)
+        rows = merge_pages([rows, db.session.execute(archived_query).all()], limit, key)
+    rows, next_cursor = paginate(rows, limit, key)
+    return jsonify(event_items(rows, fields, now)), 200, next_page_headers(next_cursor)
+
+
+@main.route('/events/search', methods=['GET'])
+@cache.cached(lambda: ['events'])
+@replicas.reads
+def search_events():
+    """Events whose name, description or location match every word of ?q= as a prefix, best match first."""
+
+    try:
+        terms, limit = search_params(request.args, current_app.config)
+    except InvalidQuery as exc:
+        return jsonify({"error": str(exc)}), 400
+    if not terms:
+        return jsonify([]), 200
+
+    now = datetime.utcnow().replace(microsecond=0)
+    columns = [EVENT_FIELDS[name] for name in SEARCH_EVENT_FIELDS]
+    query = search_events_query(db.session.connection().dialect.name, terms, columns)
+    rows = db.session.execute(query.limit(limit)).all()
+    return jsonify(event_items(rows, SEARCH_EVENT_FIELDS, now)), 200
+
+
+@main.route('/locations/<name>/schedule', methods=['GET'])
+@cache.cached(lambda name: ['events'])
+@replicas.reads
+def location_schedule(name):
+    """A venue's bookings overlapping ?from= to ?to= (default: the next 7 days), in start order."""
+
+    now = datetime.utcnow().replace(microsecond=0)
+    try:
+        query, limit = schedule_page(name, request.args, current_app.config, now)
+    except InvalidQuery as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    rows = db.session.execute(query).all()
+    rows, next_cursor = paginate(rows, limit, lambda row: (row.start_time, row.end_time, row.id))
+    return jsonify(event_items(rows, SCHEDULE_FIELDS, now)), 200, next_page_headers(next_cursor)
+
+
+@main.route('/events/stats', methods=['GET'])
+@replicas.reads
+def list_event_stats():
+    """Registration and check-in statistics for a page of events, read from the event counters."""
+
+    try:
+        query, limit = stats_page(request.args, current_app.config)
+    except InvalidQuery as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    rows = db.session.execute(query).all()
+    rows, next_cursor = paginate(rows, limit, lambda row: (row.id,))
+    stats = event_stats(rows, current_app.config['STATS_RATE_WINDOW_MINUTES'])
+    return jsonify(stats), 200, next_page_headers(next_cursor)
+
+
+@main.route('/events/<int:event_id>/stats', methods=['GET'])
+@replicas.reads
+def get_event_stats(event_id):
+    """Registration and check-in statistics for one event."""
+
+    row = db.session.execute(select(*STATS_COLUMNS).where(Event.id == event_id)).first()
+    if row is None:
+        return jsonify({"error": "Event not found"}), 404
+    return jsonify(event_stats([row], current_app.config['STATS_RATE_WINDOW_MINUTES'])[0]), 200
+
+
+@main.route('/events/<int:event_id>/attendees', methods=['POST'])
+def register_attendee(event_id):
+    """Register an attendee for a specific event, or add them to its waitlist once it is full."""
+
+    # Shed surges on one event before they reach the database
+    retry_after = admission.retry_after(event_id)
+    if retry_after:
+        return jsonify({"error": "Too many registrations for this event, please retry"}), 429, {
+            "Retry-After": str(retry_after)
+        }
+
+    data = request.json
+
+    # Reserve a seat atomically; the conditional UPDATE cannot over-admit under concurrency,
+    # and nobody takes a seat ahead of people already on the waitlist
+    reserved = db.session.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.registered_count < Event.max_attendees, Event.waitlisted_count == 0)
+        .values(registered_count=Event.registered_count + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # Register the attendee in the same transaction; ON CONFLICT skips an existing registration
+    inserted = 0
+    if reserved:
+        try:
+            inserted = db.session.execute(
+                insert_skipping_conflicts(
+                    db.session.get_bind().dialect.name,
+                    Attendee.__table__,
+                    ['event_id', 'email_normalized']
+                ).values(
+                    first_name=data['first_name'],
+                    last_name=data['last_name'],
+                    email=data['email'],
+                    email_normalized=normalize_email(data['email']),
+                    phone_number=data.get('phone_number'),
+                    event_id=event_id,
+                    check_in_status=False
+                )
+            ).rowcount
+        except IntegrityError:
+            inserted = 0
+    if not inserted:
+        # Release the seat, then work out why registration failed
+        db.session.rollback()
+        if not db.session.get(Event, event_id):
+            return jsonify({"error": "Event not found"}), 404
+        if reserved or db.session.scalar(select(Attendee.id).where(
+            Attendee.event_id == event_id,
+            Attendee.email_normalized == normalize_email(data['email'])
+        )):
+            return jsonify({"error": "Attendee already registered"}), 400
+        if not current_app.config['WAITLIST_ENABLED']:
+            return jsonify({"error": "Max attendees reached"}), 400
+        if not join_waitlist(event_id, data):
+            db.session.rollback()
+            return jsonify({"error": "Attendee already on the waitlist"}), 400
+        db.session.commit()
+        return jsonify({"message": "Event is full; attendee added to the waitlist", "status": "waitlisted"}), 202
+    db.session.commit()
+    cache.invalidate(f'event:{event_id}')
+    return jsonify({"message": "Attendee registered successfully"}), 201
+
+
+@main.route('/events/<int:event_id>/attendees/bulk', methods=['POST'])
+def bulk_register_attendees(event_id):
+    """Register many attendees from a JSON array, NDJSON or CSV upload in one transaction."""
+
+    if not db.session.get(Event, event_id):
+        return jsonify({"error": "Event not found"}), 404
+
+    if request.mimetype == 'application/json':
+        data = request.get_json(silent=True)
+        items = data.get('attendees') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return jsonify({"error": "Expected a JSON array of attendees."}), 400
+    elif request.mimetype == 'application/x-ndjson':
+        items = iter_ndjson_rows(request.stream)
+    elif request.mimetype == 'text/csv':
+        items = iter_csv_rows(request.stream)
+    else:
+        file = request.files.get('file')
+        if not file or file.filename == '':
+            return jsonify({"error": "Send a JSON array, NDJSON or CSV body, or upload a CSV file."}), 400
+        if not secure_filename(file.filename).lower().endswith('.csv'):
+            return jsonify({"error": "Invalid file type. Please upload a CSV file."}), 400
+        items = iter_csv_rows(file.stream)
+
+    max_rows = current_app.config['BULK_REGISTRATION_MAX_ROWS']
+    try:
+        result = bulk_register(
+            event_id,
+            items,
+            chunk_size=current_app.config['BULK_CHECKIN_CHUNK_SIZE'],
+            max_rows=max_rows,
+            max_rejections=current_app.config['BULK_REGISTRATION_MAX_REJECTIONS']
+        )
+    except TooManyRows:
+        db.session.rollback()
+        return jsonify({"error": f"An upload may contain at most {max_rows} rows."}), 413
+    except (UnicodeDecodeError, csv.Error):
+        db.session.rollback()
+        return jsonify({"error": "Could not parse the uploaded file."}), 400
+    except (CapacityChanged, IntegrityError):
+        db.session.rollback()
+        return jsonify({"error": "Registrations changed during the import; retry the upload."}), 409
+
+    if result.registered:
+        cache.invalidate(f'event:{event_id}')
+    return jsonify({"message": "Bulk registration completed", **result.to_dict()}), 200
+
+
+@main.route('/events/<int:event_id>/attendees', methods=['GET'])
+@cache.cached(lambda event_id: [f'event:{event_id}'])
+@replicas.reads
+def list_attendees(event_id):
+    """List attendees for a specific event, one page at a time or as a streamed export."""
+
+    model = Attendee
+    if db.session.scalar(select(Event.id).where(Event.id == event_id)) is None:
+        archived = include_archived(request.args) and db.session.scalar(
+            select(ArchivedEvent.id).where(ArchivedEvent.id == event_id)
+        ) is not None
+        if not archived:
+            return jsonify({"error": "Event not found"}), 404
+        model = ArchivedAttendee
+
+    # Optionally filter by check-in status
+    query = attendees_query(event_id, request.args, model)
+
+    # Export modes stream every matching row without building the full list in memory
+    export_format = request.args.get('format', 'json')
+    if export_format in EXPORT_FORMATS:
+        batch_size = current_app.config['EXPORT_BATCH_SIZE']
+        dumps = current_app.json.dumps
+
+        def generate():
+            rows = db.session.execute(query.execution_options(yield_per=batch_size))
+            if export_format == 'csv':
+                yield from iter_csv(rows, ATTENDEE_FIELDS, batch_size)
+            else:
+                yield from iter_ndjson(rows, ATTENDEE_FIELDS, dumps)
+
+        headers = {}
+        if export_format == 'csv':
+            headers['Content-Disposition'] = f'attachment; filename=event_{event_id}_attendees.csv'
+        return Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[export_format], headers=headers)
+    if export_format != 'json':
+        return jsonify({"error": "Invalid format. Allowed values are: json, ndjson, csv."}), 400
+
+    try:
+        query, limit = attendees_page(query, request.args, current_app.config)
+    except InvalidQuery as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    # Return attendee details
+    rows = db.session.execute(query).all()
+    rows, next_cursor = paginate(rows, limit, lambda row: (row.id,))
+    return jsonify(attendee_items(rows)), 200, next_page_headers(next_cursor)
+
+
+@main.route('/events/<int:event_id>/attendees/search', methods=['GET'])
+@cache.cached(lambda event_id: [f'event:{event_id}'])
+@replicas.reads
+def search_attendees(event_id):
+    """An event's attendees whose name, email or phone number match every word of ?q= as a prefix."""
+
+    if db.session.scalar(select(Event.id).where(Event.id == event_id)) is None:
+        return jsonify({"error": "Event not found"}), 404
+    try:
+        terms, limit = search_params(request.args, current_app.config)
+    except InvalidQuery as exc:
+        return jsonify({"error": str(exc)}), 400
+    if not terms:
+        return jsonify([]), 200
+
+    query = search_attendees_query(db.session.connection().dialect.name, event_id, terms, ATTENDEE_COLUMNS)
+    rows = db.session.execute(query.limit(limit)).all()
+    return jsonify(attendee_items(rows)), 200
+
+
+@main.route('/events/<int:event_id>/attendees/<int:attendee_id>/checkin', methods=['PATCH'])
+def check_in_attendee(event_id, attendee_id):
+    """Mark an attendee as checked in."""
+
+    idempotency_key = request.headers.get('Idempotency-Key')
+
+    # One conditional UPDATE both checks and applies the check-in, so concurrent scans cannot both succeed
+    checked_in = db.session.execute(
+        update(Attendee)
+        .where(
+            Attendee.id == attendee_id,
+            Attendee.event_id == event_id,
+            Attendee.check_in_status.is_not(True)
+        )
+        .values(check_in_status=True, checked_in_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    if checked_in:
+        connection = db.session.connection()
+        adjust_event_counters(connection, event_id, checked_in=1)
+        log_checkins(connection, Attendee.id == attendee_id)
+        body = {"message": "Attendee checked in successfully"}
+        try:
+            if idempotency_key:
+                db.session.execute(insert(IdempotencyKey).values(
+                    key=idempotency_key,
+                    request_path=request.path,
+                    status_code=200,
+                    response_body=json.dumps(body)
+                ))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Idempotency-Key was already used for a different request"}), 422
+        cache.invalidate(f'event:{event_id}')
+        pubsub.publish(f'checkins:{event_id}')
+        return jsonify(body), 200
+    db.session.rollback()
+
+    # Nothing was updated: replay a stored result for a retried request, else explain why
+    if idempotency_key:
+        stored = db.session.get(IdempotencyKey, idempotency_key)
+        if stored:
+            if stored.request_path != request.path:
+                return jsonify({"error": "Idempotency-Key was already used for a different request"}), 422
+            return jsonify(json.loads(stored.response_body)), stored.status_code
+
+    status = db.session.scalar(
+        select(Attendee.check_in_status).where(Attendee.id == attendee_id, Attendee.event_id == event_id)
+    )
+    if status is None:
+        if not db.session.get(Event, event_id):
+            return jsonify({"error": "Event not found"}), 404
+        return jsonify({"error": "Attendee not found"}), 404
+    return jsonify({"message": "Attendee is already checked in"}), 400
+
+
+@main.route('/events/<int:event_id>/attendees/checkin:batch', methods=['POST'])
+def batch_check_in_attendees(event_id):
+    """Check in a JSON batch of attendee ids or emails, e.g. from an offline scanner sync."""
+
+    if not db.session.get(Event, event_id):
+        return jsonify({"error": "Event not found"}), 404
+
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Expected a non-empty JSON array of attendee ids or emails."}), 400
+    if len(items) > current_app.config['BATCH_CHECKIN_MAX_ITEMS']:
+        return jsonify({"error": f"A batch may contain at most {current_app.config['BATCH_CHECKIN_MAX_ITEMS']} items."}), 413
+
+    summary, results = batch_checkin(event_id, items, current_app.config['BULK_CHECKIN_CHUNK_SIZE'])
+    if summary["checked_in"]:
+        cache.invalidate(f'event:{event_id}')
+        pubsub.publish(f'checkins:{event_id}')
+    return jsonify({"message": "Batch check-in completed", "summary": summary, "results": results}), 200
+
+
+@main.route('/events/<int:event_id>/attendees/bulk_checkin', methods=['POST'])
+def bulk_checkin(event_id):
+    """Bulk check-in attendees by streaming an uploaded CSV file."""
+
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({"error": "Event not found"}), 404
+
+    # Accept either a raw CSV body or a multipart upload under the 'file' key
+    if request.mimetype == 'text/csv':
+        stream = request.stream
+    else:
+        file = request.files.get('file')
+        if not file or file.filename == '':
+            return jsonify({"error": "No file uploaded or file is empty."}), 400
+
+        # Verify the file extension is .csv
+        if not secure_filename(file.filename).lower().endswith('.csv'):
+            return jsonify({"error": "Invalid file type. Please upload a CSV file."}), 400
+        stream = file.stream
+
+    # Per-row detail is opt-in and paged so the response stays small
+    detail_offset, detail_limit = 0, 0
+    if request.args.get('detail', '').lower() == 'true':
+        try:
+            detail_offset = max(int(request.args.get('detail_offset', 0)), 0)
+            detail_limit = min(max(int(request.args.get('detail_limit', 100)), 0), MAX_DETAIL_LIMIT)
+        except ValueError:
+            return jsonify({"error": "detail_offset and detail_limit must be integers."}), 400
+
+    chunk_size = current_app.config.get('BULK_CHECKIN_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+    # Large uploads (or ?async=true) are spooled to disk and handed to the job queue
+    run_async = request.args.get('async')
+    if run_async is None:
+        run_async = (request.content_length or 0) > current_app.config['BULK_CHECKIN_ASYNC_THRESHOLD']
+    else:
+        run_async = run_async.lower() == 'true'
+    if run_async:
+        upload_dir = current_app.config['JOB_UPLOAD_DIR']
+        os.makedirs(upload_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=upload_dir, suffix='.csv', delete=False) as spool:
+            shutil.copyfileobj(stream, spool)
+        job_id = jobs.submit(
+            'bulk_checkin',
+            event_id=event_id,
+            path=spool.name,
+            chunk_size=chunk_size,
+            detail_offset=detail_offset,
+            detail_limit=detail_limit
+        )
+        status_url = url_for('main.get_job', job_id=job_id)
+        return jsonify({"message": "Bulk check-in queued", "job_id": job_id, "status_url": status_url}), 202, {"Location": status_url}
+
+    try:
+        result = stream_checkin(
+            event_id,
+            stream,
+            chunk_size=chunk_size,
+            detail_offset=detail_offset,
+            detail_limit=detail_limit
+        )
+    except (UnicodeDecodeError, csv.Error):
+        db.session.rollback()
+        return jsonify({"error": "Could not parse the uploaded CSV file."}), 400
+    except CapacityChanged:
+        db.session.rollback()
+        return jsonify({"error": "Registrations changed during the import; retry the upload."}), 409
+    cache.invalidate(f'event:{event_id}')
+    pubsub.publish(f'checkins:{event_id}')
+
+    return jsonify({"message": "Bulk check-in completed", **result.to_dict()}), 200
+
+
+@main.route('/events/<int:event_id>/checkins/stream', methods=['GET'])
+def stream_checkins(event_id):
+    """Server-sent events stream of an event's check-ins for live displays, resumable with Last-Event-ID."""
+
+    if not db.session.get(Event, event_id):
+        return jsonify({"error": "Event not found"}), 404
+
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    if last_event_id is None:
+        # A new display starts from the latest check-in instead of replaying the whole log
+        last_event_id = db.session.scalar(
+            select(func.max(CheckinLog.id)).where(CheckinLog.event_id == event_id)
+        ) or 0
+    else:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return jsonify({"error": "Last-Event-ID must be an integer."}), 400
+
+    poll_interval = current_app.config['CHECKIN_STREAM_POLL_INTERVAL']
+    batch_size = current_app.config['CHECKIN_STREAM_BATCH_SIZE']
+    subscription = pubsub.subscribe(f'checkins:{event_id}')
+    # Don't hold a pooled connection while the stream idles
+    db.session.close()
+
+    def generate(cursor):
+        with subscription:
+            yield f"retry: {int(poll_interval * 1000)}\n\n"
+            while True:
+                rows = db.session.execute(checkin_log_query(event_id, cursor, batch_size)).all()
+                db.session.close()
+                for row in rows:
+                    yield checkin_message(row)
+                    cursor = row.id
+                if len(rows) == batch_size:
+                    continue
+                # Woken by a publish in this process; otherwise poll so other workers' check-ins still arrive
+                if not subscription.wait(poll_interval):
+                    yield ": keep-alive\n\n"
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(generate(last_event_id)), mimetype='text/event-stream', headers=headers)
+
+
+@main.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Report the status, progress and result of a background job."""
+
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@auth_bp.route('/register', methods=['POST'])
+def register():
+    """Register a new user."""
+
+    data = request.get_json()
+    if not data.get('username') or not data.get('password'):
+        return jsonify({"error": "Username and password required"}), 400
+
+    try:
+        password_hash = authenticator.hash_password(data['password'])
+    except HasherBusy:
+        return jsonify({"error": "Server busy, please retry"}), 503, {"Retry-After": "1"}
+    user = User(username=data['username'], password=password_hash)
+    db.session.add(user)
+    db.session.commit()
+
+    return jsonify({"message": "User registered successfully!"}), 201
+
+
+@auth_bp.route('/login', methods=['POST'])
+def login():
+    """Authenticate a user and provide access and refresh JWT tokens."""
+
+    data = request.get_json()
+    try:
+        user_id = authenticator.authenticate(data['username'], data['password'], request.remote_addr)
+    except LoginThrottled as throttled:
+        return jsonify({"error": "Too many failed login attempts"}), 429, {"Retry-After": str(throttled.retry_after)}
+    except HasherBusy:
+        return jsonify({"error": "Server busy, please retry"}), 503, {"Retry-After": "1"}
+
+    if user_id is not None:
+        access_token = create_access_token(identity=str(user_id))
+        refresh_token = create_refresh_token(identity=str(user_id))
+        return jsonify(access_token=access_token, refresh_token=refresh_token)
+
+    return jsonify({"error": "Invalid credentials"}), 401
+
+
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """Issue a new access token from a refresh token, without a password login."""
+
+    access_token = create_access_token(identity=get_jwt_identity())
+    return jsonify(access_token=access_token)
@@ -0,0 +1,60 @@
+from datetime import timedelta
+from sqlalchemy import select
+from .dialects import lock_key
+from .models import Event, EventStatus, db
+
+# Fields listed for a venue's bookings, on its schedule and in conflict reports
+SCHEDULE_FIELDS = ["id", "name", "start_time", "end_time", "status"]
+SCHEDULE_COLUMNS = [Event.id, Event.name, Event.start_time, Event.end_time, Event.status]
+
+CONFLICT_POLICIES = ('reject', 'warn', 'off')
+
+
+def max_event_duration(config):
+    return timedelta(days=config['SCHEDULE_MAX_EVENT_DAYS'])
+
+
+def bookings_query(location, start, end, max_duration):
+    """
+        Non-canceled events at `location` overlapping [start, end), in start order.
+        No event lasts longer than `max_duration`, so only events starting in
+        [start - max_duration, end) can overlap, which bounds the index range read.
+    """
+    return (
+        select(*SCHEDULE_COLUMNS)
+        .where(
+            Event.location == location,
+            Event.start_time >= start - max_duration,
+            Event.start_time < end,
+            Event.end_time > start,
+            Event.status != EventStatus.canceled
+        )
+        # The (location, start_time, end_time) index order, so pages need no sort
+        .order_by(Event.start_time, Event.end_time, Event.id)
+    )
+
+
+def is_canceled(status):
+    return status in (EventStatus.canceled, EventStatus.canceled.name)
+
+
+def invalid_schedule(event, max_duration):
+    """Why the event's time window can't be booked, or None."""
+    if event.end_time <= event.start_time:
+        return "end_time must be after start_time."
+    if event.end_time - event.start_time > max_duration:
+        return f"Events may last at most {max_duration.days} days."
+    return None
+
+
+def find_conflicts(event, max_duration):
+    """
+        Other events booked at the event's location during its time. The pending change is
+        flushed and the location locked first, so two transactions booking overlapping slots
+        cannot both pass the check.
+    """
+    db.session.flush()
+    lock_key(db.session.connection(), f'location:{event.location}')
+    return db.session.execute(
+        bookings_query(event.location, event.start_time, event.end_time, max_duration).where(Event.id != event.id)
+    ).all()
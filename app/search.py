@@ -0,0 +1,118 @@
+import re
+from sqlalchemy import DDL, column, event, func, literal_column, select, table
+from . import db
+from .models import Attendee, Event
+
+# Full-text search over events and attendees. SQLite keeps FTS5 tables in sync with
+# triggers; PostgreSQL uses GIN indexes over a to_tsvector() expression, which need no
+# triggers. Both are created with the schema (db.create_all or the migration).
+
+# Query terms beyond this many are ignored
+MAX_SEARCH_TERMS = 8
+
+SQLITE_DDL = [
+    # prefix='2 3 4' adds prefix indexes, so short typeahead prefixes don't merge every matching term
+    "CREATE VIRTUAL TABLE IF NOT EXISTS event_fts USING fts5("
+    "name, description, location, content='event', content_rowid='id', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_insert AFTER INSERT ON event BEGIN "
+    "INSERT INTO event_fts(rowid, name, description, location) VALUES (new.id, new.name, new.description, new.location); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_delete AFTER DELETE ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, name, description, location) "
+    "VALUES ('delete', old.id, old.name, old.description, old.location); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_update AFTER UPDATE OF name, description, location ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, name, description, location) "
+    "VALUES ('delete', old.id, old.name, old.description, old.location); "
+    "INSERT INTO event_fts(rowid, name, description, location) VALUES (new.id, new.name, new.description, new.location); "
+    "END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS attendee_fts USING fts5("
+    "first_name, last_name, email, phone_number, content='attendee', content_rowid='id', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS attendee_fts_insert AFTER INSERT ON attendee BEGIN "
+    "INSERT INTO attendee_fts(rowid, first_name, last_name, email, phone_number) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone_number); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS attendee_fts_delete AFTER DELETE ON attendee BEGIN "
+    "INSERT INTO attendee_fts(attendee_fts, rowid, first_name, last_name, email, phone_number) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone_number); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS attendee_fts_update AFTER UPDATE OF first_name, last_name, email, phone_number "
+    "ON attendee BEGIN "
+    "INSERT INTO attendee_fts(attendee_fts, rowid, first_name, last_name, email, phone_number) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone_number); "
+    "INSERT INTO attendee_fts(rowid, first_name, last_name, email, phone_number) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone_number); "
+    "END",
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS event_fts", "DROP TABLE IF EXISTS attendee_fts"]
+
+# The documents PostgreSQL indexes; queries must use the same expressions to hit the indexes
+EVENT_TSVECTOR = ("to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '') "
+                  "|| ' ' || coalesce(location, ''))")
+ATTENDEE_TSVECTOR = ("to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '') "
+                     "|| ' ' || coalesce(email, '') || ' ' || coalesce(phone_number, ''))")
+POSTGRESQL_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_event_search ON event USING gin ({EVENT_TSVECTOR})",
+    f"CREATE INDEX IF NOT EXISTS ix_attendee_search ON attendee USING gin ({ATTENDEE_TSVECTOR})",
+]
+POSTGRESQL_DROP = ["DROP INDEX IF EXISTS ix_event_search", "DROP INDEX IF EXISTS ix_attendee_search"]
+
+# FTS5 tables, plus the shadow tables FTS5 creates for each (event_fts_data, event_fts_idx, ...)
+SEARCH_TABLES = ('event_fts', 'attendee_fts')
+
+for statement in SQLITE_DDL:
+    event.listen(db.metadata, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in POSTGRESQL_DDL:
+    event.listen(db.metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+for statement in SQLITE_DROP:
+    event.listen(db.metadata, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+for statement in POSTGRESQL_DROP:
+    event.listen(db.metadata, 'before_drop', DDL(statement).execute_if(dialect='postgresql'))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Alembic filter that hides the search tables, which are not part of the models, from autogenerate."""
+    if type_ == 'table' and reflected and compare_to is None:
+        return not any(name == fts or name.startswith(fts + '_') for fts in SEARCH_TABLES)
+    return True
+
+
+def search_terms(q):
+    """Split a query into its words."""
+    return re.findall(r'\w+', q or '')[:MAX_SEARCH_TERMS]
+
+
+def _matching(dialect_name, fts_name, tsvector, key, terms):
+    """
+        (criterion, ordering, join) matching every term, the last one as a prefix since it may
+        still be being typed. Matches come back in id order: ranking has to score every match
+        first, which for common words costs hundreds of milliseconds on large tables, while
+        id order lets the index stop at the limit.
+    """
+    if dialect_name == 'sqlite':
+        fts = table(fts_name, column('rowid'), column(fts_name))
+        expression = ' '.join(f'"{term}"' for term in terms) + '*'
+        # Ordering by the FTS rowid (not the joined table's id) streams matches without a sort
+        return fts.c[fts_name].match(expression), fts.c.rowid, (fts, fts.c.rowid == key)
+    if dialect_name == 'postgresql':
+        query = func.to_tsquery('simple', ' & '.join(terms) + ':*')
+        return literal_column(tsvector).op('@@')(query), key, None
+    raise NotImplementedError(f"Full-text search is not supported on {dialect_name}")
+
+
+def search_events_query(dialect_name, terms, columns):
+    """Events matching all `terms`, in id order."""
+    criterion, order, join = _matching(dialect_name, 'event_fts', EVENT_TSVECTOR, Event.id, terms)
+    query = select(*columns)
+    if join is not None:
+        query = query.select_from(Event).join(*join)
+    return query.where(criterion).order_by(order)
+
+
+def search_attendees_query(dialect_name, event_id, terms, columns):
+    """An event's attendees matching all `terms`, in id order."""
+    criterion, order, join = _matching(dialect_name, 'attendee_fts', ATTENDEE_TSVECTOR, Attendee.id, terms)
+    query = select(*columns)
+    if join is not None:
+        query = query.select_from(Attendee).join(*join)
+    return query.where(criterion, Attendee.event_id == event_id).order_by(order)
@@ -0,0 +1,133 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+from .ratelimit import FailureLimiter
+
+
+class HasherBusy(Exception):
+    """Raised when the password hashing pool already has its maximum backlog."""
+
+
+class LoginThrottled(Exception):
+    """Raised when a username or client address has too many recent failed logins."""
+
+    def __init__(self, retry_after):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+@lru_cache(maxsize=8)
+def hash_prefix(method):
+    """The parameter prefix werkzeug writes for `method`, e.g. 'scrypt:32768:8:1'."""
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def needs_rehash(password_hash, method):
+    """True if `password_hash` was not produced with the configured method and parameters."""
+    return password_hash.split('$', 1)[0] != hash_prefix(method)
+
+
+class Authenticator:
+    """
+        Password verification for the login path.
+        Hashing runs in a bounded worker pool (AUTH_HASH_WORKERS) so a login surge cannot
+        monopolize request threads, and a full backlog is rejected fast. Users are looked up
+        through a short-lived cache, failed attempts are throttled per username and client
+        address, and hashes made with outdated parameters are upgraded on successful login.
+    """
+
+    def init_app(self, app):
+        app.extensions['authenticator'] = {
+            "executor": ThreadPoolExecutor(
+                max_workers=app.config.get('AUTH_HASH_WORKERS', 4),
+                thread_name_prefix='password-hash'
+            ),
+            "slots": threading.BoundedSemaphore(app.config.get('AUTH_HASH_MAX_PENDING', 64)),
+            "users": {},
+            "users_lock": threading.Lock(),
+            "limiter": FailureLimiter(
+                app.config.get('AUTH_MAX_FAILED_ATTEMPTS', 5),
+                app.config.get('AUTH_FAILED_ATTEMPT_WINDOW', 300)
+            ),
+            "address_limiter": FailureLimiter(
+                app.config.get('AUTH_MAX_FAILED_ATTEMPTS_PER_ADDRESS', 100),
+                app.config.get('AUTH_FAILED_ATTEMPT_WINDOW', 300)
+            ),
+        }
+
+    @property
+    def _state(self):
+        return current_app.extensions['authenticator']
+
+    def _run(self, func, *args):
+        """Run a hashing call in the pool, refusing work beyond the configured backlog."""
+        state = self._state
+        if not state["slots"].acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            future = state["executor"].submit(func, *args)
+            return future.result(timeout=current_app.config.get('AUTH_HASH_TIMEOUT', 10))
+        finally:
+            state["slots"].release()
+
+    def hash_password(self, password):
+        return self._run(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+    def _lookup(self, username):
+        """Return (user_id, password_hash) for `username`, cached for AUTH_USER_CACHE_TTL seconds."""
+        from .models import User, db
+
+        state = self._state
+        now = time.monotonic()
+        with state["users_lock"]:
+            cached = state["users"].get(username)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        row = db.session.execute(
+            db.select(User.id, User.password).where(User.username == username)
+        ).first()
+        if row is None:
+            return None
+        entry = (row.id, row.password)
+        with state["users_lock"]:
+            if len(state["users"]) >= current_app.config.get('AUTH_USER_CACHE_SIZE', 10000):
+                state["users"].clear()
+            state["users"][username] = (now + current_app.config.get('AUTH_USER_CACHE_TTL', 60), entry)
+        return entry
+
+    def forget(self, username):
+        with self._state["users_lock"]:
+            self._state["users"].pop(username, None)
+
+    def authenticate(self, username, password, remote_addr):
+        """Return the user id for valid credentials, else None; may raise LoginThrottled or HasherBusy."""
+        from .models import User, db
+
+        # A username is throttled per client address, so guessing from one client cannot lock
+        # its owner out elsewhere; the address limit is much higher because many users may
+        # share one address behind a NAT or proxy
+        limits = ((self._state["limiter"], (username, remote_addr)), (self._state["address_limiter"], remote_addr))
+        retry_after = max(limiter.retry_after(key) for limiter, key in limits)
+        if retry_after:
+            raise LoginThrottled(retry_after)
+
+        entry = self._lookup(username)
+        if entry is None or not self._run(check_password_hash, entry[1], password):
+            for limiter, key in limits:
+                limiter.fail(key)
+            return None
+        self._state["limiter"].reset((username, remote_addr))
+
+        user_id, password_hash = entry
+        method = current_app.config['PASSWORD_HASH_METHOD']
+        if needs_rehash(password_hash, method):
+            db.session.execute(
+                db.update(User).where(User.id == user_id).values(password=self.hash_password(password))
+            )
+            db.session.commit()
+            self.forget(username)
+        return user_id
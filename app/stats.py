@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from .models import Event, EventCheckinMinute, db
+
+# Event columns read by the stats endpoints; the counts come from the denormalized counters
+STATS_COLUMNS = (Event.id, Event.name, Event.max_attendees, Event.registered_count, Event.checked_in_count,
+                 Event.waitlisted_count)
+
+
+def checkin_rates_query(event_ids, window_minutes, now=None):
+    """Total check-ins per event over the last `window_minutes` minutes."""
+    now = now or datetime.utcnow()
+    since = now.replace(second=0, microsecond=0) - timedelta(minutes=window_minutes - 1)
+    return (
+        select(EventCheckinMinute.event_id, func.sum(EventCheckinMinute.checkins))
+        .where(EventCheckinMinute.event_id.in_(event_ids), EventCheckinMinute.minute >= since)
+        .group_by(EventCheckinMinute.event_id)
+    )
+
+
+def checkin_rates(event_ids, window_minutes, now=None):
+    """Average check-ins per minute over the last `window_minutes` minutes, by event id."""
+    if not event_ids:
+        return {}
+    rows = db.session.execute(checkin_rates_query(event_ids, window_minutes, now))
+    return rates_per_minute(rows, window_minutes)
+
+
+def rates_per_minute(rows, window_minutes):
+    """Turn (event_id, total) rows from checkin_rates_query into per-minute rates."""
+    return {event_id: round(total / window_minutes, 2) for event_id, total in rows}
+
+
+def event_stats(rows, window_minutes, now=None, rates=None):
+    """Build the stats payload for rows selected with STATS_COLUMNS, reading rates unless given."""
+    if rates is None:
+        rates = checkin_rates([row.id for row in rows], window_minutes, now)
+    return [
+        {
+            "event_id": row.id,
+            "name": row.name,
+            "registered": row.registered_count,
+            "checked_in": row.checked_in_count,
+            "capacity": row.max_attendees,
+            "capacity_remaining": max(row.max_attendees - row.registered_count, 0),
+            "waitlisted": row.waitlisted_count,
+            "checkin_rate_per_minute": rates.get(row.id, 0.0)
+        }
+        for row in rows
+    ]
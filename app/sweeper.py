@@ -0,0 +1,72 @@
+import threading
+from datetime import datetime
+from sqlalchemy import and_, case, literal, or_, update
+from . import jobs
+from .models import Event, EventStatus, db
+from .registration import promote_waitlists
+
+
+def sweep_event_statuses(now=None):
+    """
+        Move every due event forward in a single set-based UPDATE:
+        scheduled -> ongoing once started, and scheduled/ongoing -> completed once ended.
+        Returns the number of events updated.
+    """
+    now = now or datetime.utcnow().replace(microsecond=0)
+    status_type = Event.__table__.c.status.type
+    result = db.session.execute(
+        update(Event)
+        .where(or_(
+            and_(Event.status == EventStatus.scheduled, Event.start_time <= now),
+            and_(Event.status == EventStatus.ongoing, Event.end_time <= now)
+        ))
+        .values(status=case(
+            (Event.end_time <= now, literal(EventStatus.completed, status_type)),
+            else_=literal(EventStatus.ongoing, status_type)
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+class StatusSweeper(threading.Thread):
+    """Daemon thread that runs the status sweep every `interval` seconds."""
+
+    def __init__(self, app, interval):
+        super().__init__(name='event-status-sweeper', daemon=True)
+        self.app = app
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    updated = sweep_event_statuses()
+                    if updated:
+                        self.app.logger.info("Status sweeper updated %d event(s)", updated)
+                    # Catch waitlists left behind by seats freed outside update_event
+                    promoted = promote_waitlists(self.app.config['WAITLIST_PROMOTION_BATCH_SIZE'])
+                    if promoted:
+                        self.app.logger.info("Status sweeper promoted %d waitlisted attendee(s)", promoted)
+                    # Fail jobs whose process died without a restart of this server, e.g. a killed worker
+                    failed = jobs.fail_interrupted(stale_only=True)
+                    if failed:
+                        self.app.logger.warning("Status sweeper marked %d interrupted job(s) as failed", failed)
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Status sweep failed")
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_status_sweeper(app):
+    """Start the background sweeper if STATUS_SWEEP_INTERVAL is set; return the thread or None."""
+    interval = app.config.get('STATUS_SWEEP_INTERVAL')
+    if not interval:
+        return None
+    sweeper = StatusSweeper(app, interval)
+    sweeper.start()
+    return sweeper
@@ -0,0 +1,14 @@
+"""
+    Production ASGI entry point. The read-heavy GET routes and the check-in stream run as
+    async handlers; every other request is passed through to the Flask app.
+
+        uvicorn asgi:app --workers 4
+"""
+import os
+from app.asgi import create_asgi_app
+from app.sweeper import start_status_sweeper
+
+app = create_asgi_app(os.environ.get('APP_CONFIG', 'production'))
+
+# Advance event statuses in the background instead of on read
+start_status_sweeper(app.flask_app)
@@ -0,0 +1,8 @@
+"""Load-test and micro-benchmark suite for the event API (run with `python -m benchmarks`)."""
+
+# Named dataset sizes: events in the table, attendees in the benchmark event, rows per CSV
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1M": 1_000_000,
+}
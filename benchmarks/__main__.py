@@ -0,0 +1,320 @@
+"""
+    Benchmark every route in app/routes.py against a synthetic dataset.
+
+        python -m benchmarks --scale 1k                       # in-process Flask test client
+        python -m benchmarks --scale 100k --mode server -w 4  # local multi-worker HTTP server
+        python -m benchmarks --mode server --server asgi --idle-streams 64  # async handlers under held connections
+
+    Results (p50/p99 latency, throughput and, in client mode, SQL queries per request)
+    are printed and written as JSON so runs can be compared across commits with
+    `python -m benchmarks.compare <old.json> <new.json>`.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from . import SCALES
+
+ROUTES = ["list_events", "event_stats", "search_events", "register_attendee", "list_attendees", "search_attendees",
+          "check_in_attendee", "bulk_checkin", "login"]
+BENCH_USER = ("bench", "bench-password")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(latencies, elapsed, queries=None):
+    result = {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+    if queries is not None:
+        result["queries_per_request"] = round(sum(queries) / len(queries), 2)
+    return result
+
+
+def build_requests(route, count, context):
+    """Return `count` (method, url, body, content_type) tuples exercising one route."""
+    event_id, first_attendee_id = context["event_id"], context["first_attendee_id"]
+    nonce = context["nonce"]
+    if route == "list_events":
+        return [("GET", "/events?limit=50", None, None)] * count
+    if route == "event_stats":
+        return [("GET", "/events/stats?limit=50", None, None)] * count
+    if route == "search_events":
+        return [("GET", f"/events/search?q=event%20{i}", None, None) for i in range(count)]
+    if route == "search_attendees":
+        return [("GET", f"/events/{event_id}/attendees/search?q=attendee{i}", None, None) for i in range(count)]
+    if route == "list_attendees":
+        return [("GET", f"/events/{event_id}/attendees?limit=100", None, None)] * count
+    if route == "register_attendee":
+        return [
+            ("POST", f"/events/{event_id}/attendees", json.dumps({
+                "first_name": "Bench",
+                "last_name": "Registrant",
+                "email": f"register{i}.{nonce}@bench.example.com",
+                "phone_number": "5550000000",
+            }), "application/json")
+            for i in range(count)
+        ]
+    if route == "check_in_attendee":
+        return [
+            ("PATCH", f"/events/{event_id}/attendees/{first_attendee_id + i}/checkin", None, None)
+            for i in range(count)
+        ]
+    if route == "bulk_checkin":
+        with open(context["csv_path"], 'rb') as f:
+            body = f.read()
+        return [("POST", f"/events/{event_id}/attendees/bulk_checkin?async=false", body, "text/csv")] * count
+    if route == "login":
+        body = json.dumps({"username": BENCH_USER[0], "password": BENCH_USER[1]})
+        return [("POST", "/auth/login", body, "application/json")] * count
+    raise ValueError(route)
+
+
+def seed(app, scale, csv_dir):
+    """Populate the database and return the ids and files the scenarios need."""
+    from app import db
+    from app.models import Attendee, Event
+    from .datagen import generate_attendees, generate_events, generate_user, write_checkin_csv
+
+    size = SCALES[scale]
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        generate_events(size)
+        event_id = db.session.scalar(db.select(db.func.min(Event.id)))
+        generate_attendees(event_id, size)
+        generate_user(*BENCH_USER)
+        first_attendee_id = db.session.scalar(
+            db.select(db.func.min(Attendee.id)).where(Attendee.event_id == event_id)
+        )
+        print(f"Seeded {size} events and {size} attendees in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    csv_path = write_checkin_csv(os.path.join(csv_dir, 'checkin.csv'), event_id, size, existing=size)
+    return {
+        "event_id": event_id,
+        "first_attendee_id": first_attendee_id,
+        "csv_path": csv_path,
+        "nonce": int(time.time()),
+    }
+
+
+def run_client(app, context, counts):
+    """Drive each route sequentially through the Flask test client, counting SQL queries."""
+    from sqlalchemy import event
+    from app import db
+
+    client = app.test_client()
+    queries = [0]
+
+    def count_query(*args):
+        queries[0] += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count_query)
+
+    results = {}
+    try:
+        for route, count in counts.items():
+            latencies, per_request = [], []
+            started = time.perf_counter()
+            for method, url, body, content_type in build_requests(route, count, context):
+                queries[0] = 0
+                t0 = time.perf_counter()
+                response = client.open(url, method=method, data=body, content_type=content_type)
+                latencies.append(time.perf_counter() - t0)
+                per_request.append(queries[0])
+                if response.status_code >= 500:
+                    raise RuntimeError(f"{route}: {method} {url} returned {response.status_code}")
+            results[route] = summarize(latencies, time.perf_counter() - started, per_request)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_query)
+    return results
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers, env, server='wsgi'):
+    """
+        Start a local multi-worker server: gunicorn threaded workers (else threaded werkzeug)
+        for wsgi, or uvicorn workers running the async read handlers for asgi.
+    """
+    port = _free_port()
+    if server == 'asgi':
+        command = [sys.executable, '-m', 'uvicorn', '--factory', 'app.asgi:create_asgi_app', '--workers', str(workers),
+                   '--host', '127.0.0.1', '--port', str(port), '--no-access-log']
+    else:
+        try:
+            import gunicorn  # noqa: F401
+            command = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '--threads', '4',
+                       '-b', f'127.0.0.1:{port}', 'app:create_app()']
+        except ImportError:
+            print("gunicorn not installed; falling back to a single threaded werkzeug server", file=sys.stderr)
+            command = [sys.executable, '-c',
+                       'from werkzeug.serving import run_simple; from app import create_app; '
+                       f'run_simple("127.0.0.1", {port}, create_app(), threaded=True)']
+    process = subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(base_url + '/events?limit=1', timeout=1)
+            return process, base_url
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Benchmark server did not start")
+
+
+def open_idle_streams(base_url, event_id, count):
+    """
+        Open `count` check-in streams that stay connected for the whole run, like door
+        displays waiting for scans. Only the request is sent, so opening never blocks.
+    """
+    host, port = base_url.rsplit('/', 1)[-1].split(':')
+    request = (f"GET /events/{event_id}/checkins/stream HTTP/1.1\r\nHost: {host}\r\n"
+               "Accept: text/event-stream\r\n\r\n").encode('ascii')
+    streams = []
+    for _ in range(count):
+        sock = socket.create_connection((host, int(port)))
+        sock.sendall(request)
+        streams.append(sock)
+    # Give the server time to pick up the held connections before measuring
+    time.sleep(1)
+    return streams
+
+
+def run_server(base_url, context, counts, concurrency):
+    """Drive each route over HTTP with `concurrency` parallel clients."""
+
+    def send(spec):
+        method, url, body, content_type = spec
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        request = urllib.request.Request(base_url + url, data=data, method=method)
+        if content_type:
+            request.add_header('Content-Type', content_type)
+        t0 = time.perf_counter()
+        try:
+            urllib.request.urlopen(request, timeout=300).read()
+        except urllib.error.HTTPError as exc:
+            if exc.code >= 500:
+                raise
+        return time.perf_counter() - t0
+
+    results = {}
+    for route, count in counts.items():
+        specs = build_requests(route, count, context)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            started = time.perf_counter()
+            latencies = list(pool.map(send, specs))
+            results[route] = summarize(latencies, time.perf_counter() - started)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='1k')
+    parser.add_argument('--mode', choices=['client', 'server'], default='client')
+    parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi', help='server stack in server mode')
+    parser.add_argument('--idle-streams', type=int, default=0,
+                        help='check-in streams held open during a server mode run')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='server worker processes')
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help='parallel clients in server mode')
+    parser.add_argument('-n', '--requests', type=int, default=200, help='requests per route')
+    parser.add_argument('--bulk-requests', type=int, default=3, help='requests for bulk_checkin')
+    parser.add_argument('--routes', default=','.join(ROUTES), help='comma separated subset of routes')
+    parser.add_argument('--cache', default='null', help='CACHE_BACKEND for the run (default: null, measure the database path)')
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results'), help='directory for the JSON results')
+    args = parser.parse_args(argv)
+
+    routes = [route for route in args.routes.split(',') if route]
+    counts = {route: args.bulk_requests if route == 'bulk_checkin' else args.requests for route in routes}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   APP_CONFIG='production',
+                   DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                   CACHE_BACKEND=args.cache,
+                   # Measure the registration write path rather than per-event admission control
+                   REGISTRATION_RATE_PER_SECOND='0')
+        # Configuration is read from the environment when the app package is first imported
+        os.environ.update(env)
+        from app import create_app
+        app = create_app('production')
+        app.config['STATUS_SWEEP_INTERVAL'] = 0
+        context = seed(app, args.scale, tmp)
+
+        if args.mode == 'client':
+            results = run_client(app, context, counts)
+        else:
+            with app.app_context():
+                from app import db
+                db.engine.dispose()
+            process, base_url = start_server(args.workers, env, args.server)
+            streams = []
+            try:
+                streams = open_idle_streams(base_url, context["event_id"], args.idle_streams)
+                results = run_server(base_url, context, counts, args.concurrency)
+            finally:
+                for sock in streams:
+                    sock.close()
+                process.terminate()
+                process.wait()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(timespec='seconds'),
+        "scale": args.scale,
+        "mode": args.mode,
+        "server": args.server if args.mode == 'server' else None,
+        "idle_streams": args.idle_streams if args.mode == 'server' else 0,
+        "workers": args.workers if args.mode == 'server' else 1,
+        "concurrency": args.concurrency if args.mode == 'server' else 1,
+        "results": results,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    mode = f"server-{args.server}" if args.mode == 'server' else args.mode
+    path = os.path.join(args.output, f"{report['commit']}-{args.scale}-{mode}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'route':<20}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>10}")
+    for route, stats in results.items():
+        print(f"{route:<20}{stats['p50_ms']:>10}{stats['p99_ms']:>10}{stats['throughput_rps']:>10}"
+              f"{stats.get('queries_per_request', '-'):>10}")
+    print(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
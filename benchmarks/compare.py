@@ -0,0 +1,40 @@
+"""Compare two benchmark result files: python -m benchmarks.compare <baseline.json> <candidate.json>"""
+import json
+import sys
+
+METRICS = ["p50_ms", "p99_ms", "throughput_rps", "queries_per_request"]
+
+
+def compare(baseline, candidate):
+    """Yield (route, metric, old, new, percent change) for every metric present in both runs."""
+    for route, new_stats in candidate["results"].items():
+        old_stats = baseline["results"].get(route)
+        if not old_stats:
+            continue
+        for metric in METRICS:
+            old, new = old_stats.get(metric), new_stats.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            yield route, metric, old, new, change
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    if len(argv) != 2:
+        print(__doc__)
+        return 2
+    with open(argv[0]) as f:
+        baseline = json.load(f)
+    with open(argv[1]) as f:
+        candidate = json.load(f)
+
+    print(f"{baseline['commit']} -> {candidate['commit']} (scale {candidate['scale']}, {candidate['mode']} mode)")
+    print(f"{'route':<20}{'metric':<22}{'old':>12}{'new':>12}{'change':>10}")
+    for route, metric, old, new, change in compare(baseline, candidate):
+        print(f"{route:<20}{metric:<22}{old:>12}{new:>12}{change:>+9.1f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import csv
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.models import Attendee, Event, EventStatus, User, db
+
+BATCH_SIZE = 5_000
+LOCATIONS = ["Hall A", "Hall B", "Hall C", "Auditorium", "Room 101", "Room 102"]
+
+
+def _batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_events(count, seed=0):
+    """Insert `count` events spread over the next year; returns nothing (ids are sequential)."""
+    rng = random.Random(seed)
+    base = datetime.utcnow().replace(microsecond=0)
+
+    def rows():
+        for i in range(count):
+            start = base + timedelta(minutes=rng.randrange(0, 365 * 24 * 60))
+            yield {
+                "name": f"Event {i}",
+                "description": "Synthetic benchmark event",
+                "start_time": start,
+                "end_time": start + timedelta(hours=rng.randint(1, 8)),
+                "location": rng.choice(LOCATIONS),
+                "max_attendees": 10_000_000,
+                "status": EventStatus.scheduled,
+            }
+
+    for batch in _batched(rows()):
+        db.session.execute(insert(Event), batch)
+    db.session.commit()
+
+
+def attendee_email(event_id, index):
+    return f"attendee{index}.event{event_id}@bench.example.com"
+
+
+def generate_attendees(event_id, count, checked_in_fraction=0.0, seed=0):
+    """Insert `count` attendees for one event and bring its counters up to date."""
+    rng = random.Random(seed)
+    checked_in = 0
+
+    def rows():
+        nonlocal checked_in
+        for i in range(count):
+            is_checked_in = rng.random() < checked_in_fraction
+            checked_in += is_checked_in
+            yield {
+                "first_name": "Bench",
+                "last_name": f"Attendee{i}",
+                "email": attendee_email(event_id, i),
+                "phone_number": f"555{i:07d}",
+                "event_id": event_id,
+                "check_in_status": is_checked_in,
+            }
+
+    for batch in _batched(rows()):
+        db.session.execute(insert(Attendee), batch)
+    db.session.execute(
+        db.update(Event)
+        .where(Event.id == event_id)
+        .values(registered_count=Event.registered_count + count, checked_in_count=Event.checked_in_count + checked_in)
+    )
+    db.session.commit()
+
+
+def generate_user(username, password):
+    user = User(username=username, password=password)
+    user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+
+
+def write_checkin_csv(path, event_id, rows, existing, new_fraction=0.1, seed=0):
+    """
+        Write a bulk check-in CSV with `rows` rows: mostly attendees that already exist
+        (indices below `existing`), plus `new_fraction` of unknown walk-ins.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["first_name", "last_name", "email", "phone_number"])
+        for i in range(rows):
+            if existing and rng.random() >= new_fraction:
+                index = rng.randrange(existing)
+                writer.writerow(["Bench", f"Attendee{index}", attendee_email(event_id, index), ""])
+            else:
+                writer.writerow(["Walk", f"In{i}", f"walkin{i}.{seed}@bench.example.com", ""])
+    return path
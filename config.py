@@ -1,9 +1,201 @@
-class Config:
-    """
-        Configuration class for the Flask application.
-        Defines settings for database connection, session security, and JWT authentication.
-    """
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///event_management.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SECRET_KEY = 'Event_Management_Api_Flask'
-    JWT_SECRET_KEY = 'my_jwt_secret_key'
+import os
+
+
+def database_url(default):
+    """Read DATABASE_URL, normalizing the legacy postgres:// scheme to the psycopg2 driver."""
+    url = os.environ.get('DATABASE_URL', default)
+    if url.startswith('postgres://'):
+        url = 'postgresql+psycopg2://' + url[len('postgres://'):]
+    return url
+
+
+def engine_options(url, pool_size=5, max_overflow=10, pool_recycle=1800, pool_timeout=30):
+    """
+        SQLAlchemy engine options tuned for the database behind `url`.
+        In-memory SQLite uses a single shared connection, so pool sizing does not apply there.
+    """
+    if url.startswith('sqlite') and (':memory:' in url or url in ('sqlite://', 'sqlite:///')):
+        return {}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": pool_recycle,
+        "pool_timeout": pool_timeout,
+        "pool_pre_ping": True,
+    }
+
+
+class Config:
+    """
+        Configuration class for the Flask application.
+        Defines settings for database connection, session security, and JWT authentication.
+    """
+    SQLALCHEMY_DATABASE_URI = database_url('sqlite:///event_management.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = 'Event_Management_Api_Flask'
+    JWT_SECRET_KEY = 'my_jwt_secret_key'
+
+    # Pragmas applied to every new SQLite connection; WAL lets readers run alongside the writer
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+    }
+
+    # Rows per batched lookup when streaming a bulk check-in CSV
+    BULK_CHECKIN_CHUNK_SIZE = 1000
+
+    # Uploads larger than this many bytes are processed by a background job (override with ?async=)
+    BULK_CHECKIN_ASYNC_THRESHOLD = 5 * 1024 * 1024
+
+    # Background job pool: concurrent jobs per process, and where queued uploads are spooled
+    JOB_MAX_CONCURRENCY = 2
+    JOB_UPLOAD_DIR = os.path.join(os.getcwd(), 'uploads')
+    JOBS_EAGER = False
+    # Running jobs refresh their heartbeat this often (seconds); one silent for three intervals
+    # lost its process and is failed by the status sweeper or the next startup
+    JOB_HEARTBEAT_INTERVAL = 30
+
+    # Largest JSON batch accepted by POST /events/<id>/attendees/checkin:batch
+    BATCH_CHECKIN_MAX_ITEMS = 10000
+
+    # Bulk registration: largest upload accepted, and how many per-row rejections are reported
+    BULK_REGISTRATION_MAX_ROWS = 250000
+    BULK_REGISTRATION_MAX_REJECTIONS = 1000
+
+    # Seconds between background event status sweeps (0 disables the sweeper)
+    STATUS_SWEEP_INTERVAL = 60
+
+    # Default and maximum page sizes for keyset-paginated list endpoints
+    EVENTS_PAGE_SIZE = 50
+    ATTENDEES_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+    # Results returned by the search endpoints unless ?limit= asks for more
+    SEARCH_PAGE_SIZE = 20
+
+    # Rows fetched per round trip when streaming attendee exports
+    EXPORT_BATCH_SIZE = 1000
+
+    # Response cache for hot GET endpoints: 'lru' (in-process, correct only with a single worker
+    # process), 'redis' or 'null' (disabled)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'lru')
+    CACHE_DEFAULT_TTL = 30
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    # JSON encoder for responses: 'auto' (orjson when installed, else the standard library), 'orjson' or 'stdlib'
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+
+    # Request/SQL instrumentation exposed at /metrics; off means no hooks are installed at all.
+    # Metrics are kept per process, so each scrape only sees the worker that served it
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_SERVER_TIMING = False
+    # Bearer token required by /metrics; without one it is only served to loopback clients
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    # A request that runs the same statement this many times is flagged as a likely N+1
+    METRICS_N_PLUS_ONE_THRESHOLD = 10
+
+    # Password hashing: werkzeug method string (e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000').
+    # Hashes made with other parameters are upgraded on the user's next successful login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    # Hashing worker threads, and how many logins may wait for one before new ones get 503
+    AUTH_HASH_WORKERS = 4
+    AUTH_HASH_MAX_PENDING = 64
+    AUTH_HASH_TIMEOUT = 10
+    # Seconds a username -> password hash lookup is cached
+    AUTH_USER_CACHE_TTL = 60
+    AUTH_USER_CACHE_SIZE = 10000
+    # Failed logins allowed per username from one client address, and per client address for
+    # all usernames together, within the window (seconds)
+    AUTH_MAX_FAILED_ATTEMPTS = 5
+    AUTH_MAX_FAILED_ATTEMPTS_PER_ADDRESS = 100
+    AUTH_FAILED_ATTEMPT_WINDOW = 300
+    # Reverse proxies in front of the app whose X-Forwarded-For entries are trusted for the client
+    # address; leave at 0 when clients connect directly, or they could spoof their address
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+
+    # Check-in SSE stream: seconds between catch-up polls/keep-alives, and log rows sent per read
+    CHECKIN_STREAM_POLL_INTERVAL = 15
+    CHECKIN_STREAM_BATCH_SIZE = 500
+
+    # Single registrations admitted per event and worker: sustained rate per second and burst (0 disables)
+    REGISTRATION_RATE_PER_SECOND = float(os.environ.get('REGISTRATION_RATE_PER_SECOND', 50))
+    REGISTRATION_BURST = int(os.environ.get('REGISTRATION_BURST', 200))
+    # Registrations for a full event join a FIFO waitlist (202) instead of being refused,
+    # and are promoted this many per transaction when seats free up
+    WAITLIST_ENABLED = True
+    WAITLIST_PROMOTION_BATCH_SIZE = 500
+
+    # Venue double-booking check on create/update: 'reject' (409), 'warn' (saved, conflicts listed) or 'off'
+    SCHEDULE_CONFLICT_POLICY = os.environ.get('SCHEDULE_CONFLICT_POLICY', 'reject')
+    # Longest event accepted while the check is on; bounds how far back overlap lookups go
+    SCHEDULE_MAX_EVENT_DAYS = 30
+
+    # Days after an event ends before `flask archive-events` moves it, and events moved per transaction
+    ARCHIVE_RETENTION_DAYS = 180
+    ARCHIVE_BATCH_SIZE = 500
+
+    # Minutes of per-minute check-in buckets averaged into the stats endpoints' check-in rate
+    STATS_RATE_WINDOW_MINUTES = 5
+
+    # Read replicas for the read-only GET routes (comma separated REPLICA_DATABASE_URLS); writes use the primary
+    SQLALCHEMY_REPLICA_URIS = [url for url in os.environ.get('REPLICA_DATABASE_URLS', '').split(',') if url]
+    # Seconds a client keeps reading from the primary after a write, tracked with a cookie
+    REPLICA_STICKY_SECONDS = 5
+    REPLICA_STICKY_COOKIE = 'read_primary_until'
+    # Seconds a replica that raised a connection or database error is skipped before being retried
+    REPLICA_RETRY_INTERVAL = 30
+
+    # Async driver URL for the ASGI read handlers; derived from the database URL when unset
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URL')
+    # Threads per ASGI worker running the requests handed to the Flask app
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 8))
+
+    # Seconds a check-in Idempotency-Key is kept for replaying retries
+    IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+
+class DevelopmentConfig(Config):
+    """Local development against the SQLite file database."""
+
+
+class TestingConfig(Config):
+    """Isolated in-memory database for the test suite."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLALCHEMY_REPLICA_URIS = []
+    STATUS_SWEEP_INTERVAL = 0
+    JOBS_EAGER = True
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+
+class ProductionConfig(Config):
+    """
+        Multi-worker deployment. Point DATABASE_URL at PostgreSQL for real write concurrency;
+        pool sizing is per worker process and can be tuned from the environment.
+    """
+    SQLALCHEMY_DATABASE_URI = database_url('sqlite:///event_management.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        SQLALCHEMY_DATABASE_URI,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    )
+    # Each worker would keep its own LRU and serve responses other workers have invalidated,
+    # so the cache is shared through Redis when CACHE_REDIS_URL is set and off otherwise
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'redis' if os.environ.get('CACHE_REDIS_URL') else 'null')
+    # Deployed behind one reverse proxy (nginx, a load balancer) unless configured otherwise
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 1))
+    SECRET_KEY = os.environ.get('SECRET_KEY', Config.SECRET_KEY)
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', Config.JWT_SECRET_KEY)
+
+
+# Profiles selectable with create_app(<name>) or the APP_CONFIG environment variable
+config_by_name = {
+    "development": DevelopmentConfig,
+    "testing": TestingConfig,
+    "production": ProductionConfig,
+}
@@ -0,0 +1,39 @@
+import multiprocessing
+import os
+
+# gunicorn settings for wsgi:app; each value can be overridden from the environment
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# Threaded workers, so one slow client or open check-in stream holds a thread rather than a process
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+
+
+def when_ready(server):
+    """Fail the jobs a previous run left running; no worker has been started yet to run any."""
+    from app import create_app, db, jobs
+    from app.database import app_engines
+
+    app = create_app(os.environ.get('APP_CONFIG', 'production'))
+    with app.app_context():
+        count = jobs.fail_interrupted()
+        # Workers are forked from this process and must not share its connections
+        db.session.remove()
+        for engine in app_engines(app, db):
+            engine.dispose()
+    if count:
+        server.log.warning("Marked %d interrupted job(s) as failed", count)
+
+
+def post_worker_init(worker):
+    """Advance event statuses in the background of each worker, and pick up jobs left queued."""
+    from app import jobs
+    from app.sweeper import start_status_sweeper
+
+    start_status_sweeper(worker.wsgi)
+    with worker.wsgi.app_context():
+        jobs.resume_queued()
@@ -0,0 +1,92 @@
+"""full-text search indexes
+
+Revision ID: 3147f272a008
+Revises: c795e547fd5e
+Create Date: 2026-10-17 21:04:09.421199
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3147f272a008'
+down_revision = 'c795e547fd5e'
+branch_labels = None
+depends_on = None
+
+
+# SQLite: external-content FTS5 tables kept in sync by triggers
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS event_fts USING fts5("
+    "name, description, location, content='event', content_rowid='id', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_insert AFTER INSERT ON event BEGIN "
+    "INSERT INTO event_fts(rowid, name, description, location) VALUES (new.id, new.name, new.description, new.location); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_delete AFTER DELETE ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, name, description, location) "
+    "VALUES ('delete', old.id, old.name, old.description, old.location); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_update AFTER UPDATE OF name, description, location ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, name, description, location) "
+    "VALUES ('delete', old.id, old.name, old.description, old.location); "
+    "INSERT INTO event_fts(rowid, name, description, location) VALUES (new.id, new.name, new.description, new.location); "
+    "END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS attendee_fts USING fts5("
+    "first_name, last_name, email, phone_number, content='attendee', content_rowid='id', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS attendee_fts_insert AFTER INSERT ON attendee BEGIN "
+    "INSERT INTO attendee_fts(rowid, first_name, last_name, email, phone_number) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone_number); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS attendee_fts_delete AFTER DELETE ON attendee BEGIN "
+    "INSERT INTO attendee_fts(attendee_fts, rowid, first_name, last_name, email, phone_number) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone_number); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS attendee_fts_update AFTER UPDATE OF first_name, last_name, email, phone_number "
+    "ON attendee BEGIN "
+    "INSERT INTO attendee_fts(attendee_fts, rowid, first_name, last_name, email, phone_number) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone_number); "
+    "INSERT INTO attendee_fts(rowid, first_name, last_name, email, phone_number) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone_number); "
+    "END",
+    # Index the rows that already exist
+    "INSERT INTO event_fts(event_fts) VALUES ('rebuild')",
+    "INSERT INTO attendee_fts(attendee_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS attendee_fts_update",
+    "DROP TRIGGER IF EXISTS attendee_fts_delete",
+    "DROP TRIGGER IF EXISTS attendee_fts_insert",
+    "DROP TABLE IF EXISTS attendee_fts",
+    "DROP TRIGGER IF EXISTS event_fts_update",
+    "DROP TRIGGER IF EXISTS event_fts_delete",
+    "DROP TRIGGER IF EXISTS event_fts_insert",
+    "DROP TABLE IF EXISTS event_fts",
+]
+
+# PostgreSQL: GIN indexes over the tsvector expressions the search queries use
+POSTGRESQL_UPGRADE = [
+    "CREATE INDEX IF NOT EXISTS ix_event_search ON event USING gin (to_tsvector('simple', "
+    "coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(location, '')))",
+    "CREATE INDEX IF NOT EXISTS ix_attendee_search ON attendee USING gin (to_tsvector('simple', "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '') "
+    "|| ' ' || coalesce(phone_number, '')))",
+]
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_attendee_search",
+    "DROP INDEX IF EXISTS ix_event_search",
+]
+
+
+def _run(sqlite, postgresql):
+    dialect = op.get_bind().dialect.name
+    for statement in {'sqlite': sqlite, 'postgresql': postgresql}.get(dialect, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run(SQLITE_UPGRADE, POSTGRESQL_UPGRADE)
+
+
+def downgrade():
+    _run(SQLITE_DOWNGRADE, POSTGRESQL_DOWNGRADE)
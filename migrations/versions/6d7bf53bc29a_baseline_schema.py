@@ -0,0 +1,58 @@
+"""baseline schema
+
+Revision ID: 6d7bf53bc29a
+Revises: 
+Create Date: 2026-10-17 20:47:52.644517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d7bf53bc29a'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables as originally created with db.create_all(); databases created that way can be
+    # adopted with `flask db stamp 6d7bf53bc29a` followed by `flask db upgrade`
+    op.create_table('event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('location', sa.String(length=100), nullable=False),
+    sa.Column('max_attendees', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('scheduled', 'ongoing', 'completed', 'canceled', name='eventstatus'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=80), nullable=False),
+    sa.Column('password', sa.String(length=120), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('attendee',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('first_name', sa.String(length=50), nullable=False),
+    sa.Column('last_name', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('phone_number', sa.String(length=15), nullable=True),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('check_in_status', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['event.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+
+
+def downgrade():
+    op.drop_table('attendee')
+    op.drop_table('user')
+    op.drop_table('event')
+    sa.Enum(name='eventstatus').drop(op.get_bind(), checkfirst=True)
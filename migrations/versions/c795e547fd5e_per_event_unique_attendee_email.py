@@ -0,0 +1,56 @@
+"""per-event unique attendee email
+
+Revision ID: c795e547fd5e
+Revises: 8da90c990242
+Create Date: 2026-10-17 20:51:35.142414
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c795e547fd5e'
+down_revision = '8da90c990242'
+branch_labels = None
+depends_on = None
+
+
+# Naming convention that gives SQLite's unnamed unique constraints a name batch mode can drop
+SQLITE_NAMING = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def _email_unique_constraint(bind):
+    for constraint in sa.inspect(bind).get_unique_constraints('attendee'):
+        if constraint['column_names'] == ['email']:
+            return constraint['name'] or 'uq_attendee_email'
+    return None
+
+
+def upgrade():
+    bind = op.get_bind()
+    duplicates = bind.execute(sa.text(
+        "SELECT count(*) FROM (SELECT event_id, email_normalized FROM attendee "
+        "GROUP BY event_id, email_normalized HAVING count(*) > 1) AS duplicate"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} attendee emails are registered more than once for the same event "
+            "(ignoring case); merge or delete the duplicates before upgrading."
+        )
+
+    # Emails were unique across all events; attendees may now register for several events
+    name = _email_unique_constraint(bind)
+    with op.batch_alter_table('attendee', schema=None, naming_convention=SQLITE_NAMING) as batch_op:
+        if name:
+            batch_op.drop_constraint(name, type_='unique')
+        batch_op.drop_index('ix_attendee_event_email_normalized')
+        batch_op.create_index('ix_attendee_event_email_normalized', ['event_id', 'email_normalized'], unique=True)
+
+
+def downgrade():
+    # Fails if the same email has since been registered for more than one event
+    with op.batch_alter_table('attendee', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendee_event_email_normalized')
+        batch_op.create_index('ix_attendee_event_email_normalized', ['event_id', 'email_normalized'], unique=False)
+        batch_op.create_unique_constraint('uq_attendee_email', ['email'])
@@ -1,7 +1,11 @@
 from app import create_app
+from app.sweeper import start_status_sweeper
 
 # Initialize the Flask app
 app = create_app()
 
+# Advance event statuses in the background instead of on read
+start_status_sweeper(app)
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,125 @@
+import unittest
+from app import create_app, db
+from app.archive import archive_events
+from app.models import ArchivedAttendee, ArchivedEvent, Attendee, CheckinLog, Event, Job
+from datetime import datetime, timedelta
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        """Set up two long-finished events, a recent one and an upcoming one, with attendees."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            events = [
+                Event(name="Old Conference", start_time=NOW - timedelta(days=400), end_time=NOW - timedelta(days=399),
+                      location="Hall", max_attendees=10, status="completed"),
+                Event(name="Canceled Meetup", start_time=NOW - timedelta(days=300),
+                      end_time=NOW - timedelta(days=300) + timedelta(hours=2),
+                      location="Hall", max_attendees=10, status="canceled"),
+                Event(name="Recent Workshop", start_time=NOW - timedelta(days=10), end_time=NOW - timedelta(days=9),
+                      location="Hall", max_attendees=10, status="completed"),
+                Event(name="Upcoming Summit", start_time=NOW + timedelta(days=10), end_time=NOW + timedelta(days=11),
+                      location="Hall", max_attendees=10, status="scheduled"),
+            ]
+            db.session.add_all(events)
+            db.session.commit()
+            self.event_ids = [event.id for event in events]
+            db.session.add_all([
+                Attendee(first_name="Ada", last_name="Old", email="ada@example.com", event_id=self.event_ids[0],
+                         check_in_status=True, checked_in_at=NOW - timedelta(days=399)),
+                Attendee(first_name="Bob", last_name="Old", email="bob@example.com", event_id=self.event_ids[0]),
+                Attendee(first_name="Cy", last_name="Recent", email="cy@example.com", event_id=self.event_ids[2]),
+                Attendee(first_name="Di", last_name="Next", email="di@example.com", event_id=self.event_ids[3]),
+            ])
+            db.session.add(Job(kind="bulk_checkin", event_id=self.event_ids[0]))
+            db.session.commit()
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def archive(self):
+        with self.app.app_context():
+            return archive_events(self.app.config['ARCHIVE_RETENTION_DAYS'], batch_size=1, now=NOW)
+
+    def test_archive_moves_events_past_retention(self):
+        """Events that ended before the retention window move to the archive with their attendees."""
+        self.assertEqual(self.archive(), (2, 2))
+        self.assertEqual(self.archive(), (0, 0))
+
+        with self.app.app_context():
+            self.assertEqual(db.session.scalars(db.select(Event.id).order_by(Event.id)).all(), self.event_ids[2:])
+            self.assertEqual(db.session.scalars(db.select(ArchivedEvent.id).order_by(ArchivedEvent.id)).all(),
+                             self.event_ids[:2])
+            archived = db.session.get(ArchivedEvent, self.event_ids[0])
+            self.assertEqual((archived.registered_count, archived.checked_in_count, archived.archived_at), (2, 1, NOW))
+            self.assertEqual(db.session.scalar(db.select(db.func.count(ArchivedAttendee.id))), 2)
+            self.assertEqual(db.session.scalar(db.select(db.func.count(Attendee.id))), 2)
+            self.assertEqual(db.session.scalar(db.select(db.func.count(CheckinLog.id))), 0)
+            self.assertIsNone(db.session.scalar(db.select(Job.event_id)))
+
+        # Archived events drop out of search along with the live rows
+        self.assertEqual(self.client.get('/events/search?q=conference').get_json(), [])
+
+    def test_newest_event_is_kept(self):
+        """The event holding the newest id stays live even once it is past retention."""
+        with self.app.app_context():
+            for event_id in self.event_ids[2:]:
+                db.session.delete(db.session.get(Event, event_id))
+            db.session.commit()
+        self.assertEqual(self.archive(), (1, 2))
+        with self.app.app_context():
+            self.assertEqual(db.session.scalars(db.select(Event.id)).all(), [self.event_ids[1]])
+
+    def test_list_events_include_archived(self):
+        """GET /events only lists live events unless include_archived=true, which pages through both."""
+        self.client.get('/events')
+        self.archive()
+
+        response = self.client.get('/events')
+        self.assertEqual([event["id"] for event in response.get_json()], self.event_ids[2:])
+
+        url = '/events?include_archived=true&limit=3&fields=id,status'
+        response = self.client.get(url)
+        ids = [event["id"] for event in response.get_json()]
+        response = self.client.get(f'{url}&cursor={response.headers["X-Next-Cursor"]}')
+        ids += [event["id"] for event in response.get_json()]
+        self.assertNotIn('X-Next-Cursor', response.headers)
+        self.assertEqual(ids, self.event_ids)
+
+        response = self.client.get('/events?include_archived=true&status=canceled')
+        self.assertEqual([event["id"] for event in response.get_json()], [self.event_ids[1]])
+
+    def test_list_archived_attendees(self):
+        """An archived event's attendees are served from the archive only with include_archived=true."""
+        url = f'/events/{self.event_ids[0]}/attendees'
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.archive()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+        response = self.client.get(f'{url}?include_archived=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([attendee["email"] for attendee in response.get_json()], ["ada@example.com", "bob@example.com"])
+
+        response = self.client.get(f'{url}?include_archived=true&check_in_status=true')
+        self.assertEqual([attendee["email"] for attendee in response.get_json()], ["ada@example.com"])
+        self.assertEqual(self.client.get('/events/999/attendees?include_archived=true').status_code, 404)
+
+    def test_archive_command(self):
+        """`flask archive-events` archives with the configured retention, or the one given."""
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=['archive-events', '--retention-days', '350'])
+        self.assertIn("Archived 1 event(s) and 2 attendee(s).", result.output)
+        result = runner.invoke(args=['archive-events'])
+        self.assertIn("Archived 1 event(s) and 0 attendee(s).", result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+from app import db, pubsub
+from app.asgi import async_database_url, create_asgi_app
+from app.models import Event, Attendee, Job, JobStatus
+from datetime import datetime, timedelta
+
+
+class TestAsgiApp(unittest.TestCase):
+    def setUp(self):
+        """Set up a file database (shared by the sync and async engines) with two events."""
+        self.tmp = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(self.tmp.name, 'asgi.db')}"
+        with mock.patch.multiple('config.TestingConfig', SQLALCHEMY_DATABASE_URI=url):
+            self.asgi = create_asgi_app('testing')
+        self.app = self.asgi.flask_app
+        self.app.config['CHECKIN_STREAM_POLL_INTERVAL'] = 0.05
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            events = [
+                Event(
+                    name=f"Event {i}",
+                    description="A test event",
+                    start_time=datetime.now() + timedelta(hours=i),
+                    end_time=datetime.now() + timedelta(hours=i + 2),
+                    location="Test Location",
+                    max_attendees=10,
+                    status="scheduled"
+                )
+                for i in range(2)
+            ]
+            db.session.add_all(events)
+            db.session.commit()
+            attendees = [
+                Attendee(first_name=f"User{i}", last_name="Test", email=f"user{i}@example.com", event_id=events[0].id)
+                for i in range(3)
+            ]
+            db.session.add_all(attendees)
+            db.session.commit()
+            self.event_id = events[0].id
+            self.attendee_ids = [attendee.id for attendee in attendees]
+
+    def tearDown(self):
+        """Tear down the test database."""
+        asyncio.run(self.asgi.engine.dispose())
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+        self.tmp.cleanup()
+
+    def scope(self, path, query=''):
+        return {
+            'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http', 'path': path, 'root_path': '',
+            'query_string': query.encode(), 'headers': [(b'host', b'localhost')], 'server': ('localhost', 80)
+        }
+
+    async def call(self, path, query='', headers=(), asgi=None):
+        """Send one GET through the ASGI app (or `asgi`) and return (status, headers, body)."""
+        scope = self.scope(path, query)
+        scope['headers'] += list(headers)
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await (asgi or self.asgi)(scope, receive, send)
+        start = messages[0]
+        body = b''.join(message.get('body', b'') for message in messages[1:])
+        headers = {key.decode().lower(): value.decode() for key, value in start['headers']}
+        return start['status'], headers, body
+
+    def get(self, path, query='', headers=(), asgi=None):
+        return asyncio.run(self.call(path, query, headers, asgi))
+
+    def assert_same_response(self, path, query=''):
+        status, headers, body = self.get(path, query)
+        response = self.client.get(f'{path}?{query}')
+        self.assertEqual(status, response.status_code)
+        self.assertEqual(json.loads(body), response.get_json())
+        self.assertEqual(headers.get('x-next-cursor'), response.headers.get('X-Next-Cursor'))
+        self.assertEqual(headers.get('link'), response.headers.get('Link'))
+
+    def test_async_routes_match_sync_routes(self):
+        """The async handlers return the same pages, cursors and errors as the Flask routes."""
+        self.assert_same_response('/events', 'limit=1')
+        self.assert_same_response('/events', 'fields=id,name&status=scheduled')
+        self.assert_same_response('/events', 'cursor=bogus')
+        self.assert_same_response('/events/stats', 'limit=1')
+        self.assert_same_response(f'/events/{self.event_id}/stats')
+        self.assert_same_response('/events/999/stats')
+        self.assert_same_response(f'/events/{self.event_id}/attendees', 'limit=2')
+        self.assert_same_response(f'/events/{self.event_id}/attendees', 'check_in_status=false')
+        self.assert_same_response('/events/999/attendees')
+
+    def test_other_requests_fall_through_to_flask(self):
+        """Exports and routes without an async handler are served by the Flask app."""
+        status, headers, body = self.get(f'/events/{self.event_id}/attendees', 'format=csv')
+        self.assertEqual(status, 200)
+        self.assertTrue(headers['content-type'].startswith('text/csv'))
+        self.assertEqual(len(body.decode().strip().splitlines()), 4)
+
+        status, _, body = self.get('/jobs/unknown')
+        self.assertEqual(status, 404)
+
+    def test_flask_requests_run_concurrently(self):
+        """Requests handed to the Flask app run on a thread pool instead of queueing on one thread."""
+        self.app.add_url_rule('/slow', 'slow', lambda: (time.sleep(0.3), "")[1])
+
+        async def run():
+            started = time.monotonic()
+            responses = await asyncio.gather(self.call('/slow'), self.call('/slow'))
+            return time.monotonic() - started, [status for status, _, _ in responses]
+
+        elapsed, statuses = asyncio.run(run())
+        self.assertEqual(statuses, [200, 200])
+        self.assertLess(elapsed, 0.55)
+
+    def test_stream_pushes_checkins(self):
+        """An async stream wakes on a check-in published by the Flask app and sends it."""
+        received = []
+
+        async def run():
+            scope = self.scope(f'/events/{self.event_id}/checkins/stream')
+            disconnect = asyncio.Event()
+
+            async def receive():
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                received.append(message)
+                if b'event: checkin' in message.get('body', b''):
+                    disconnect.set()
+
+            task = asyncio.ensure_future(self.asgi(scope, receive, send))
+            while not pubsub.subscriber_count(f'checkins:{self.event_id}'):
+                await asyncio.sleep(0.01)
+            response = await asyncio.to_thread(
+                self.client.patch, f'/events/{self.event_id}/attendees/{self.attendee_ids[1]}/checkin'
+            )
+            self.assertEqual(response.status_code, 200)
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(run())
+        self.assertEqual(received[0]['status'], 200)
+        body = b''.join(message.get('body', b'') for message in received[1:]).decode()
+        self.assertTrue(body.startswith('retry:'))
+        self.assertIn(f'"attendee_id": {self.attendee_ids[1]}', body)
+        self.assertEqual(pubsub.subscriber_count(f'checkins:{self.event_id}'), 0)
+
+    def test_reads_use_replicas(self):
+        """Async reads go to a replica unless the client has just written, and fall back if it fails."""
+        replica = os.path.join(self.tmp.name, 'replica.db')
+        with sqlite3.connect(os.path.join(self.tmp.name, 'asgi.db')) as source, sqlite3.connect(replica) as target:
+            source.backup(target)
+            target.execute("UPDATE event SET name = 'Replica Event'")
+        with mock.patch.multiple('config.TestingConfig', create=True,
+                                 SQLALCHEMY_DATABASE_URI=self.app.config['SQLALCHEMY_DATABASE_URI'],
+                                 SQLALCHEMY_REPLICA_URIS=[f'sqlite:///{replica}']):
+            asgi = create_asgi_app('testing')
+
+        def names(headers=()):
+            return {event["name"] for event in json.loads(self.get('/events', 'fields=name', headers, asgi)[2])}
+
+        try:
+            self.assertEqual(names(), {"Replica Event"})
+            sticky = f"{self.app.config['REPLICA_STICKY_COOKIE']}={time.time() + 5}".encode()
+            self.assertEqual(names([(b'cookie', sticky)]), {"Event 0", "Event 1"})
+
+            asyncio.run(asgi.replicas["engines"]['replica_0'].dispose())
+            os.remove(replica)
+            self.assertEqual(names(), {"Event 0", "Event 1"})
+            self.assertEqual(asgi.flask_app.extensions['replicas']["down_until"].keys(), {'replica_0'})
+        finally:
+            asyncio.run(asgi.engine.dispose())
+            for engine in asgi.replicas["engines"].values():
+                asyncio.run(engine.dispose())
+
+    def test_lifespan_recovers_jobs(self):
+        """Startup fails running jobs whose heartbeat stopped, but not ones a sibling worker is running."""
+        with self.app.app_context():
+            long_ago = datetime.utcnow() - timedelta(hours=1)
+            stale = Job(kind="bulk_checkin", status=JobStatus.running, started_at=long_ago, heartbeat_at=long_ago)
+            live = Job(kind="bulk_checkin", status=JobStatus.running, started_at=long_ago,
+                       heartbeat_at=datetime.utcnow())
+            db.session.add_all([stale, live])
+            db.session.commit()
+            stale_id, live_id = stale.id, live.id
+
+        async def lifespan():
+            messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+            sent = []
+
+            async def receive():
+                return next(messages)
+
+            async def send(message):
+                sent.append(message['type'])
+
+            await self.asgi({'type': 'lifespan'}, receive, send)
+            return sent
+
+        self.assertEqual(asyncio.run(lifespan()), ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Job, stale_id).status, JobStatus.failed)
+            self.assertEqual(db.session.get(Job, live_id).status, JobStatus.running)
+
+    def test_async_database_url(self):
+        """Sync database URLs map to the async driver for the same database."""
+        self.assertEqual(str(async_database_url('sqlite:////tmp/events.db')), 'sqlite+aiosqlite:////tmp/events.db')
+        self.assertEqual(str(async_database_url('postgresql+psycopg2://user@db/events')),
+                         'postgresql+asyncpg://user@db/events')
+        with self.assertRaises(ValueError):
+            async_database_url('sqlite:///:memory:')
+
+
+if __name__ == '__main__':
+    unittest.main()
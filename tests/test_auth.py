@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.models import User
+from app.security import hash_prefix
+
+
+class TestAuth(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with one registered user."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+        response = self.client.post('/auth/register', json={"username": "staff", "password": "secret"})
+        self.assertEqual(response.status_code, 201)
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def login(self, password="secret", username="staff", remote_addr="127.0.0.1"):
+        return self.client.post('/auth/login', json={"username": username, "password": password},
+                                environ_base={"REMOTE_ADDR": remote_addr})
+
+    def stored_hash(self):
+        with self.app.app_context():
+            return db.session.scalar(db.select(User.password).where(User.username == "staff"))
+
+    def test_login_and_refresh(self):
+        """Login issues access and refresh tokens; the refresh token yields a new access token."""
+        tokens = self.login().get_json()
+        self.assertIn("access_token", tokens)
+
+        response = self.client.post('/auth/refresh', headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access_token", response.get_json())
+
+        # An access token cannot be used to refresh
+        response = self.client.post('/auth/refresh', headers={"Authorization": f"Bearer {tokens['access_token']}"})
+        self.assertEqual(response.status_code, 422)
+
+    def test_configured_hash_method(self):
+        """Passwords are hashed with PASSWORD_HASH_METHOD."""
+        self.assertTrue(self.stored_hash().startswith(hash_prefix('pbkdf2:sha256:1000') + '$'))
+
+    def test_rehash_on_login(self):
+        """A hash made with outdated parameters is upgraded on the next successful login."""
+        self.app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:2000'
+        self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(self.stored_hash().startswith('pbkdf2:sha256:2000$'))
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_failed_logins_are_throttled(self):
+        """Repeated failures for a username are rejected with 429 and Retry-After."""
+        for _ in range(self.app.config['AUTH_MAX_FAILED_ATTEMPTS']):
+            self.assertEqual(self.login(password="wrong").status_code, 401)
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response.headers['Retry-After']), 0)
+
+        # The same username from another client, and other users behind the same address, still log in
+        self.assertEqual(self.login(remote_addr="10.0.0.2").status_code, 200)
+        self.client.post('/auth/register', json={"username": "colleague", "password": "secret"})
+        self.assertEqual(self.login(username="colleague").status_code, 200)
+
+    def test_failed_logins_are_throttled_per_address(self):
+        """An address failing across many usernames is throttled once it reaches the higher address limit."""
+        self.app.extensions['authenticator']["address_limiter"].max_failures = 3
+        for username in ("a", "b", "c"):
+            self.assertEqual(self.login(password="wrong", username=username).status_code, 401)
+        self.assertEqual(self.login().status_code, 429)
+        self.assertEqual(self.login(remote_addr="10.0.0.2").status_code, 200)
+
+    def test_proxy_fix_uses_forwarded_address(self):
+        """With PROXY_FIX_X_FOR set, failures are counted against the client named by X-Forwarded-For."""
+        with mock.patch.multiple('config.TestingConfig', create=True, PROXY_FIX_X_FOR=1):
+            app = create_app('testing')
+        client = app.test_client()
+        with app.app_context():
+            db.create_all()
+        client.post('/auth/register', json={"username": "staff", "password": "secret"})
+
+        def login(password, forwarded_for):
+            return client.post('/auth/login', json={"username": "staff", "password": password},
+                               headers={"X-Forwarded-For": forwarded_for})
+
+        for _ in range(app.config['AUTH_MAX_FAILED_ATTEMPTS']):
+            self.assertEqual(login("wrong", "203.0.113.7").status_code, 401)
+        self.assertEqual(login("secret", "203.0.113.7").status_code, 429)
+        self.assertEqual(login("secret", "198.51.100.4").status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import time
+import unittest
+from app import create_app, db
+from app.models import Event, Attendee
+from datetime import datetime, timedelta
+
+
+class TestBatchCheckin(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event and three attendees, one checked in."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=20000,
+                status="ongoing"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+
+            attendees = [
+                Attendee(
+                    first_name="User",
+                    last_name=str(i),
+                    email=f"User{i}@example.com",
+                    event_id=event.id,
+                    check_in_status=i == 2
+                )
+                for i in range(3)
+            ]
+            db.session.add_all(attendees)
+            db.session.commit()
+            self.attendee_ids = [attendee.id for attendee in attendees]
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_batch_checkin_results(self):
+        """Ids and emails resolve in one batch with a result for every item."""
+        url = f'/events/{self.event_id}/attendees/checkin:batch'
+        items = [self.attendee_ids[0], "user1@EXAMPLE.com", {"id": self.attendee_ids[2]},
+                 self.attendee_ids[0], "nobody@example.com", None]
+        response = self.client.post(url, json={"items": items})
+        self.assertEqual(response.status_code, 200)
+
+        body = response.get_json()
+        self.assertEqual([r["status"] for r in body["results"]], [
+            "checked_in", "checked_in", "already_checked_in",
+            "already_checked_in", "not_found", "invalid"
+        ])
+        self.assertEqual(body["summary"]["checked_in"], 2)
+
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Event, self.event_id).checked_in_count, 3)
+
+    def test_batch_checkin_validation(self):
+        """Empty batches and unknown events are rejected."""
+        self.assertEqual(self.client.post(f'/events/{self.event_id}/attendees/checkin:batch', json=[]).status_code, 400)
+        self.assertEqual(self.client.post('/events/999/attendees/checkin:batch', json=[1]).status_code, 404)
+
+        # A digit-like string int() rejects is looked up as an email; ids past 64 bits are invalid
+        response = self.client.post(f'/events/{self.event_id}/attendees/checkin:batch',
+                                    json=["\u00b2", str(2 ** 63), 2 ** 64, -1])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["status"] for r in response.get_json()["results"]],
+                         ["not_found", "invalid", "invalid", "invalid"])
+
+    def test_large_batch(self):
+        """A 10k item batch is applied in one request."""
+        with self.app.app_context():
+            db.session.execute(db.insert(Attendee), [
+                {"first_name": "Bulk", "last_name": str(i), "email": f"bulk{i}@example.com",
+                 "event_id": self.event_id, "check_in_status": False}
+                for i in range(10000)
+            ])
+            db.session.commit()
+
+        items = [f"bulk{i}@example.com" for i in range(10000)]
+        started = time.perf_counter()
+        response = self.client.post(f'/events/{self.event_id}/attendees/checkin:batch', json=items)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(response.get_json()["summary"]["checked_in"], 10000)
+        self.assertLess(elapsed, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from app import create_app, db, jobs
+from app.models import Event, Attendee, Job, JobStatus
+from datetime import datetime, timedelta
+
+
+class TestBulkCheckin(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event and one registered attendee."""
+        self.app = create_app('testing')
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['BULK_CHECKIN_CHUNK_SIZE'] = 2
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=10,
+                status="ongoing"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+
+            db.session.add(Attendee(
+                first_name="John",
+                last_name="Doe",
+                email="John.Doe@example.com",
+                phone_number="1234567890",
+                event_id=event.id
+            ))
+            db.session.commit()
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def upload(self, content, query=''):
+        data = {'file': (io.BytesIO(content.encode('utf-8')), 'attendees.csv')}
+        return self.client.post(
+            f'/events/{self.event_id}/attendees/bulk_checkin{query}',
+            data=data,
+            content_type='multipart/form-data'
+        )
+
+    def test_bulk_checkin_summary(self):
+        """Existing attendees are matched by email or phone and new ones are added."""
+        content = (
+            "first_name,last_name,email,phone_number\n"
+            "John,Doe,john.doe@EXAMPLE.com,\n"
+            "Jane,Smith,jane.smith@example.com,5550001111\n"
+            "Jane,Smith,jane.smith@example.com,5550001111\n"
+            "Johnny,Doe,other@example.com,1234567890\n"
+            "No,Email,,\n"
+        )
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 200)
+        summary = response.get_json()['summary']
+        self.assertEqual(summary, {
+            "rows": 5,
+            "checked_in": 1,
+            "already_checked_in": 2,
+            "added": 1,
+            "skipped": 1
+        })
+        self.assertNotIn('attendees', response.get_json())
+
+        with self.app.app_context():
+            attendees = Attendee.query.filter_by(event_id=self.event_id).all()
+            self.assertEqual(len(attendees), 2)
+            self.assertTrue(all(a.check_in_status for a in attendees))
+
+            event = db.session.get(Event, self.event_id)
+            self.assertEqual((event.registered_count, event.checked_in_count), (2, 2))
+
+    def test_bulk_checkin_paged_detail(self):
+        """Per-row detail is only returned for the requested window."""
+        content = "first_name,last_name,email,phone_number\n" + "".join(
+            f"User,{i},user{i}@example.com,\n" for i in range(5)
+        )
+        response = self.upload(content, '?detail=true&detail_offset=1&detail_limit=2')
+        self.assertEqual(response.status_code, 200)
+        detail = response.get_json()['attendees']
+        self.assertEqual([row['row'] for row in detail], [2, 3])
+        self.assertEqual(detail[0]['status'], "Added and Checked In")
+
+    def test_bulk_checkin_raw_csv_body(self):
+        """A raw text/csv request body is streamed without a multipart wrapper."""
+        response = self.client.post(
+            f'/events/{self.event_id}/attendees/bulk_checkin',
+            data="first_name,last_name,email,phone_number\nJohn,Doe,john.doe@example.com,\n",
+            content_type='text/csv'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['summary']['checked_in'], 1)
+
+    def test_bulk_checkin_attendee_of_another_event(self):
+        """Someone registered for another event is added to this one instead of failing the upload."""
+        with self.app.app_context():
+            other = Event(
+                name="Other Event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=10,
+                status="ongoing"
+            )
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+
+        response = self.client.post(
+            f'/events/{other_id}/attendees/bulk_checkin',
+            data="first_name,last_name,email,phone_number\nJohn,Doe,john.doe@example.com,\n",
+            content_type='text/csv'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['summary']['added'], 1)
+        with self.app.app_context():
+            self.assertEqual(Attendee.query.filter_by(email_normalized="john.doe@example.com").count(), 2)
+
+    def test_bulk_checkin_as_background_job(self):
+        """?async=true returns 202 with a job whose status reports the summary."""
+        with tempfile.TemporaryDirectory() as upload_dir:
+            self.app.config['JOB_UPLOAD_DIR'] = upload_dir
+            content = "first_name,last_name,email,phone_number\nJohn,Doe,john.doe@example.com,\nNew,Person,new@example.com,\n"
+            response = self.upload(content, '?async=true')
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(os.listdir(upload_dir), [])
+
+        job = self.client.get(response.headers['Location']).get_json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["progress"], 2)
+        self.assertEqual(job["result"]["summary"]["added"], 1)
+        self.assertEqual(job["result"]["summary"]["checked_in"], 1)
+
+    def test_jobs_recovered_after_restart(self):
+        """At startup, interrupted jobs fail and drop their uploads, and queued jobs run from their stored payload."""
+        content = "first_name,last_name,email,phone_number\nNew,Person,new@example.com,\n"
+        with tempfile.TemporaryDirectory() as upload_dir, self.app.app_context():
+            self.app.config['JOB_UPLOAD_DIR'] = upload_dir
+            paths = []
+            for name in ("interrupted.csv", "queued.csv"):
+                paths.append(os.path.join(upload_dir, name))
+                with open(paths[-1], 'w') as f:
+                    f.write(content)
+            interrupted = Job(kind="bulk_checkin", event_id=self.event_id, status=JobStatus.running,
+                              payload=json.dumps({"path": paths[0]}))
+            queued = Job(kind="bulk_checkin", event_id=self.event_id, payload=json.dumps({"path": paths[1]}))
+            db.session.add_all([interrupted, queued])
+            db.session.commit()
+
+            self.assertEqual(jobs.fail_interrupted(), 1)
+            self.assertEqual(jobs.resume_queued(), 1)
+            self.assertEqual(os.listdir(upload_dir), [])
+            db.session.expire_all()
+            self.assertEqual((interrupted.status, interrupted.error), (JobStatus.failed, "Interrupted by a server restart"))
+            self.assertEqual(queued.status, JobStatus.succeeded)
+            self.assertEqual(Attendee.query.filter_by(email_normalized="new@example.com").count(), 1)
+
+            # A job another process has already claimed is not run twice
+            jobs._run(self.app, queued.id, {"path": paths[1]})
+            db.session.expire_all()
+            self.assertEqual(queued.status, JobStatus.succeeded)
+
+    def test_bulk_checkin_validates_walk_ins(self):
+        """Walk-ins get the registration field checks; invalid ones are skipped with the reason."""
+        content = ("first_name,last_name,email,phone_number\n"
+                   "Long,Phone,long@example.com,1234567890123456789012\n"
+                   ",Nameless,nameless@example.com,\n"
+                   "Ok,Person,ok@example.com,\n")
+        response = self.upload(content, '?detail=true')
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual((body["summary"]["added"], body["summary"]["skipped"]), (1, 2))
+        self.assertEqual([row["status"] for row in body["attendees"]], [
+            "Skipped: phone_number is longer than 15 characters",
+            "Skipped: first_name, last_name and email are required",
+            "Added and Checked In"
+        ])
+
+    def test_unknown_job(self):
+        """Unknown job ids return 404."""
+        self.assertEqual(self.client.get('/jobs/unknown').status_code, 404)
+
+    def test_bulk_checkin_rejects_non_csv(self):
+        """Only .csv uploads are accepted."""
+        data = {'file': (io.BytesIO(b"data"), 'attendees.txt')}
+        response = self.client.post(
+            f'/events/{self.event_id}/attendees/bulk_checkin',
+            data=data,
+            content_type='multipart/form-data'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import io
+import json
+import unittest
+from app import create_app, db
+from app.models import Event, Attendee
+from sqlalchemy import event as sa_event
+from datetime import datetime, timedelta
+
+
+class TestBulkRegistration(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event limited to 5 attendees."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=5,
+                status="scheduled"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+        self.url = f'/events/{self.event_id}/attendees/bulk'
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def attendee(self, i, **overrides):
+        return {"first_name": "User", "last_name": str(i), "email": f"user{i}@example.com", **overrides}
+
+    def registered_count(self):
+        with self.app.app_context():
+            return db.session.get(Event, self.event_id).registered_count
+
+    def test_json_rejections_do_not_abort(self):
+        """Invalid, duplicate, already registered and over-capacity rows are rejected individually."""
+        self.client.post(f'/events/{self.event_id}/attendees', json=self.attendee(0))
+        rows = [
+            self.attendee(0),
+            self.attendee(1),
+            self.attendee(1, email="USER1@example.com"),
+            {"first_name": "No", "last_name": "Email"},
+            "not an object",
+            self.attendee(2, first_name="x" * 51),
+        ] + [self.attendee(i) for i in range(3, 9)]
+
+        response = self.client.post(self.url, json=rows)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["summary"], {"rows": 12, "registered": 4, "rejected": 8})
+        reasons = {item["row"]: item["reason"] for item in data["rejections"]}
+        self.assertEqual(reasons[1], "Attendee already registered")
+        self.assertEqual(reasons[3], "Duplicate email in upload")
+        self.assertEqual(reasons[4], "first_name, last_name and email are required")
+        self.assertEqual(reasons[6], "first_name is longer than 50 characters")
+        self.assertEqual([reasons[row] for row in (10, 11, 12)], ["Max attendees reached"] * 3)
+        self.assertEqual(self.registered_count(), 5)
+
+    def test_existing_attendees_skipped_on_conflict(self):
+        """With room for every row, existing registrations are skipped by the insert and their seats released."""
+        with self.app.app_context():
+            db.session.get(Event, self.event_id).max_attendees = 10
+            other = Event(
+                name="Other Event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=10,
+                status="scheduled"
+            )
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+        self.client.post(f'/events/{self.event_id}/attendees', json=self.attendee(0))
+        self.client.post(f'/events/{other_id}/attendees', json=self.attendee(1))
+
+        response = self.client.post(self.url, json=[self.attendee(0, email="USER0@example.com"), self.attendee(1)])
+        data = response.get_json()
+        self.assertEqual(data["summary"], {"rows": 2, "registered": 1, "rejected": 1})
+        self.assertEqual(data["rejections"], [{"row": 1, "email": "user0@example.com", "reason": "Attendee already registered"}])
+        self.assertEqual(self.registered_count(), 2)
+
+    def test_ndjson_and_csv(self):
+        """NDJSON bodies and CSV uploads are accepted."""
+        ndjson = "\n".join(json.dumps(self.attendee(i)) for i in range(2)) + "\n{broken\n"
+        response = self.client.post(self.url, data=ndjson, content_type='application/x-ndjson')
+        self.assertEqual(response.get_json()["summary"], {"rows": 3, "registered": 2, "rejected": 1})
+
+        csv_body = "first_name,last_name,email,phone_number\nA,B,a@example.com,555\n"
+        response = self.client.post(self.url, data={"file": (io.BytesIO(csv_body.encode()), "attendees.csv")},
+                                    content_type='multipart/form-data')
+        self.assertEqual(response.get_json()["summary"]["registered"], 1)
+        with self.app.app_context():
+            self.assertEqual(Attendee.query.filter_by(email="a@example.com").one().phone_number, "555")
+        self.assertEqual(self.registered_count(), 3)
+
+    def test_single_insert_statement(self):
+        """Accepted rows are written with one multi-row INSERT on SQLite."""
+        with self.app.app_context():
+            db.session.get(Event, self.event_id).max_attendees = 500
+            db.session.commit()
+            engine = db.engine
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        sa_event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.post(self.url, json=[self.attendee(i) for i in range(300)])
+        finally:
+            sa_event.remove(engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(response.get_json()["summary"]["registered"], 300)
+        inserts = [statement for statement in statements if statement.startswith('INSERT INTO attendee')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(self.registered_count(), 300)
+
+    def test_limits_and_errors(self):
+        """Oversized uploads, bad bodies and unknown events are rejected."""
+        self.app.config['BULK_REGISTRATION_MAX_ROWS'] = 2
+        response = self.client.post(self.url, json=[self.attendee(i) for i in range(3)])
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.registered_count(), 0)
+
+        self.assertEqual(self.client.post(self.url, json={"attendees": "nope"}).status_code, 400)
+        self.assertEqual(self.client.post('/events/999/attendees/bulk', json=[]).status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
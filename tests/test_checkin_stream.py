@@ -0,0 +1,111 @@
+import json
+import unittest
+from app import create_app, db, pubsub
+from app.models import Event, Attendee, CheckinLog
+from datetime import datetime, timedelta
+
+
+class TestCheckinStream(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event and three attendees."""
+        self.app = create_app('testing')
+        self.app.config['CHECKIN_STREAM_POLL_INTERVAL'] = 0.05
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=10,
+                status="scheduled"
+            )
+            db.session.add(event)
+            db.session.commit()
+            attendees = [
+                Attendee(first_name=f"User{i}", last_name="Test", email=f"user{i}@example.com", event_id=event.id)
+                for i in range(3)
+            ]
+            db.session.add_all(attendees)
+            db.session.commit()
+            self.event_id = event.id
+            self.attendee_ids = [attendee.id for attendee in attendees]
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def check_in(self, attendee_id):
+        response = self.client.patch(f'/events/{self.event_id}/attendees/{attendee_id}/checkin')
+        self.assertEqual(response.status_code, 200)
+
+    def open_stream(self, **headers):
+        response = self.client.get(f'/events/{self.event_id}/checkins/stream', headers=headers, buffered=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        chunks = iter(response.response)
+        self.assertTrue(next(chunks).startswith(b'retry:'))
+        return response, chunks
+
+    def next_checkin(self, chunks):
+        """Skip keep-alives and parse the next check-in message."""
+        for chunk in chunks:
+            if chunk.startswith(b':'):
+                continue
+            fields = dict(line.split(': ', 1) for line in chunk.decode().strip().split('\n'))
+            return int(fields["id"]), json.loads(fields["data"])
+
+    def test_checkins_are_logged_once(self):
+        """Single, repeated and bulk check-ins each add one log entry per attendee."""
+        self.check_in(self.attendee_ids[0])
+        self.client.patch(f'/events/{self.event_id}/attendees/{self.attendee_ids[0]}/checkin')
+        self.client.post(f'/events/{self.event_id}/attendees/checkin:batch',
+                         json=[self.attendee_ids[0], self.attendee_ids[1]])
+        csv_body = "first_name,last_name,email,phone_number\nNew,Person,new@example.com,\n"
+        self.client.post(f'/events/{self.event_id}/attendees/bulk_checkin', data=csv_body, content_type='text/csv')
+
+        with self.app.app_context():
+            logged = [entry.attendee_id for entry in CheckinLog.query.order_by(CheckinLog.id)]
+        self.assertEqual(logged[:2], self.attendee_ids[:2])
+        self.assertEqual(len(logged), 3)
+
+    def test_stream_pushes_new_checkins(self):
+        """A connected display receives check-ins made after it subscribed."""
+        self.check_in(self.attendee_ids[0])
+        response, chunks = self.open_stream()
+        self.assertEqual(pubsub.subscriber_count(f'checkins:{self.event_id}'), 1)
+
+        self.check_in(self.attendee_ids[1])
+        event_id, data = self.next_checkin(chunks)
+        self.assertEqual(data["attendee_id"], self.attendee_ids[1])
+        self.assertEqual(data["first_name"], "User1")
+
+        response.close()
+        self.assertEqual(pubsub.subscriber_count(f'checkins:{self.event_id}'), 0)
+
+    def test_resume_from_last_event_id(self):
+        """Reconnecting with Last-Event-ID replays only the check-ins after it."""
+        for attendee_id in self.attendee_ids:
+            self.check_in(attendee_id)
+        with self.app.app_context():
+            first_id = CheckinLog.query.filter_by(attendee_id=self.attendee_ids[0]).one().id
+
+        response, chunks = self.open_stream(**{"Last-Event-ID": str(first_id)})
+        replayed = [self.next_checkin(chunks)[1]["attendee_id"] for _ in range(2)]
+        response.close()
+        self.assertEqual(replayed, self.attendee_ids[1:])
+
+    def test_stream_errors(self):
+        """Unknown events and malformed Last-Event-ID headers are rejected."""
+        self.assertEqual(self.client.get('/events/999/checkins/stream').status_code, 404)
+        response = self.client.get(f'/events/{self.event_id}/checkins/stream', headers={"Last-Event-ID": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,7 @@ class TestCheckIns(unittest.TestCase):
         Set up the test environment, including an in-memory database,
         test client, and test data.
         """
-        self.app = create_app()
+        self.app = create_app('testing')
         self.app.config['TESTING'] = True
         self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
         self.client = self.app.test_client()
@@ -42,6 +42,8 @@ class TestCheckIns(unittest.TestCase):
             )
             db.session.add(self.attendee)
             db.session.commit()
+            self.event_id = self.event.id
+            self.attendee_id = self.attendee.id
 
     def tearDown(self):
         """
@@ -98,5 +100,51 @@ class TestCheckIns(unittest.TestCase):
             attendee = Attendee.query.get(attendee.id)
             self.assertTrue(attendee.check_in_status)
 
+    def test_checkin_endpoint(self):
+        """
+        Test that the check-in endpoint checks an attendee in exactly once.
+        """
+        url = f'/events/{self.event_id}/attendees/{self.attendee_id}/checkin'
+        response = self.client.patch(url)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.patch(url)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["message"], "Attendee is already checked in")
+
+        with self.app.app_context():
+            attendee = db.session.get(Attendee, self.attendee_id)
+            self.assertTrue(attendee.check_in_status)
+            self.assertIsNotNone(attendee.checked_in_at)
+            self.assertEqual(db.session.get(Event, self.event_id).checked_in_count, 1)
+
+    def test_checkin_not_found(self):
+        """
+        Test that unknown events and attendees return 404.
+        """
+        response = self.client.patch(f'/events/999/attendees/{self.attendee_id}/checkin')
+        self.assertEqual(response.get_json()["error"], "Event not found")
+        response = self.client.patch(f'/events/{self.event_id}/attendees/999/checkin')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json()["error"], "Attendee not found")
+
+    def test_checkin_idempotency_key(self):
+        """
+        Test that a retried check-in with the same Idempotency-Key replays the success.
+        """
+        url = f'/events/{self.event_id}/attendees/{self.attendee_id}/checkin'
+        headers = {'Idempotency-Key': 'scan-42'}
+        self.assertEqual(self.client.patch(url, headers=headers).status_code, 200)
+
+        retry = self.client.patch(url, headers=headers)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.get_json()["message"], "Attendee checked in successfully")
+
+        other = self.client.patch(f'/events/{self.event_id}/attendees/999/checkin', headers=headers)
+        self.assertEqual(other.status_code, 422)
+
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Event, self.event_id).checked_in_count, 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
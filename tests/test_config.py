@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import text
+from app import create_app, db
+from config import database_url, engine_options
+
+
+class TestConfig(unittest.TestCase):
+    def test_postgres_url_is_normalized(self):
+        """Legacy postgres:// URLs are mapped to the psycopg2 driver."""
+        with mock.patch.dict(os.environ, {'DATABASE_URL': 'postgres://user:pw@db/events'}):
+            self.assertEqual(database_url('sqlite://'), 'postgresql+psycopg2://user:pw@db/events')
+
+    def test_engine_options(self):
+        """Pooled databases get tuned pool options; in-memory SQLite gets none."""
+        self.assertEqual(engine_options('sqlite:///:memory:'), {})
+        options = engine_options('postgresql+psycopg2://db/events', pool_size=20)
+        self.assertEqual(options['pool_size'], 20)
+        self.assertTrue(options['pool_pre_ping'])
+
+    def test_sqlite_pragmas_applied_on_connect(self):
+        """File-backed SQLite connections run in WAL mode with a busy timeout."""
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'events.db')}"
+            with mock.patch('config.TestingConfig.SQLALCHEMY_DATABASE_URI', url):
+                app = create_app('testing')
+            with app.app_context():
+                self.assertEqual(db.session.execute(text("PRAGMA journal_mode")).scalar(), 'wal')
+                self.assertEqual(db.session.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
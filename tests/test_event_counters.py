@@ -0,0 +1,135 @@
+import unittest
+from app import create_app, db
+from app.commands import reconcile_event_counters
+from app.models import Event, Attendee
+from datetime import datetime, timedelta
+
+
+class TestEventCounters(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event limited to 2 attendees."""
+        self.app = create_app('testing')
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=2,
+                status="scheduled"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def register(self, email):
+        return self.client.post(f'/events/{self.event_id}/attendees', json={
+            "first_name": "Test",
+            "last_name": "User",
+            "email": email,
+            "phone_number": "1234567890"
+        })
+
+    def get_counters(self):
+        with self.app.app_context():
+            event = db.session.get(Event, self.event_id)
+            return event.registered_count, event.checked_in_count
+
+    def test_registration_updates_counter(self):
+        """Each registration reserves one seat until max_attendees is reached; later ones are waitlisted."""
+        self.assertEqual(self.register("a@example.com").status_code, 201)
+        self.assertEqual(self.register("a@example.com").status_code, 400)
+        self.assertEqual(self.register("b@example.com").status_code, 201)
+
+        response = self.register("c@example.com")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.get_json()["status"], "waitlisted")
+        self.assertEqual(self.get_counters(), (2, 0))
+
+        self.app.config['WAITLIST_ENABLED'] = False
+        response = self.register("d@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Max attendees reached")
+
+    def test_email_unique_per_event(self):
+        """The same person can register for several events, but only once per event, ignoring case."""
+        with self.app.app_context():
+            other = Event(
+                name="Other Event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=2,
+                status="scheduled"
+            )
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+
+        self.assertEqual(self.register("a@example.com").status_code, 201)
+        response = self.register("A@Example.com ")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Attendee already registered")
+        self.assertEqual(self.get_counters(), (1, 0))
+
+        response = self.client.post(f'/events/{other_id}/attendees', json={
+            "first_name": "Test",
+            "last_name": "User",
+            "email": "a@example.com"
+        })
+        self.assertEqual(response.status_code, 201)
+
+    def test_register_unknown_event(self):
+        """Registering for a missing event still returns 404."""
+        response = self.client.post('/events/999/attendees', json={
+            "first_name": "Test",
+            "last_name": "User",
+            "email": "x@example.com"
+        })
+        self.assertEqual(response.status_code, 404)
+
+    def test_orm_writes_update_counters(self):
+        """Attendees added and checked in through the ORM keep the counters in step."""
+        with self.app.app_context():
+            attendee = Attendee(
+                first_name="Test",
+                last_name="User",
+                email="orm@example.com",
+                event_id=self.event_id
+            )
+            db.session.add(attendee)
+            db.session.commit()
+            attendee.check_in_status = True
+            db.session.commit()
+        self.assertEqual(self.get_counters(), (1, 1))
+
+    def test_reconcile_counters(self):
+        """The reconciliation command rebuilds counters from the attendee and waitlist tables."""
+        self.register("a@example.com")
+        self.register("b@example.com")
+        self.register("c@example.com")
+        with self.app.app_context():
+            db.session.execute(db.update(Event).values(registered_count=5, checked_in_count=3, waitlisted_count=0))
+            db.session.commit()
+            reconcile_event_counters()
+            self.assertEqual(db.session.scalar(db.select(Event.waitlisted_count)), 1)
+        self.assertEqual(self.get_counters(), (2, 0))
+
+        result = self.app.test_cli_runner().invoke(args=['reconcile-counters'])
+        self.assertIn("Reconciled counters", result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
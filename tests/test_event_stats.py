@@ -0,0 +1,117 @@
+import unittest
+from app import create_app, db
+from app.models import Event, EventCheckinMinute, record_checkins
+from sqlalchemy import event as sa_event, select
+from datetime import datetime, timedelta
+
+
+class TestEventStats(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with two events."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            events = [
+                Event(
+                    name=f"Event {i}",
+                    description="A test event",
+                    start_time=datetime.now(),
+                    end_time=datetime.now() + timedelta(hours=2),
+                    location="Test Location",
+                    max_attendees=10,
+                    status="scheduled"
+                )
+                for i in range(2)
+            ]
+            db.session.add_all(events)
+            db.session.commit()
+            self.event_id = events[0].id
+            self.other_event_id = events[1].id
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def register(self, email):
+        response = self.client.post(f'/events/{self.event_id}/attendees', json={
+            "first_name": "Test",
+            "last_name": "User",
+            "email": email
+        })
+        self.assertEqual(response.status_code, 201)
+
+    def attendee_ids(self):
+        return [attendee["id"] for attendee in self.client.get(f'/events/{self.event_id}/attendees').get_json()]
+
+    def test_event_stats(self):
+        """Registrations and check-ins show up in the event's stats and check-in rate."""
+        for i in range(3):
+            self.register(f"user{i}@example.com")
+        for attendee_id in self.attendee_ids()[:2]:
+            self.client.patch(f'/events/{self.event_id}/attendees/{attendee_id}/checkin')
+
+        stats = self.client.get(f'/events/{self.event_id}/stats').get_json()
+        self.assertEqual(stats["registered"], 3)
+        self.assertEqual(stats["checked_in"], 2)
+        self.assertEqual(stats["capacity"], 10)
+        self.assertEqual(stats["capacity_remaining"], 7)
+        self.assertEqual(stats["checkin_rate_per_minute"], round(2 / 5, 2))
+
+        self.assertEqual(self.client.get('/events/999/stats').status_code, 404)
+
+    def test_bulk_checkin_updates_stats(self):
+        """Rows added by a bulk check-in count as registered and checked in."""
+        csv_body = "first_name,last_name,email,phone_number\nA,B,a@example.com,\nC,D,c@example.com,\n"
+        response = self.client.post(f'/events/{self.event_id}/attendees/bulk_checkin',
+                                    data=csv_body, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+
+        stats = self.client.get(f'/events/{self.event_id}/stats').get_json()
+        self.assertEqual((stats["registered"], stats["checked_in"]), (2, 2))
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(select(EventCheckinMinute.checkins)), 2)
+
+    def test_rate_window(self):
+        """Check-ins older than the rate window do not count towards the rate."""
+        with self.app.app_context():
+            connection = db.session.connection()
+            record_checkins(connection, self.event_id, 50, at=datetime.utcnow() - timedelta(minutes=30))
+            record_checkins(connection, self.event_id, 5)
+            record_checkins(connection, self.event_id, 5)
+            db.session.commit()
+            self.assertEqual(db.session.query(EventCheckinMinute).count(), 2)
+
+        stats = self.client.get(f'/events/{self.event_id}/stats').get_json()
+        self.assertEqual(stats["checkin_rate_per_minute"], 2.0)
+
+    def test_list_stats_is_constant_queries(self):
+        """The stats listing runs the same number of queries however many attendees exist."""
+        for i in range(5):
+            self.register(f"user{i}@example.com")
+
+        statements = []
+        with self.app.app_context():
+            engine = db.engine
+        listener = lambda *args: statements.append(args[2])
+        sa_event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.get('/events/stats?limit=1')
+        finally:
+            sa_event.remove(engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 1)
+        self.assertEqual(response.get_json()[0]["registered"], 5)
+        self.assertEqual(len(statements), 2)
+        self.assertNotIn("count(", " ".join(statements).lower())
+
+        next_page = self.client.get(f"/events/stats?cursor={response.headers['X-Next-Cursor']}").get_json()
+        self.assertEqual([item["event_id"] for item in next_page], [self.other_event_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
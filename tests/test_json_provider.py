@@ -0,0 +1,58 @@
+import json
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.serialization import OrjsonProvider
+from flask.json.provider import DefaultJSONProvider
+from datetime import datetime
+
+
+class TestJsonProvider(unittest.TestCase):
+    def setUp(self):
+        """Set up an empty test database and a payload with the types responses contain."""
+        self.app = create_app('testing')
+        with self.app.app_context():
+            db.create_all()
+        self.payload = [
+            {"id": 2**40, "name": "Zoë", "when": datetime(2026, 1, 2, 3, 4, 5), "checked_in": True, "phone": None},
+            {"id": 2, "name": "Event", "when": datetime(2026, 1, 2), "checked_in": False, "phone": "555"},
+        ]
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_orjson_provider_selected(self):
+        """orjson is used when installed, and JSON_PROVIDER=stdlib switches back to Flask's provider."""
+        self.assertIsInstance(self.app.json, OrjsonProvider)
+        with mock.patch.multiple('config.TestingConfig', create=True, JSON_PROVIDER='stdlib'):
+            app = create_app('testing')
+        self.assertIs(type(app.json), DefaultJSONProvider)
+
+    def test_same_output_as_stdlib(self):
+        """Responses parse to the same values as with the standard library provider."""
+        stdlib = DefaultJSONProvider(self.app)
+        with self.app.app_context():
+            body = self.app.json.response(self.payload).get_data()
+            expected = stdlib.response(self.payload).get_data()
+        self.assertEqual(json.loads(body), json.loads(expected))
+        self.assertTrue(body.endswith(b'\n'))
+        self.assertEqual(self.app.json.loads(self.app.json.dumps(self.payload, indent=2)), json.loads(expected))
+
+    def test_falls_back_for_unsupported_values(self):
+        """Values orjson rejects are encoded by the standard library."""
+        self.assertEqual(json.loads(self.app.json.dumps({"big": 2**70})), {"big": 2**70})
+        with self.assertRaises(TypeError):
+            self.app.json.dumps({"value": object()})
+
+    def test_list_responses(self):
+        """List endpoints are served through the configured provider."""
+        response = self.app.test_client().get('/events')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import unittest
+from app import create_app, db
+from app.models import Event, Attendee
+from datetime import datetime, timedelta
+
+
+class TestListAttendees(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event and five attendees, two checked in."""
+        self.app = create_app('testing')
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['EXPORT_BATCH_SIZE'] = 2
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=10,
+                status="ongoing"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+
+            db.session.add_all([
+                Attendee(
+                    first_name="User",
+                    last_name=str(i),
+                    email=f"user{i}@example.com",
+                    event_id=event.id,
+                    check_in_status=i < 2
+                )
+                for i in range(5)
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_keyset_pagination(self):
+        """Pages are ordered by id and the cursor walks every attendee once."""
+        emails, url = [], f'/events/{self.event_id}/attendees?limit=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            emails.extend(attendee["email"] for attendee in response.get_json())
+            cursor = response.headers.get('X-Next-Cursor')
+            url = f'/events/{self.event_id}/attendees?limit=2&cursor={cursor}' if cursor else None
+        self.assertEqual(emails, [f"user{i}@example.com" for i in range(5)])
+
+    def test_check_in_filter(self):
+        """The check_in_status filter still applies."""
+        response = self.client.get(f'/events/{self.event_id}/attendees?check_in_status=true')
+        self.assertEqual(len(response.get_json()), 2)
+        self.assertTrue(all(attendee["check_in_status"] for attendee in response.get_json()))
+
+    def test_ndjson_export(self):
+        """The NDJSON export streams one attendee per line."""
+        response = self.client.get(f'/events/{self.event_id}/attendees?format=ndjson&check_in_status=false')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([line["last_name"] for line in lines], ["2", "3", "4"])
+
+    def test_csv_export(self):
+        """The CSV export has a header row followed by every attendee."""
+        response = self.client.get(f'/events/{self.event_id}/attendees?format=csv')
+        self.assertEqual(response.mimetype, 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["email"], "user0@example.com")
+
+    def test_invalid_format(self):
+        """Unknown export formats are rejected."""
+        response = self.client.get(f'/events/{self.event_id}/attendees?format=xml')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from app import create_app, db
+from app.models import Event, EventStatus
+from datetime import datetime, timedelta
+
+
+class TestListEvents(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with events spread over several days."""
+        self.app = create_app('testing')
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.client = self.app.test_client()
+        self.base = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+
+        with self.app.app_context():
+            db.create_all()
+            for i in range(5):
+                db.session.add(Event(
+                    name=f"Event {i}",
+                    description="A test event",
+                    start_time=self.base + timedelta(days=i // 2),
+                    end_time=self.base + timedelta(days=i // 2, hours=2),
+                    location="Hall A" if i % 2 else "Hall B",
+                    max_attendees=10,
+                    status=EventStatus.canceled if i == 4 else EventStatus.scheduled
+                ))
+            db.session.commit()
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_keyset_pagination(self):
+        """Pages follow (start_time, id) order and the cursor walks every event once."""
+        names, url = [], '/events?limit=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page), 2)
+            names.extend(event["name"] for event in page)
+            cursor = response.headers.get('X-Next-Cursor')
+            url = f'/events?limit=2&cursor={cursor}' if cursor else None
+        self.assertEqual(names, [f"Event {i}" for i in range(5)])
+
+    def test_filters(self):
+        """Status, location and time-window filters narrow the result."""
+        response = self.client.get('/events?location=Hall A')
+        self.assertEqual([e["name"] for e in response.get_json()], ["Event 1", "Event 3"])
+
+        response = self.client.get('/events?status=canceled')
+        self.assertEqual([e["name"] for e in response.get_json()], ["Event 4"])
+
+        window = f"from={(self.base + timedelta(days=1)).isoformat()}&to={(self.base + timedelta(days=2)).isoformat()}"
+        response = self.client.get(f'/events?{window}')
+        self.assertEqual([e["name"] for e in response.get_json()], ["Event 2", "Event 3"])
+
+    def test_field_projection(self):
+        """Only the requested fields are returned."""
+        response = self.client.get('/events?fields=id,start_time&limit=1')
+        event = response.get_json()[0]
+        self.assertEqual(set(event), {"id", "start_time"})
+        self.assertEqual(event["start_time"], self.base.isoformat())
+
+    def test_invalid_parameters(self):
+        """Unknown fields, statuses and cursors are rejected."""
+        self.assertEqual(self.client.get('/events?fields=secret').status_code, 400)
+        self.assertEqual(self.client.get('/events?status=unknown').status_code, 400)
+        self.assertEqual(self.client.get('/events?cursor=garbage').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.models import Event, Attendee
+from datetime import datetime, timedelta
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        """Set up an instrumented app with an event and a few attendees."""
+        with mock.patch.multiple('config.TestingConfig', create=True, METRICS_ENABLED=True,
+                                 METRICS_SERVER_TIMING=True, METRICS_N_PLUS_ONE_THRESHOLD=3):
+            self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=10,
+                status="ongoing"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+            db.session.add_all([
+                Attendee(first_name="User", last_name=str(i), email=f"user{i}@example.com", event_id=event.id)
+                for i in range(3)
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_metrics_endpoint(self):
+        """Route latency and query counts are exposed in the Prometheus text format."""
+        self.client.get(f'/events/{self.event_id}/attendees')
+        body = self.client.get('/metrics').get_data(as_text=True)
+        labels = 'route="/events/<int:event_id>/attendees",method="GET"'
+        self.assertIn(f'http_request_duration_seconds_count{{{labels}}} 1', body)
+        self.assertIn(f'http_requests_total{{{labels},status="200"}} 1', body)
+        self.assertIn(f'db_queries_total{{{labels}}} 2', body)
+
+    def test_server_timing_header(self):
+        """Responses carry a Server-Timing header with the query count."""
+        response = self.client.get('/events')
+        self.assertIn('desc="1 queries"', response.headers['Server-Timing'])
+
+    def test_n_plus_one_detection(self):
+        """A request repeating one statement past the threshold is counted."""
+        @self.app.route('/n-plus-one')
+        def n_plus_one():
+            for attendee_id in range(1, 4):
+                db.session.get(Attendee, attendee_id)
+            return 'ok'
+
+        self.client.get('/n-plus-one')
+        self.client.get(f'/events/{self.event_id}/attendees')
+        body = self.client.get('/metrics').get_data(as_text=True)
+        self.assertIn('db_n_plus_one_requests_total{route="/n-plus-one",method="GET"} 1', body)
+        self.assertNotIn('db_n_plus_one_requests_total{route="/events/<int:event_id>/attendees"', body)
+
+    def test_metrics_access(self):
+        """/metrics is limited to loopback clients, or to holders of METRICS_TOKEN when one is set."""
+        self.assertEqual(self.client.get('/metrics', environ_base={"REMOTE_ADDR": "10.0.0.5"}).status_code, 403)
+
+        self.app.config['METRICS_TOKEN'] = 'scrape-secret'
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', headers={"Authorization": "Bearer scrape-secret"},
+                                   environ_base={"REMOTE_ADDR": "10.0.0.5"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_disabled_by_default(self):
+        """Without METRICS_ENABLED there is no /metrics route and no header."""
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+        response = app.test_client().get('/events')
+        self.assertNotIn('Server-Timing', response.headers)
+        self.assertEqual(app.test_client().get('/metrics').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import upgrade
+from app import create_app, db
+from app.models import ArchivedEvent, Event, Attendee
+from app.search import include_object
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event as sa_event
+from datetime import datetime, timedelta
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+# A plan line that reads a whole table without an index
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event and a few attendees."""
+        with mock.patch.multiple('config.TestingConfig', create=True, CACHE_BACKEND='null'):
+            self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Test Event",
+                description="A test event",
+                start_time=datetime.now(),
+                end_time=datetime.now() + timedelta(hours=2),
+                location="Test Location",
+                max_attendees=100,
+                status="scheduled"
+            )
+            db.session.add(event)
+            db.session.commit()
+            attendees = [
+                Attendee(first_name="User", last_name=str(i), email=f"user{i}@example.com",
+                         phone_number=f"555{i}", event_id=event.id)
+                for i in range(5)
+            ]
+            db.session.add_all(attendees)
+            db.session.commit()
+            self.event_id = event.id
+            self.attendee_ids = [attendee.id for attendee in attendees]
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def capture(self, method, url, **kwargs):
+        """Run a request and return the (statement, parameters) it executed."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if not executemany:
+                statements.append((statement, parameters))
+
+        with self.app.app_context():
+            engine = db.engine
+        sa_event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = getattr(self.client, method)(url, **kwargs)
+        finally:
+            sa_event.remove(engine, 'before_cursor_execute', record)
+        self.assertLess(response.status_code, 300, f"{method.upper()} {url} returned {response.status_code}")
+        return statements
+
+    def assert_indexed(self, method, url, **kwargs):
+        """Every statement a route runs must reach its rows through an index or the primary key."""
+        statements = self.capture(method, url, **kwargs)
+        with self.app.app_context():
+            connection = db.session.connection()
+            for statement, parameters in statements:
+                if not statement.lstrip().startswith(('SELECT', 'UPDATE', 'DELETE', 'INSERT')):
+                    continue
+                plan = [row[3] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+                for line in plan:
+                    scan = FULL_SCAN.match(line)
+                    if not scan:
+                        continue
+                    # Keyset pages walk the primary key in order and stop at the limit
+                    if f'ORDER BY {scan.group(1)}.id' in statement and 'LIMIT' in statement:
+                        continue
+                    self.fail(f"{method.upper()} {url} scans {scan.group(1)}: {statement} -> {plan}")
+
+    def test_event_routes_use_indexes(self):
+        """Event listings, filters and stats are served from indexes."""
+        self.assert_indexed('get', '/events')
+        self.assert_indexed('get', '/events?status=ongoing')
+        self.assert_indexed('get', '/events?status=scheduled')
+        self.assert_indexed('get', '/events?location=Test%20Location')
+        self.assert_indexed('get', '/events?include_archived=true&location=Test%20Location')
+        self.assert_indexed('get', '/events/stats')
+        self.assert_indexed('get', f'/events/{self.event_id}/stats')
+        self.assert_indexed('get', '/events/search?q=test%20loc')
+        self.assert_indexed('get', '/locations/Test%20Location/schedule')
+        with self.app.app_context():
+            headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+        self.assert_indexed('post', '/events', headers=headers, json={
+            "name": "New Event", "start_time": "2030-01-01T10:00:00", "end_time": "2030-01-01T12:00:00",
+            "location": "Test Location", "max_attendees": 10
+        })
+
+    def test_attendee_routes_use_indexes(self):
+        """Attendee listing, registration and every check-in path are served from indexes."""
+        self.assert_indexed('get', f'/events/{self.event_id}/attendees')
+        self.assert_indexed('get', f'/events/{self.event_id}/attendees?check_in_status=true')
+        with self.app.app_context():
+            db.session.add(ArchivedEvent(id=999999, name="Old Event", start_time=datetime(2020, 1, 1),
+                                         end_time=datetime(2020, 1, 2), location="Test Location",
+                                         max_attendees=10, status="completed"))
+            db.session.commit()
+        self.assert_indexed('get', '/events/999999/attendees?include_archived=true&check_in_status=true')
+        self.assert_indexed('get', f'/events/{self.event_id}/attendees/search?q=user3')
+        self.assert_indexed('post', f'/events/{self.event_id}/attendees',
+                            json={"first_name": "New", "last_name": "User", "email": "new@example.com"})
+        self.assert_indexed('post', f'/events/{self.event_id}/attendees/bulk',
+                            json=[{"first_name": "Bulk", "last_name": "User", "email": "bulk@example.com"}])
+        self.assert_indexed('patch', f'/events/{self.event_id}/attendees/{self.attendee_ids[0]}/checkin')
+        self.assert_indexed('post', f'/events/{self.event_id}/attendees/checkin:batch',
+                            json=[self.attendee_ids[1], "USER2@example.com"])
+        self.assert_indexed('post', f'/events/{self.event_id}/attendees/bulk_checkin',
+                            data="first_name,last_name,email,phone_number\nA,B,user3@example.com,\nC,D,,5554\n",
+                            content_type='text/csv')
+
+        # Registrations for a full event join the waitlist, and raising capacity promotes it
+        with self.app.app_context():
+            db.session.get(Event, self.event_id).max_attendees = 0
+            db.session.commit()
+            headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+        self.assert_indexed('post', f'/events/{self.event_id}/attendees',
+                            json={"first_name": "Wait", "last_name": "User", "email": "wait@example.com"})
+        self.assert_indexed('put', f'/events/{self.event_id}', headers=headers, json={"max_attendees": 100})
+
+
+class TestMigrations(unittest.TestCase):
+    def test_migrations_match_models(self):
+        """Upgrading an empty database through every migration yields the models' schema."""
+        with tempfile.TemporaryDirectory() as directory:
+            url = 'sqlite:///' + os.path.join(directory, 'migrated.db')
+            with mock.patch.multiple('config.TestingConfig', create=True, SQLALCHEMY_DATABASE_URI=url):
+                app = create_app('testing')
+            with app.app_context():
+                with mock.patch('logging.config.fileConfig'):
+                    upgrade(directory=MIGRATIONS_DIR)
+                with db.engine.connect() as connection:
+                    context = MigrationContext.configure(connection, opts={"include_object": include_object})
+                    diff = compare_metadata(context, db.metadata)
+                db.engine.dispose()
+        self.assertEqual(diff, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 class TestRegistrationLimits(unittest.TestCase):
     def setUp(self):
         """Set up the test database and test client."""
-        self.app = create_app()
+        self.app = create_app('testing')
         self.app.config['TESTING'] = True
         self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
         self.client = self.app.test_client()
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.cache import LRUCacheBackend
+from app.database import app_engines
+from app.models import Event, Attendee
+from flask_jwt_extended import create_access_token
+from datetime import datetime, timedelta
+
+
+class TestReadReplicas(unittest.TestCase):
+    def setUp(self):
+        """Set up a primary file database with one event, and a copy of it as the stand-in replica."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.primary = os.path.join(self.tmp.name, 'primary.db')
+        self.replica = os.path.join(self.tmp.name, 'replica.db')
+        with mock.patch.multiple('config.TestingConfig', create=True, CACHE_BACKEND='null',
+                                 SQLALCHEMY_DATABASE_URI=f'sqlite:///{self.primary}',
+                                 SQLALCHEMY_REPLICA_URIS=[f'sqlite:///{self.replica}']):
+            self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Primary Event",
+                start_time=datetime.now() + timedelta(days=1),
+                end_time=datetime.now() + timedelta(days=1, hours=2),
+                location="Test Location",
+                max_attendees=10,
+                status="scheduled"
+            )
+            db.session.add(event)
+            db.session.commit()
+            db.session.add(Attendee(first_name="Ada", last_name="Test", email="ada@example.com", event_id=event.id))
+            db.session.commit()
+            self.event_id = event.id
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+        self.copy_to_replica()
+
+    def tearDown(self):
+        """Tear down the test databases."""
+        with self.app.app_context():
+            db.session.remove()
+            for engine in app_engines(self.app, db):
+                engine.dispose()
+        self.tmp.cleanup()
+
+    def copy_to_replica(self, **changes):
+        """Snapshot the primary into the replica file, then apply `changes` to the replica's event."""
+        with sqlite3.connect(self.primary) as source, sqlite3.connect(self.replica) as target:
+            source.backup(target)
+            for column, value in changes.items():
+                target.execute(f"UPDATE event SET {column} = ?", (value,))
+
+    def event_names(self):
+        return [event["name"] for event in self.client.get('/events?fields=name').get_json()]
+
+    def test_reads_use_replica(self):
+        """Read-only routes are served from the replica; other routes and writes use the primary."""
+        self.copy_to_replica(name="Replica Event")
+        self.assertEqual(self.event_names(), ["Replica Event"])
+        response = self.client.get(f'/events/{self.event_id}/attendees')
+        self.assertEqual([attendee["email"] for attendee in response.get_json()], ["ada@example.com"])
+
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(db.select(Event.name)), "Primary Event")
+
+    def test_reads_follow_writes_to_primary(self):
+        """After a write, the same client reads from the primary until the sticky window ends."""
+        self.copy_to_replica(name="Replica Event")
+        response = self.client.put(f'/events/{self.event_id}', headers=self.headers, json={"name": "Renamed"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.event_names(), ["Renamed"])
+
+        self.client.delete_cookie(self.app.config['REPLICA_STICKY_COOKIE'])
+        self.assertEqual(self.event_names(), ["Replica Event"])
+
+    def test_replica_reads_are_not_cached(self):
+        """With the response cache on, a lagging replica's page is never served to a client that has just written."""
+        self.app.extensions['response_cache'] = LRUCacheBackend()
+        writer, other = self.client, self.app.test_client()
+        response = writer.put(f'/events/{self.event_id}', headers=self.headers, json={"name": "Renamed"})
+        self.assertEqual(response.status_code, 200)
+
+        # The replica has not caught up yet
+        self.assertEqual([event["name"] for event in other.get('/events?fields=name').get_json()], ["Primary Event"])
+        self.assertEqual(self.event_names(), ["Renamed"])
+
+        self.copy_to_replica()
+        self.assertEqual([event["name"] for event in other.get('/events?fields=name').get_json()], ["Renamed"])
+
+    def test_failed_replica_falls_back_to_primary(self):
+        """A replica that errors is skipped and its reads are served by the primary."""
+        os.remove(self.replica)
+        self.assertEqual(self.event_names(), ["Primary Event"])
+        self.assertEqual(self.app.extensions['replicas']["down_until"].keys(), {'replica_0'})
+
+        # Once the retry interval passes the replica is used again
+        self.copy_to_replica(name="Replica Event")
+        self.assertEqual(self.event_names(), ["Primary Event"])
+        self.app.extensions['replicas']["down_until"]['replica_0'] = 0
+        self.assertEqual(self.event_names(), ["Replica Event"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.cache import LRUCacheBackend
+from app.models import Event, Attendee
+from datetime import datetime, timedelta
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with two events."""
+        self.app = create_app('testing')
+        self.app.config['TESTING'] = True
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            events = [
+                Event(
+                    name=f"Event {i}",
+                    description="A test event",
+                    start_time=datetime.now(),
+                    end_time=datetime.now() + timedelta(hours=2),
+                    location="Test Location",
+                    max_attendees=10,
+                    status="scheduled"
+                )
+                for i in range(2)
+            ]
+            db.session.add_all(events)
+            db.session.commit()
+            self.event_ids = [event.id for event in events]
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def add_attendee_directly(self, event_id, email):
+        """Write behind the API's back so only a cache miss would show the row."""
+        with self.app.app_context():
+            db.session.add(Attendee(first_name="Test", last_name="User", email=email, event_id=event_id))
+            db.session.commit()
+
+    def test_cached_response_and_etag(self):
+        """Repeated reads are served from the cache and honour If-None-Match."""
+        url = f'/events/{self.event_ids[0]}/attendees'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNotNone(first.headers.get('ETag'))
+
+        self.add_attendee_directly(self.event_ids[0], "hidden@example.com")
+        self.assertEqual(self.client.get(url).get_json(), [])
+
+        response = self.client.get(url, headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_invalidate_only_the_affected_event(self):
+        """Registering for one event leaves the other event's cached listing in place."""
+        urls = [f'/events/{event_id}/attendees' for event_id in self.event_ids]
+        for url in urls:
+            self.client.get(url)
+
+        self.add_attendee_directly(self.event_ids[1], "hidden@example.com")
+        self.client.post(urls[0], json={
+            "first_name": "Test",
+            "last_name": "User",
+            "email": "new@example.com"
+        })
+
+        self.assertEqual(len(self.client.get(urls[0]).get_json()), 1)
+        self.assertEqual(self.client.get(urls[1]).get_json(), [])
+
+    def test_lru_backend_eviction_and_ttl(self):
+        """The LRU backend evicts the least recently used entry and expires old ones."""
+        backend = LRUCacheBackend(max_entries=2)
+        backend.set('a', 1, ttl=60)
+        backend.set('b', 2, ttl=60)
+        backend.get('a')
+        backend.set('c', 3, ttl=60)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a'), 1)
+
+        with mock.patch('app.cache.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(backend.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from app import create_app, db
+from app.models import Event
+from flask_jwt_extended import create_access_token
+from datetime import datetime, timedelta
+
+START = datetime(2030, 5, 1, 9, 0)
+
+
+class TestSchedule(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with one booking of Main Hall from 10:00 to 12:00."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Keynote",
+                start_time=START + timedelta(hours=1),
+                end_time=START + timedelta(hours=3),
+                location="Main Hall",
+                max_attendees=10,
+                status="scheduled"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create(self, start_hours, end_hours, location="Main Hall", name="Talk"):
+        return self.client.post('/events', headers=self.headers, json={
+            "name": name,
+            "start_time": (START + timedelta(hours=start_hours)).isoformat(),
+            "end_time": (START + timedelta(hours=end_hours)).isoformat(),
+            "location": location,
+            "max_attendees": 10
+        })
+
+    def event_count(self):
+        with self.app.app_context():
+            return db.session.scalar(db.select(db.func.count(Event.id)))
+
+    def test_overlapping_booking_rejected(self):
+        """Overlapping bookings of a location get 409 with the conflicting events; touching ones do not."""
+        response = self.create(2, 4)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([event["id"] for event in response.get_json()["conflicts"]], [self.event_id])
+        self.assertEqual(self.create(0, 5).status_code, 409)
+        self.assertEqual(self.event_count(), 1)
+
+        self.assertEqual(self.create(0, 1).status_code, 201)
+        self.assertEqual(self.create(3, 4).status_code, 201)
+        self.assertEqual(self.create(2, 4, location="Room 101").status_code, 201)
+        self.assertEqual(self.event_count(), 4)
+
+    def test_update_checked(self):
+        """Moving an event onto another booking is rejected; canceled events free their slot."""
+        self.assertEqual(self.create(3, 4).status_code, 201)
+        with self.app.app_context():
+            other_id = db.session.scalar(db.select(Event.id).where(Event.id != self.event_id))
+
+        response = self.client.put(f'/events/{other_id}', headers=self.headers,
+                                   json={"start_time": (START + timedelta(hours=2)).isoformat()})
+        self.assertEqual(response.status_code, 409)
+        response = self.client.put(f'/events/{other_id}', headers=self.headers, json={"name": "Renamed"})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.put(f'/events/{self.event_id}', headers=self.headers, json={"status": "canceled"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.put(f'/events/{other_id}', headers=self.headers,
+                                   json={"start_time": (START + timedelta(hours=2)).isoformat()})
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_window(self):
+        """Events must end after they start and last at most SCHEDULE_MAX_EVENT_DAYS."""
+        self.assertEqual(self.create(5, 5).status_code, 400)
+        self.assertEqual(self.create(5, 24 * 31 + 5).status_code, 400)
+
+    def test_warn_and_off_policies(self):
+        """'warn' saves the booking and lists the conflicts; 'off' skips the check."""
+        self.app.config['SCHEDULE_CONFLICT_POLICY'] = 'warn'
+        response = self.create(2, 4)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([event["id"] for event in response.get_json()["conflicts"]], [self.event_id])
+
+        self.app.config['SCHEDULE_CONFLICT_POLICY'] = 'off'
+        response = self.create(2, 4)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("conflicts", response.get_json())
+
+    def test_location_schedule(self):
+        """The schedule lists the bookings overlapping the window, paged in start order."""
+        self.assertEqual(self.create(3, 4, name="Lunch").status_code, 201)
+        self.assertEqual(self.create(30, 31, name="Day two").status_code, 201)
+
+        response = self.client.get('/locations/Main Hall/schedule', query_string={
+            "from": (START + timedelta(hours=2)).isoformat(), "to": (START + timedelta(hours=24)).isoformat()
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event["name"] for event in response.get_json()], ["Keynote", "Lunch"])
+
+        response = self.client.get('/locations/Main Hall/schedule', query_string={
+            "from": START.isoformat(), "to": (START + timedelta(days=2)).isoformat(), "limit": 2
+        })
+        self.assertEqual(len(response.get_json()), 2)
+        response = self.client.get('/locations/Main Hall/schedule', query_string={
+            "from": START.isoformat(), "to": (START + timedelta(days=2)).isoformat(),
+            "cursor": response.headers["X-Next-Cursor"]
+        })
+        self.assertEqual([event["name"] for event in response.get_json()], ["Day two"])
+
+        self.assertEqual(self.client.get('/locations/Main Hall/schedule?from=soon').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from app import create_app, db
+from app.models import Event, Attendee
+from datetime import datetime, timedelta
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with two events and a few attendees."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            events = [
+                Event(
+                    name=name,
+                    description=description,
+                    start_time=datetime.now(),
+                    end_time=datetime.now() + timedelta(hours=2),
+                    location=location,
+                    max_attendees=10,
+                    status="scheduled"
+                )
+                for name, description, location in [
+                    ("PyCon Keynote", "Opening keynote", "Main Hall"),
+                    ("Rust Workshop", "Hands-on systems programming", "Room 101"),
+                ]
+            ]
+            db.session.add_all(events)
+            db.session.commit()
+            attendees = [
+                Attendee(first_name="Alice", last_name="Smith", email="alice@example.com",
+                         phone_number="5551234", event_id=events[0].id),
+                Attendee(first_name="Alicia", last_name="Jones", email="aj@example.org", event_id=events[0].id),
+                Attendee(first_name="Bob", last_name="Smithers", email="bob@example.com", event_id=events[0].id),
+                Attendee(first_name="Alice", last_name="Other", email="alice@other.com", event_id=events[1].id),
+            ]
+            db.session.add_all(attendees)
+            db.session.commit()
+            self.event_id = events[0].id
+            self.other_event_id = events[1].id
+            self.attendee_ids = [attendee.id for attendee in attendees]
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def search_events(self, q):
+        response = self.client.get('/events/search', query_string={"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [event["name"] for event in response.get_json()]
+
+    def search_attendees(self, q, event_id=None):
+        response = self.client.get(f'/events/{event_id or self.event_id}/attendees/search', query_string={"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [attendee["id"] for attendee in response.get_json()]
+
+    def test_search_events(self):
+        """Events match on name, description or location, with the last word as a prefix."""
+        self.assertEqual(self.search_events("keyn"), ["PyCon Keynote"])
+        self.assertEqual(self.search_events("systems"), ["Rust Workshop"])
+        self.assertEqual(self.search_events("room 10"), ["Rust Workshop"])
+        self.assertEqual(self.search_events("rust hall"), [])
+        self.assertEqual(self.search_events("syst prog"), [])
+        self.assertEqual(self.search_events('"*'), [])
+
+        response = self.client.get('/events/search?q=py')
+        self.assertEqual(set(response.get_json()[0]), {"id", "name", "location", "start_time", "end_time", "status"})
+        self.assertEqual(self.client.get('/events/search').status_code, 400)
+
+    def test_search_attendees(self):
+        """Attendee typeahead matches names, email and phone within one event only."""
+        self.assertEqual(self.search_attendees("ali"), self.attendee_ids[:2])
+        self.assertEqual(self.search_attendees("smith"), [self.attendee_ids[0], self.attendee_ids[2]])
+        self.assertEqual(self.search_attendees("alice@exa"), [self.attendee_ids[0]])
+        self.assertEqual(self.search_attendees("555"), [self.attendee_ids[0]])
+        self.assertEqual(self.search_attendees("alice", self.other_event_id), [self.attendee_ids[3]])
+
+        response = self.client.get(f'/events/{self.event_id}/attendees/search?q=a&limit=1')
+        self.assertEqual(len(response.get_json()), 1)
+        self.assertEqual(self.client.get('/events/999/attendees/search?q=alice').status_code, 404)
+
+    def test_index_follows_writes(self):
+        """Inserts, updates and deletes are reflected in search results."""
+        with self.app.app_context():
+            attendee = db.session.get(Attendee, self.attendee_ids[2])
+            attendee.last_name = "Baker"
+            db.session.commit()
+            db.session.delete(db.session.get(Attendee, self.attendee_ids[0]))
+            db.session.commit()
+        self.assertEqual(self.search_attendees("smith"), [])
+        self.assertEqual(self.search_attendees("bake"), [self.attendee_ids[2]])
+
+        response = self.client.post(f'/events/{self.event_id}/attendees', json={
+            "first_name": "Carol", "last_name": "Danvers", "email": "carol@example.com"
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.search_attendees("danv")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
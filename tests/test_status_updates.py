@@ -1,12 +1,13 @@
 import unittest
 from app import create_app, db
 from app.models import Event, EventStatus
+from app.sweeper import sweep_event_statuses
 from datetime import datetime, timedelta
 
 class TestStatusUpdates(unittest.TestCase):
     def setUp(self):
         """Set up the test database and client for status updates."""
-        self.app = create_app()
+        self.app = create_app('testing')
         self.app.config['TESTING'] = True
         self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
         self.client = self.app.test_client()
@@ -48,5 +49,44 @@ class TestStatusUpdates(unittest.TestCase):
 
             self.assertEqual(event.status, EventStatus.completed)
 
+    def test_list_events_reports_effective_status_without_writing(self):
+        """GET /events shows the effective status but leaves the stored status alone"""
+        response = self.client.get('/events')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()[0]["status"], "completed")
+
+        with self.app.app_context():
+            event = db.session.get(Event, self.event_id)
+            self.assertEqual(event.status, EventStatus.ongoing)
+
+    def test_sweeper_transitions_due_events(self):
+        """The sweeper moves started events to ongoing and ended events to completed"""
+        with self.app.app_context():
+            started = Event(
+                name="Started Event",
+                start_time=datetime.utcnow() - timedelta(minutes=5),
+                end_time=datetime.utcnow() + timedelta(hours=1),
+                location="Test Location",
+                max_attendees=10,
+                status=EventStatus.scheduled
+            )
+            future = Event(
+                name="Future Event",
+                start_time=datetime.utcnow() + timedelta(days=1),
+                end_time=datetime.utcnow() + timedelta(days=1, hours=1),
+                location="Test Location",
+                max_attendees=10,
+                status=EventStatus.scheduled
+            )
+            db.session.add_all([started, future])
+            db.session.commit()
+
+            self.assertEqual(sweep_event_statuses(), 2)
+            db.session.expire_all()
+            self.assertEqual(db.session.get(Event, self.event_id).status, EventStatus.completed)
+            self.assertEqual(started.status, EventStatus.ongoing)
+            self.assertEqual(future.status, EventStatus.scheduled)
+            self.assertEqual(sweep_event_statuses(), 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.models import Attendee, Event, WaitlistEntry
+from app.registration import promote_waitlist
+from flask_jwt_extended import create_access_token
+from datetime import datetime, timedelta
+
+
+class TestWaitlist(unittest.TestCase):
+    def setUp(self):
+        """Set up the test database with an event limited to 2 attendees."""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            event = Event(
+                name="Popular Event",
+                start_time=datetime.now() + timedelta(days=1),
+                end_time=datetime.now() + timedelta(days=1, hours=2),
+                location="Test Location",
+                max_attendees=2,
+                status="scheduled"
+            )
+            db.session.add(event)
+            db.session.commit()
+            self.event_id = event.id
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    def tearDown(self):
+        """Tear down the test database."""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def register(self, email, event_id=None):
+        return self.client.post(f'/events/{event_id or self.event_id}/attendees', json={
+            "first_name": "Test",
+            "last_name": "User",
+            "email": email
+        })
+
+    def fill_and_wait(self, count):
+        """Fill both seats, then waitlist `count` more registrations (w0@..., w1@..., ...)."""
+        for email in ("a@example.com", "b@example.com"):
+            self.assertEqual(self.register(email).status_code, 201)
+        for i in range(count):
+            self.assertEqual(self.register(f"w{i}@example.com").status_code, 202)
+
+    def state(self):
+        """Return (attendee emails, waitlisted emails, registered_count, waitlisted_count)."""
+        with self.app.app_context():
+            event = db.session.get(Event, self.event_id)
+            return (
+                db.session.scalars(db.select(Attendee.email).order_by(Attendee.id)).all(),
+                db.session.scalars(db.select(WaitlistEntry.email).order_by(WaitlistEntry.id)).all(),
+                event.registered_count,
+                event.waitlisted_count
+            )
+
+    def test_full_event_waitlists_registrations(self):
+        """Registrations for a full event are waitlisted once each, in arrival order."""
+        self.fill_and_wait(2)
+        response = self.register("W0@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Attendee already on the waitlist")
+        self.assertEqual(self.register("a@example.com").get_json()["error"], "Attendee already registered")
+
+        self.assertEqual(self.state(), (
+            ["a@example.com", "b@example.com"], ["w0@example.com", "w1@example.com"], 2, 2
+        ))
+        stats = self.client.get(f'/events/{self.event_id}/stats').get_json()
+        self.assertEqual((stats["capacity_remaining"], stats["waitlisted"]), (0, 2))
+
+    def test_raising_capacity_promotes_waitlist(self):
+        """Raising max_attendees promotes the oldest waitlisted registrations through a job."""
+        self.fill_and_wait(3)
+        response = self.client.put(f'/events/{self.event_id}', headers=self.headers, json={"max_attendees": 4})
+        self.assertEqual(response.status_code, 200)
+        job = self.client.get(f'/jobs/{response.get_json()["waitlist_job_id"]}').get_json()
+        self.assertEqual((job["status"], job["result"]), ("succeeded", {"promoted": 2}))
+
+        attendees, waitlisted, registered, waiting = self.state()
+        self.assertEqual(attendees[2:], ["w0@example.com", "w1@example.com"])
+        self.assertEqual((waitlisted, registered, waiting), (["w2@example.com"], 4, 1))
+
+        # Newcomers queue behind the remaining waitlist
+        self.assertEqual(self.register("late@example.com").status_code, 202)
+
+    def test_promotion_batches_and_skips_registered(self):
+        """Promotion runs in batches and drops entries whose email registered in the meantime."""
+        self.fill_and_wait(3)
+        with self.app.app_context():
+            event = db.session.get(Event, self.event_id)
+            event.max_attendees = 10
+            db.session.add(Attendee(first_name="W", last_name="One", email="w1@example.com", event_id=self.event_id))
+            db.session.commit()
+            self.assertEqual(promote_waitlist(self.event_id, batch_size=1), 2)
+
+        attendees, waitlisted, registered, waiting = self.state()
+        self.assertEqual(attendees[2:], ["w1@example.com", "w0@example.com", "w2@example.com"])
+        self.assertEqual((waitlisted, registered, waiting), ([], 5, 0))
+        self.assertEqual(self.register("c@example.com").status_code, 201)
+
+    def test_bulk_register_respects_waitlist(self):
+        """Bulk uploads cannot take seats freed while registrations are waitlisted."""
+        self.fill_and_wait(1)
+        with self.app.app_context():
+            db.session.get(Event, self.event_id).max_attendees = 4
+            db.session.commit()
+        rows = [{"first_name": "Bulk", "last_name": "User", "email": email}
+                for email in ("a@example.com", "bulk@example.com")]
+        response = self.client.post(f'/events/{self.event_id}/attendees/bulk', json=rows)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["summary"], {"rows": 2, "registered": 0, "rejected": 2})
+        self.assertEqual([rejection["reason"] for rejection in data["rejections"]],
+                         ["Attendee already registered", "Event has a waitlist"])
+        self.assertEqual(self.state()[2:], (2, 1))
+
+    def test_bulk_checkin_walk_ins_respect_capacity(self):
+        """Bulk check-in walk-ins never take seats past max_attendees or ahead of the waitlist."""
+        self.fill_and_wait(1)
+        csv_body = "first_name,last_name,email,phone_number\nWalk,In,walkin@example.com,\nA,A,a@example.com,\n"
+        url = f'/events/{self.event_id}/attendees/bulk_checkin?detail=true'
+        summary = self.client.post(url, data=csv_body, content_type='text/csv').get_json()["summary"]
+        self.assertEqual((summary["checked_in"], summary["added"], summary["skipped"]), (1, 0, 1))
+
+        with self.app.app_context():
+            db.session.get(Event, self.event_id).max_attendees = 3
+            db.session.commit()
+        response = self.client.post(url, data=csv_body, content_type='text/csv')
+        self.assertEqual(response.get_json()["attendees"][0]["status"], "Skipped: event has a waitlist")
+        self.assertEqual(self.state()[2:], (2, 1))
+
+        # Once the waitlist is empty, walk-ins fill the free seats
+        with self.app.app_context():
+            promote_waitlist(self.event_id)
+            db.session.get(Event, self.event_id).max_attendees = 4
+            db.session.commit()
+        summary = self.client.post(url, data=csv_body, content_type='text/csv').get_json()["summary"]
+        self.assertEqual(summary["added"], 1)
+        self.assertEqual(self.state()[2:], (4, 0))
+
+    def test_promote_waitlists_command(self):
+        """`flask promote-waitlists` fills free seats of every event from its waitlist."""
+        self.fill_and_wait(1)
+        with self.app.app_context():
+            db.session.get(Event, self.event_id).max_attendees = 3
+            db.session.commit()
+        result = self.app.test_cli_runner().invoke(args=['promote-waitlists'])
+        self.assertIn("Promoted 1 waitlisted attendee(s).", result.output)
+        self.assertEqual(self.state()[1:], ([], 3, 0))
+
+    def test_registration_rate_limited_per_event(self):
+        """Registrations beyond an event's token bucket get 429 with Retry-After; other events are unaffected."""
+        with mock.patch.multiple('config.TestingConfig', REGISTRATION_RATE_PER_SECOND=0.1, REGISTRATION_BURST=2):
+            self.app = create_app('testing')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            events = [
+                Event(name=name, start_time=datetime.now(), end_time=datetime.now() + timedelta(hours=2),
+                      location="Test Location", max_attendees=10, status="scheduled")
+                for name in ("Busy Event", "Quiet Event")
+            ]
+            db.session.add_all(events)
+            db.session.commit()
+            busy_id, quiet_id = (event.id for event in events)
+
+        self.assertEqual(self.register("a@example.com", busy_id).status_code, 201)
+        self.assertEqual(self.register("b@example.com", busy_id).status_code, 201)
+        response = self.register("c@example.com", busy_id)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "10")
+        self.assertEqual(self.register("c@example.com", quiet_id).status_code, 201)
+
+
+if __name__ == '__main__':
+    unittest.main()
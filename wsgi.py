@@ -0,0 +1,12 @@
+"""
+    Production WSGI entry point, served by gunicorn with the settings in gunicorn.conf.py:
+
+        gunicorn wsgi:app
+
+    The status sweeper is started per worker by gunicorn.conf.py, not on import, so nothing
+    that merely imports this module (such as the flask CLI) starts background threads.
+"""
+import os
+from app import create_app
+
+app = create_app(os.environ.get('APP_CONFIG', 'production'))